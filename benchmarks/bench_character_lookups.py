@@ -0,0 +1,89 @@
+from common import measure
+
+from data.models import CharClass, ClassName, HeroicSkill, HeroicSkillName, Skill, Spell
+from data.models.character import Character
+
+
+def build_character() -> Character:
+    # A synthetic level-60 character: every class with five skills, every heroic skill, ten spells per class
+    return Character(
+        level=60,
+        classes=[
+            CharClass(name=name, bonus_value=5, skills=[Skill(name=f"{name}_{i}", current_level=1) for i in range(5)])
+            for name in ClassName
+        ],
+        heroic_skills=[HeroicSkill(name=name) for name in HeroicSkillName],
+        spells={
+            name.value: [Spell(name=f"{name}_{i}", mp_cost=10) for i in range(10)]
+            for name in ClassName
+        },
+    )
+
+
+def build_appended_character() -> Character:
+    # The same character built the way the pages do it: default-constructed, then filled by appends
+    character = Character(level=60)
+    for name in ClassName:
+        character.classes.append(
+            CharClass(name=name, bonus_value=5, skills=[Skill(name=f"{name}_{i}", current_level=1) for i in range(5)])
+        )
+    for name in HeroicSkillName:
+        character.heroic_skills.append(HeroicSkill(name=name))
+    for name in ClassName:
+        # What CharacterController.add_spell does for a class without spells yet
+        character.set_spells(name.value, [])
+        for i in range(10):
+            character.spells[name.value].append(Spell(name=f"{name}_{i}", mp_cost=10))
+    return character
+
+
+def legacy_lookups(
+        character: Character, class_names: list[str], class_skills: list[str], skills: list[str], spells: list[tuple],
+):
+    # The linear scans the model used before it kept indexes
+    for name in class_names:
+        next((c for c in character.classes if c.name == name), None)
+    for name in class_skills:
+        any((skill := c.get_skill(name)) and skill.current_level > 0 for c in character.classes)
+    for skill in skills:
+        any(s.name == skill for s in character.heroic_skills)
+        [s.name for s in character.heroic_skills].count(skill)
+    for class_name, spell in spells:
+        spell in character.get_spells_by_class(class_name)
+
+
+def indexed_lookups(
+        character: Character, class_names: list[str], class_skills: list[str], skills: list[str], spells: list[tuple],
+):
+    for name in class_names:
+        character.get_class(name)
+    for name in class_skills:
+        character.has_skill(name)
+    for skill in skills:
+        character.has_heroic_skill(skill)
+        character.heroic_skill_count(skill)
+    for class_name, spell in spells:
+        character.has_spell(class_name, spell)
+
+
+def main():
+    character = build_character()
+    class_names = [name.value for name in ClassName]
+    class_skills = [f"{name}_{i}" for name in ClassName for i in (4, 5)]
+    skills = [name.value for name in HeroicSkillName]
+    # Half the probes are already known, half are new (the add_spell duplicate check)
+    spells = [
+        (name.value, Spell(name=f"{name}_{i}", mp_cost=10))
+        for name in ClassName
+        for i in (9, 10)
+    ]
+    args = (character, class_names, class_skills, skills, spells)
+    measure("character lookups [linear]", lambda: legacy_lookups(*args), repeat=500)
+    measure("character lookups [indexed]", lambda: indexed_lookups(*args), repeat=500)
+    appended = (build_appended_character(), class_names, class_skills, skills, spells)
+    measure("appended character lookups [linear]", lambda: legacy_lookups(*appended), repeat=500)
+    measure("appended character lookups [indexed]", lambda: indexed_lookups(*appended), repeat=500)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from common import measure
+
+from config import ASSETS_DIRECTORY
+from data import compendium
+from data.snapshot import ASSET_SUBDIRECTORIES, write_snapshot
+
+# A large community asset pack: every class and spell file copied this many times
+PACK_COPIES = 100
+
+
+def reset():
+    compendium.COMPENDIUM = None
+
+
+def make_large_pack(directory: Path) -> Path:
+    for subdirectory in ASSET_SUBDIRECTORIES:
+        shutil.copytree(Path(ASSETS_DIRECTORY, subdirectory), Path(directory, subdirectory))
+    for subdirectory in ("classes", "spells"):
+        for yaml_file in sorted(Path(ASSETS_DIRECTORY, subdirectory).glob("*.yaml")):
+            for i in range(PACK_COPIES):
+                shutil.copy(yaml_file, Path(directory, subdirectory, f"{yaml_file.stem}_{i}.yaml"))
+    return directory
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot_path = Path(tmp_dir, "compendium.snapshot")
+        write_snapshot(compendium.load_from_yaml(ASSETS_DIRECTORY), ASSETS_DIRECTORY, snapshot_path)
+
+        measure("compendium.init (yaml)", lambda: compendium.init(ASSETS_DIRECTORY), setup=reset)
+        measure("compendium.init (snapshot)", lambda: compendium.init(ASSETS_DIRECTORY, snapshot_path), setup=reset)
+
+        pack = make_large_pack(Path(tmp_dir, "pack"))
+        print(f"--- loaders, {os.process_cpu_count()} cores")
+        for name, directory in (("bundled", ASSETS_DIRECTORY), (f"x{PACK_COPIES} pack", pack)):
+            for loader in compendium.ASSET_LOADERS:
+                measure(
+                    f"load_from_yaml [{loader}] {name}",
+                    lambda: compendium.load_from_yaml(directory, loader),
+                    repeat=3,
+                )
+
+
+if __name__ == "__main__":
+    main()
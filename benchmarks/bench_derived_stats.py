@@ -0,0 +1,59 @@
+from common import measure
+
+from data.models import (
+    Accessory,
+    Armor,
+    CharClass,
+    ClassName,
+    HeroicSkill,
+    HeroicSkillName,
+    LocNamespace,
+    Skill,
+    Weapon,
+)
+from pages.controller import CharacterController
+
+
+def build_controller() -> CharacterController:
+    controller = CharacterController(LocNamespace(root={"dice_prefix": "d"}))
+    character = controller.character
+    character.level = 60
+    character.classes = [
+        CharClass(
+            name=name,
+            class_bonus="hp",
+            bonus_value=5,
+            skills=[Skill(name=f"{name}_{i}", current_level=2, max_level=5) for i in range(5)],
+        )
+        for name in list(ClassName)[:6]
+    ]
+    character.heroic_skills = [HeroicSkill(name=name) for name in HeroicSkillName]
+    equipped = character.inventory.equipped
+    equipped.main_hand = Weapon(name="sword", bonus_initiative=1)
+    equipped.armor = Armor(name="plate", defense=11, bonus_defense=1)
+    equipped.accessory = Accessory(name="ring", bonus_magic_defense=1)
+    return controller
+
+
+def overview_with_formulas(controller: CharacterController):
+    # The calls the overview tab made per rerun before the snapshot existed
+    controller.current_hp() <= controller.crisis_value()
+    for _ in range(2):
+        controller.max_hp(), controller.max_mp(), controller.max_ip()
+    controller.current_hp(), controller.current_mp(), controller.current_ip()
+    controller.defense(), controller.magic_defense(), controller.initiative()
+
+
+def overview_with_snapshot(controller: CharacterController):
+    controller.derived_stats()
+    controller.derived_stats()
+
+
+def main():
+    controller = build_controller()
+    measure("overview stats [formulas]", lambda: overview_with_formulas(controller), repeat=2000)
+    measure("overview stats [snapshot]", lambda: overview_with_snapshot(controller), repeat=2000)
+
+
+if __name__ == "__main__":
+    main()
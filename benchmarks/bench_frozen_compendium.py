@@ -0,0 +1,63 @@
+import tracemalloc
+from copy import deepcopy
+
+from common import measure
+
+from config import ASSETS_DIRECTORY
+from data import compendium
+from data.models import freeze, thaw
+
+RERUNS = 100
+
+
+def copying_lookups(comp: compendium.Compendium) -> list:
+    # What every rerun of the level-up dialog and class wizard did when lookups handed out copies
+    results = []
+    for char_class in comp.classes.classes:
+        results.append(char_class.model_copy(update={
+            "skills": [skill.model_copy() for skill in char_class.skills],
+            "rituals": list(char_class.rituals),
+        }))
+        results.append([spell.model_copy() for spell in comp.spells.spells.get(char_class.name, [])])
+    results.append([skill.model_copy() for skill in comp.heroic_skills.heroic_skills])
+    return results
+
+
+def shared_lookups(comp: compendium.Compendium) -> list:
+    results = []
+    for char_class in comp.classes.classes:
+        results.append(comp.classes.get_class(char_class.name))
+        results.append(comp.spells.get_spells(char_class.name))
+    results.append([comp.heroic_skills.get_skill(skill.name) for skill in comp.heroic_skills.heroic_skills])
+    return results
+
+
+def allocated_kib(func) -> float:
+    """Peak memory allocated by one rerun's lookups, which the rerun holds on to until it ends."""
+    tracemalloc.start()
+    results = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return peak / 1024
+
+
+def bench_lookups():
+    comp = compendium.load_from_yaml(ASSETS_DIRECTORY, loader="serial")
+    for name, lookups in (("copying", copying_lookups), ("shared frozen", shared_lookups)):
+        measure(f"{RERUNS} reruns of lookups, {name}", lambda: [lookups(comp) for _ in range(RERUNS)], repeat=10)
+        print(f"{'':<50} {allocated_kib(lambda: lookups(comp)):>10.1f} KiB allocated per rerun")
+
+
+def bench_thaw():
+    comp = compendium.load_from_yaml(ASSETS_DIRECTORY, loader="serial")
+    char_class = comp.classes.classes[0]
+    measure(f"deepcopy {char_class.name}", lambda: [deepcopy(char_class) for _ in range(1000)], repeat=10)
+    measure(f"thaw {char_class.name}", lambda: [thaw(char_class) for _ in range(1000)], repeat=10)
+    thawed = [thaw(asset) for asset in comp.classes.classes + comp.heroic_skills.heroic_skills]
+    measure("freeze every class and heroic skill", lambda: [freeze(asset) for asset in thawed], repeat=10)
+
+
+if __name__ == "__main__":
+    bench_lookups()
+    bench_thaw()
@@ -0,0 +1,41 @@
+import uuid
+from streamlit.testing.v1 import AppTest
+
+from common import measure
+
+from config import LOCALS_DIRECTORY, SAVED_CHARS_DIRECTORY
+from data import storage
+from data import saved_characters as s
+from data.localizator import init_localizator
+from data.saved_characters import SavedChars, CharacterEntry
+
+
+def build_saved_chars(size: int) -> SavedChars:
+    entries = {}
+    for i in range(size):
+        char_id = uuid.uuid4()
+        entries[char_id] = CharacterEntry(id=char_id, name=f"char_{i}", level=i % 60 + 1)
+    return SavedChars(storage=storage.STORAGE, entries=entries)
+
+
+def loader_app():
+    from pages.character_view import loader
+    from pages.controller import CharacterController
+    from data.localizator import get_loc
+
+    loader.build(CharacterController(get_loc()))
+
+
+def main():
+    init_localizator(LOCALS_DIRECTORY)
+    storage.init(SAVED_CHARS_DIRECTORY)
+    for size in (10, 100, 1000):
+        s.SAVED_CHARS = build_saved_chars(size)
+        at = AppTest.from_function(loader_app, default_timeout=60)
+        at.run()
+        assert not at.exception, at.exception
+        measure(f"loader.build via AppTest n={size}", at.run, repeat=10)
+
+
+if __name__ == "__main__":
+    main()
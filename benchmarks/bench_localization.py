@@ -0,0 +1,91 @@
+from pydantic import RootModel
+
+from common import measure
+
+from config import ASSETS_DIRECTORY, LOCALS_DIRECTORY
+from data import compendium
+from data.localizator import load_translations_from_dir
+from data.models import LangEnum, LocNamespace, Status, AttributeName, DamageType
+
+
+class LegacyLocNamespace(RootModel[dict[str, str]]):
+    """The pydantic RootModel namespace used before the dict-backed LocNamespace."""
+
+    def __getattr__(self, item: str) -> str:
+        try:
+            return self.root[item]
+        except KeyError:
+            raise AttributeError(f"Translation key '{item}' not found")
+
+    def __getitem__(self, item: str) -> str:
+        return self.root[item]
+
+    def get(self, item: str, default: str | None = None) -> str | None:
+        # The models now call loc.get(); route it through the old exception-based miss path
+        return getattr(self, item, default)
+
+
+def render_sheet(loc) -> list[str]:
+    """Render the strings of a character that has every class, spell, item and special ability."""
+    c = compendium.COMPENDIUM
+    rendered = []
+    for char_class in c.classes.classes:
+        rendered.append(char_class.name.localized_name(loc))
+        rendered.append(loc.page_view_class_spells.format(
+            class_name=char_class.name.localized_name(loc), chimerist_message=""
+        ))
+        for skill in char_class.skills:
+            rendered.append(skill.localized_name(loc))
+            rendered.append(skill.localized_description(loc))
+    for spells in c.spells.spells.values():
+        for spell in spells:
+            rendered.append(spell.localized_name(loc))
+            rendered.append(spell.localized_description(loc))
+            rendered.append(spell.target.localized_name(loc))
+            rendered.append(spell.duration.localized_name(loc))
+            rendered.append(spell.localized_damage(loc))
+    for skill in c.heroic_skills.heroic_skills:
+        rendered.append(skill.localized_name(loc))
+        rendered.append(loc.heroic_skill_description.format(skill=skill.localized_name(loc)))
+    for weapon in c.equipment.weapons:
+        rendered.append(weapon.localized_name(loc))
+        rendered.append(weapon.weapon_category.localized_name(loc))
+        rendered.append(weapon.grip_type.localized_name(loc))
+        rendered.append(weapon.range.localized_name(loc))
+        rendered.append(weapon.localized_quality(loc))
+        rendered.append(weapon.format_accuracy(loc))
+    for item in (*c.equipment.armors, *c.equipment.shields):
+        rendered.append(item.localized_name(loc))
+        rendered.append(item.localized_quality(loc))
+    for therioform in c.therioforms:
+        rendered.append(therioform.localized_name(loc))
+        rendered.append(therioform.localized_creatures(loc))
+    for dance in c.dances:
+        rendered.append(dance.localized_name(loc))
+        rendered.append(dance.duration.localized_name(loc))
+    for arcanum in c.arcana:
+        rendered.append(arcanum.localized_name(loc))
+        rendered.append(arcanum.domains(loc))
+    for enum in (Status, AttributeName, DamageType):
+        rendered.extend(member.localized_name(loc) for member in enum)
+    rendered.append(loc.page_load_character_info.format(name="Ann", level=42))
+    rendered.append(loc.msg_skills_points_remaining.format(count=3))
+    rendered.append(loc.page_view_identity_origin.format(identity="Knight", origin="North"))
+    return rendered
+
+
+def main():
+    compendium.init(ASSETS_DIRECTORY)
+    for lang in LangEnum:
+        translations = load_translations_from_dir(LOCALS_DIRECTORY / LangEnum.en)
+        if lang != LangEnum.en:
+            translations |= load_translations_from_dir(LOCALS_DIRECTORY / lang)
+        legacy = LegacyLocNamespace(root=translations)
+        current = LocNamespace(root=translations)
+        assert render_sheet(legacy) == render_sheet(current)
+        measure(f"render sheet strings [{lang}] legacy RootModel", lambda: render_sheet(legacy), repeat=200)
+        measure(f"render sheet strings [{lang}] LocNamespace", lambda: render_sheet(current), repeat=200)
+
+
+if __name__ == "__main__":
+    main()
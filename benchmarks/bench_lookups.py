@@ -0,0 +1,64 @@
+from copy import deepcopy
+
+from common import measure
+
+from data.compendium import Classes, Spells, HeroicSkills, Compendium, Equipment
+from data.models import CharClass, Skill, Spell, HeroicSkill
+
+
+def build_compendium(n_classes: int) -> Compendium:
+    classes = [
+        CharClass(skills=[Skill(name=f"skill_{i}_{j}", max_level=5) for j in range(6)])
+        for i in range(n_classes)
+    ]
+    for i, char_class in enumerate(classes):
+        # ClassName is an enum; bypass validation to produce arbitrarily many synthetic classes
+        object.__setattr__(char_class, "name", f"class_{i}")
+    spells = {
+        f"class_{i}": [Spell(name=f"spell_{i}_{j}", mp_cost=10) for j in range(12)]
+        for i in range(n_classes)
+    }
+    heroic_skills = [HeroicSkill(name=f"heroic_{i}") for i in range(n_classes * 3)]
+    return Compendium(
+        equipment=Equipment(weapons=[], armors=[], shields=[]),
+        classes=Classes(classes=classes),
+        spells=Spells(spells=spells),
+        heroic_skills=HeroicSkills(heroic_skills=heroic_skills),
+    )
+
+
+def linear_get_class(c: Compendium, name: str):
+    for char_class in c.classes.classes:
+        if char_class.name == name:
+            return deepcopy(char_class)
+
+
+def linear_get_spells(c: Compendium, class_name: str):
+    for key in c.spells.spells:
+        if key == class_name:
+            return deepcopy(c.spells.spells[key])
+
+
+def linear_class_name_from_skill(c: Compendium, skill: Skill):
+    for char_class in c.classes.classes:
+        if char_class.get_skill(skill.name):
+            return char_class.name
+
+
+def main():
+    for size in (10, 100, 1000):
+        c = build_compendium(size)
+        last = size - 1
+        skill = Skill(name=f"skill_{last}_5")
+        print(f"--- {size} classes")
+        measure(f"get_class [linear+deepcopy] n={size}", lambda: linear_get_class(c, f"class_{last}"), repeat=200)
+        measure(f"get_class [indexed] n={size}", lambda: c.classes.get_class(f"class_{last}"), repeat=200)
+        measure(f"get_spells [linear+deepcopy] n={size}", lambda: linear_get_spells(c, f"class_{last}"), repeat=200)
+        measure(f"get_spells [indexed] n={size}", lambda: c.spells.get_spells(f"class_{last}"), repeat=200)
+        measure(f"get_skill [indexed] n={size}", lambda: c.heroic_skills.get_skill(f"heroic_{last}"), repeat=200)
+        measure(f"class_name_from_skill [linear] n={size}", lambda: linear_class_name_from_skill(c, skill), repeat=200)
+        measure(f"class_name_from_skill [indexed] n={size}", lambda: c.get_class_name_from_skill(skill), repeat=200)
+
+
+if __name__ == "__main__":
+    main()
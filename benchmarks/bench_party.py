@@ -0,0 +1,46 @@
+from common import measure
+
+from data.models import CharState, LocNamespace, Status
+from pages.controller import CharacterController
+from pages.party_stats import party_stats
+from bench_derived_stats import build_controller
+
+FRAME_BUDGET_MS = 16.7
+PARTY_SIZES = (8, 100, 1000)
+
+
+def build_party(size: int) -> list:
+    members = []
+    for i in range(size):
+        character = build_controller().character
+        character.name = f"member {i}"
+        character.level = 5 + i % 55
+        members.append((character, CharState(minus_hp=i % 30, statuses=[list(Status)[i % len(Status)]])))
+    return members
+
+
+def per_controller(members: list, loc: LocNamespace) -> list:
+    # What a party view built from the existing pieces would do: one controller per member
+    stats = []
+    for character, state in members:
+        controller = CharacterController(loc)
+        controller.character = character
+        controller.state = state
+        controller.apply_status()
+        stats.append(controller.derived_stats())
+    return stats
+
+
+def main():
+    loc = LocNamespace(root={"dice_prefix": "d"})
+    for size in PARTY_SIZES:
+        members = build_party(size)
+        measure(f"party of {size} [one controller each]", lambda: per_controller(members, loc), repeat=20)
+        result = measure(f"party of {size} [party_stats]", lambda: party_stats(members), repeat=20)
+        if size <= 8:
+            verdict = "within" if result["median_ms"] < FRAME_BUDGET_MS else "OVER"
+            print(f"{'':<50} {verdict} the {FRAME_BUDGET_MS} ms frame budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import tempfile
+from pathlib import Path
+
+from common import measure
+
+from data import serialization, storage
+from data.models import CharState
+from bench_derived_stats import build_controller
+
+
+def main():
+    controller = build_controller()
+    character = controller.character
+    state = CharState(minus_hp=10, minus_mp=5)
+    for save_format in serialization.SAVE_FORMATS:
+        if save_format == "msgpack" and serialization.msgpack is None:
+            print("--- msgpack skipped, the package is not installed")
+            continue
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            (directory / "character_images").mkdir()
+            (directory / "states").mkdir()
+            backend = storage.create_storage("yaml", directory, save_format=save_format)
+            backend.save_character(character)
+            backend.save_state(character.id, state)
+            print(f"--- {save_format}")
+            measure(f"save_character [{save_format}]", lambda: backend.save_character(character), repeat=50)
+            measure(f"load_character [{save_format}]", lambda: backend.load_character(character.id), repeat=50)
+            measure(f"save_state [{save_format}]", lambda: backend.save_state(character.id, state), repeat=200)
+            measure(f"load_state [{save_format}]", lambda: backend.load_state(character.id), repeat=200)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import ast
+import re
+
+from common import measure
+
+from config import LOCALS_DIRECTORY
+from data import yaml_io
+from data.models import LangEnum
+from data.models import skill as skill_module
+
+
+def legacy_resolve(text: str, level: int, token: str) -> str:
+    """Uncached resolution as it was before memoization: one regex compile and AST parse per bracket per call."""
+    if not token:
+        return text
+
+    token_pattern = re.compile(rf"\b{re.escape(token)}\b")
+
+    def resolve_bracket(match: re.Match) -> str:
+        content = token_pattern.sub(str(level), match.group(1))
+        expression = content.replace("&nbsp;", " ").replace("×", "*").replace("x", "*")
+        try:
+            tree = ast.parse(expression, mode="eval")
+            for node in ast.walk(tree):
+                if not isinstance(node, skill_module._ALLOWED_AST_NODES):
+                    raise ValueError("disallowed expression")
+                if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+                    raise ValueError("disallowed constant")
+            total = eval(compile(tree, "<skill_level_expr>", "eval"))
+        except (SyntaxError, ValueError, ZeroDivisionError, TypeError):
+            return f"【{content}】"
+        if isinstance(total, float) and total.is_integer():
+            total = int(total)
+        return f"【{total}】"
+
+    return skill_module._BRACKET_PATTERN.sub(resolve_bracket, text)
+
+
+def load_descriptions(lang: LangEnum) -> list[str]:
+    descriptions = []
+    for yaml_file in sorted((LOCALS_DIRECTORY / lang / "skills").glob("*.yaml")):
+        data = yaml_io.load(yaml_file.read_text(encoding="utf8")) or {}
+        descriptions.extend(value for key, value in data.items() if key.endswith("_description"))
+    return descriptions
+
+
+def resolve_all(resolve, descriptions: list[str], token: str):
+    for level in range(1, 11):
+        for text in descriptions:
+            resolve(text, level, token)
+
+
+def clear_caches():
+    skill_module._resolve_skill_level_placeholders.cache_clear()
+    skill_module._compile_description.cache_clear()
+
+
+def main():
+    current = skill_module._resolve_skill_level_placeholders
+    for lang, token in ((LangEnum.en, "SL"), (LangEnum.ru, "УН")):
+        descriptions = load_descriptions(lang)
+        print(f"--- {lang}: {len(descriptions)} skill descriptions x 10 levels")
+        measure(f"resolve all [{lang}] legacy", lambda: resolve_all(legacy_resolve, descriptions, token), repeat=10)
+        measure(f"resolve all [{lang}] cold cache", lambda: resolve_all(current, descriptions, token),
+                repeat=10, setup=clear_caches)
+        measure(f"resolve all [{lang}] warm cache", lambda: resolve_all(current, descriptions, token), repeat=10)
+
+
+if __name__ == "__main__":
+    main()
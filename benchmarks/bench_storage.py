@@ -0,0 +1,55 @@
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+
+from common import measure
+
+from data import storage
+from data.models import Character, CharState
+
+
+def make_avatar() -> bytes:
+    output = BytesIO()
+    Image.new("RGB", (800, 800), (120, 40, 200)).save(output, format="PNG")
+    return output.getvalue()
+
+
+AVATAR = make_avatar()
+
+
+def fill(backend: storage.Storage, size: int) -> list[Character]:
+    characters = [Character(name=f"char_{i}", level=i % 60 + 1) for i in range(size)]
+    for character in characters:
+        backend.save_character(character)
+        backend.save_state(character.id, CharState())
+        backend.save_avatar(character, AVATAR, ".png")
+    return characters
+
+
+def main():
+    for size in (10, 1000):
+        for backend_name in ("yaml", "sqlite"):
+            with tempfile.TemporaryDirectory() as tmp:
+                directory = Path(tmp)
+                (directory / "character_images").mkdir()
+                (directory / "states").mkdir()
+                backend = storage.create_storage(backend_name, directory)
+                characters = fill(backend, size)
+                last = characters[-1]
+                print(f"--- {backend_name}, {size} characters")
+                measure(f"list_characters [{backend_name}] n={size}", backend.list_characters, repeat=10)
+                measure(f"load_character [{backend_name}] n={size}", lambda: backend.load_character(last.id), repeat=50)
+                measure(f"save_character [{backend_name}] n={size}", lambda: backend.save_character(last), repeat=50)
+                measure(f"load_state [{backend_name}] n={size}", lambda: backend.load_state(last.id), repeat=50)
+                measure(f"load_avatar [{backend_name}] n={size}", lambda: backend.load_avatar(last.id), repeat=50)
+                measure(
+                    f"load_avatar_thumbnail [{backend_name}] n={size}",
+                    lambda: backend.load_avatar_thumbnail(last.id, 150),
+                    repeat=50,
+                )
+
+
+if __name__ == "__main__":
+    main()
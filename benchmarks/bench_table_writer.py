@@ -0,0 +1,44 @@
+from streamlit.testing.v1 import AppTest
+
+from common import measure
+
+from config import ASSETS_DIRECTORY, LOCALS_DIRECTORY
+from data.compendium import init as init_compendium
+from data.localizator import init_localizator
+
+
+def table_app(table: str, dataframe_mode: bool):
+    import streamlit as st
+    from data import compendium as c
+    from data.localizator import get_loc
+    from pages.utils import SpellTableWriter, WeaponTableWriter
+
+    loc = get_loc()
+    if table == "spells":
+        writer = SpellTableWriter(loc)
+        # Every spell once; a few are shared between classes and the row checkboxes are keyed by name
+        items = list({spell.name: spell for spells in c.COMPENDIUM.spells.spells.values() for spell in spells}.values())
+        st.session_state.class_spells = st.session_state.get("class_spells", [])
+    else:
+        writer = WeaponTableWriter(loc)
+        # Read-only weapon table: the add buttons have no dataframe counterpart
+        writer.columns = writer.base_columns[:-1]
+        items = c.COMPENDIUM.equipment.weapons
+    writer.dataframe_mode = dataframe_mode
+    writer.write_in_columns(items)
+
+
+def main():
+    init_compendium(ASSETS_DIRECTORY)
+    init_localizator(LOCALS_DIRECTORY)
+    for table in ("spells", "weapons"):
+        for dataframe_mode in (False, True):
+            at = AppTest.from_function(table_app, args=(table, dataframe_mode), default_timeout=60)
+            at.run()
+            assert not at.exception, at.exception
+            mode = "dataframe" if dataframe_mode else "columns"
+            measure(f"{table} table [{mode}] via AppTest", at.run, repeat=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from common import measure
+
+from config import ASSETS_DIRECTORY
+from data import compendium, serialization, yaml_io
+from data.adapters import list_adapter
+from data.models import Character
+from bench_derived_stats import build_controller
+
+CHARACTER_COUNT = 1_000
+
+
+def bench_asset_files():
+    total_before = total_after = 0.0
+    for asset_file in compendium.asset_files(ASSETS_DIRECTORY):
+        raw = yaml_io.load(asset_file.path.read_text(encoding="utf8"))
+        raw = raw if isinstance(raw, list) else [raw]
+        asset_class = asset_file.asset_class
+        name = f"{asset_file.directory}/{asset_file.path.name} ({len(raw)})"
+        before = measure(f"{name} Model(**item)", lambda: [asset_class(**item) for item in raw], repeat=30)
+        after = measure(f"{name} TypeAdapter", lambda: list_adapter(asset_class).validate_python(raw), repeat=30)
+        total_before += before["median_ms"]
+        total_after += after["median_ms"]
+    print(f"--- all asset files: {total_before:.2f} ms -> {total_after:.2f} ms (sum of medians)")
+
+
+def bench_saved_characters():
+    character = build_controller().character
+    contents = [serialization.dump_model(character, "json")] * CHARACTER_COUNT
+    measure(
+        f"{CHARACTER_COUNT} JSON saves one by one",
+        lambda: [Character.model_validate_json(content) for content in contents],
+        repeat=5,
+    )
+    # One list validation over a JSON array of every save, as saved_characters.init could do it
+    batch = b"[" + b",".join(contents) + b"]"
+    measure(f"{CHARACTER_COUNT} JSON saves batched", lambda: list_adapter(Character).validate_json(batch), repeat=5)
+
+
+if __name__ == "__main__":
+    bench_asset_files()
+    bench_saved_characters()
@@ -0,0 +1,45 @@
+import tempfile
+from pathlib import Path
+
+import yaml
+
+from common import measure
+
+from config import ASSETS_DIRECTORY, LOCALS_DIRECTORY
+from data import compendium, storage, yaml_io
+from data.localizator import Localizator
+from data.models import Character
+from bench_derived_stats import build_controller
+
+
+def startup():
+    compendium.load_from_yaml(ASSETS_DIRECTORY)
+    Localizator(LOCALS_DIRECTORY)
+
+
+def legacy_load(stream):
+    # What the call sites used before yaml_io: the pure-Python (and for saves, unsafe) loaders
+    return yaml.load(stream, Loader=yaml.UnsafeLoader)
+
+
+def main():
+    character = build_controller().character
+    with tempfile.TemporaryDirectory() as tmp:
+        save_path = Path(tmp, f"{character.name}.{character.id}.character.yaml")
+        save_path.write_text(yaml.dump(character.model_dump(), sort_keys=False, allow_unicode=True))
+        assert storage.read_character(save_path) == Character.model_validate(legacy_load(save_path.read_text()))
+
+        print(f"libyaml available: {yaml_io.LIBYAML}")
+        current_load = yaml_io.load
+        for label, load in (("pure python", legacy_load), ("yaml_io", current_load)):
+            yaml_io.load = load
+            measure(f"startup: compendium + translations [{label}]", startup, repeat=5)
+            measure(f"legacy YAML character load [{label}]", lambda: storage.read_character(save_path), repeat=20)
+        yaml_io.load = current_load
+
+        measure("yaml.dump (pure python)", lambda: yaml.dump(character.model_dump(mode="json"), sort_keys=False), repeat=20)
+        measure("yaml_io.dump", lambda: yaml_io.dump(character.model_dump(mode="json")), repeat=20)
+
+
+if __name__ == "__main__":
+    main()
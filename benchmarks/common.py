@@ -0,0 +1,30 @@
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+PKG = ROOT / "fabula_charsheet"
+if str(PKG) not in sys.path:
+    sys.path.insert(0, str(PKG))
+
+
+def measure(name: str, func: Callable[[], object], repeat: int = 20, setup: Callable[[], object] | None = None) -> dict:
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    result = {
+        "name": name,
+        "repeat": repeat,
+        "min_ms": min(timings) * 1000,
+        "median_ms": statistics.median(timings) * 1000,
+        "max_ms": max(timings) * 1000,
+    }
+    print(f"{name:<50} min {result['min_ms']:>10.3f} ms   median {result['median_ms']:>10.3f} ms")
+    return result
@@ -0,0 +1,221 @@
+"""
+Runs the hot-path benchmarks in one go and writes their timings to a JSON file.
+
+    uv run benchmarks/suite.py                                  # benchmarks/results/<commit>.json
+    uv run benchmarks/suite.py --output before.json
+    uv run benchmarks/suite.py --compare before.json            # exits with 1 on a regression
+    uv run benchmarks/suite.py --quick                          # skips the 10k-character cases
+
+Results are plain files, so two commits are compared by running the suite on each and passing
+the first file to --compare on the second run.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from common import ROOT, measure
+
+from config import ASSETS_DIRECTORY, LOCALS_DIRECTORY
+from data import compendium, localizator, saved_characters, storage, yaml_io
+from data.localizator import init_localizator
+from data.models import Character, CharState, LangEnum
+from data.models import skill as skill_module
+from bench_derived_stats import build_controller
+
+RESULTS_DIRECTORY = ROOT / "benchmarks" / "results"
+CHARACTER_COUNTS = (10, 1_000, 10_000)
+
+
+def bench_compendium() -> list[dict]:
+    def reset():
+        compendium.COMPENDIUM = None
+
+    result = measure("compendium.init", lambda: compendium.init(ASSETS_DIRECTORY), repeat=10, setup=reset)
+    compendium.init(ASSETS_DIRECTORY)
+    return [result]
+
+
+def write_characters(directory: Path, count: int):
+    # One typical two-class character saved as YAML, as older saves are, copied with fresh ids, names and levels
+    template = Character(
+        name="__name__",
+        level=10,
+        classes=[char_class.model_copy() for char_class in compendium.COMPENDIUM.classes.classes[:2]],
+    )
+    text = yaml_io.dump(template.model_dump(mode="json"))
+    text = text.replace(str(template.id), "__id__").replace("level: 10\n", "level: __level__\n", 1)
+    for i in range(count):
+        char_id = str(uuid.uuid4())
+        content = text.replace("__id__", char_id).replace("__name__", f"char_{i}").replace("__level__", str(i % 60 + 1))
+        Path(directory, f"char_{i}.{char_id}.character.yaml").write_text(content, encoding="utf-8")
+
+
+def bench_saved_characters(counts: tuple[int, ...]) -> list[dict]:
+    results = []
+    for count in counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            write_characters(directory, count)
+            index_path = directory / storage.YamlStorage.index_file_name
+
+            def init():
+                saved_characters.SAVED_CHARS = None
+                backend = storage.YamlStorage(directory, directory / "character_images", directory / "states")
+                saved_characters.init(backend)
+                assert len(saved_characters.SAVED_CHARS.entries) == count
+
+            # Cold: every file parsed, the index written; warm: answered from the index
+            results.append(measure(
+                f"saved_characters.init cold n={count}",
+                init,
+                repeat=1 if count >= 1_000 else 3,
+                setup=lambda: index_path.unlink(missing_ok=True),
+            ))
+            results.append(measure(f"saved_characters.init warm n={count}", init, repeat=5))
+    saved_characters.SAVED_CHARS = None
+    return results
+
+
+def bench_persistence() -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        previous = storage.STORAGE
+        for backend_name in ("yaml", "sqlite"):
+            backend_directory = directory / backend_name
+            (backend_directory / "character_images").mkdir(parents=True)
+            (backend_directory / "states").mkdir()
+            storage.STORAGE = storage.create_storage(backend_name, backend_directory)
+            controller = build_controller()
+            controller.state = CharState(minus_hp=10, minus_mp=5)
+
+            def character_round_trip():
+                controller.dump_character()
+                assert storage.STORAGE.load_character(controller.character.id) == controller.character
+
+            def state_round_trip():
+                controller.dump_state()
+                controller.load_state()
+
+            results.append(measure(f"dump_character round-trip [{backend_name}]", character_round_trip, repeat=50))
+            results.append(measure(f"dump_state round-trip [{backend_name}]", state_round_trip, repeat=50))
+        storage.STORAGE = previous
+    return results
+
+
+def bench_derived_stats() -> list[dict]:
+    controller = build_controller()
+    return [
+        measure("controller.max_hp", controller.max_hp, repeat=2000),
+        measure("controller.defense", controller.defense, repeat=2000),
+        measure("controller.apply_status", controller.apply_status, repeat=2000),
+    ]
+
+
+def bench_skill_descriptions() -> list[dict]:
+    loc = localizator.LOCALIZATOR.get(LangEnum.en)
+    skills = [skill for char_class in compendium.COMPENDIUM.classes.classes for skill in char_class.skills]
+
+    def resolve_all():
+        for skill in skills:
+            skill.resolved_description(loc)
+
+    return [
+        measure(
+            f"Skill.resolved_description x{len(skills)} (cold)",
+            resolve_all,
+            repeat=10,
+            setup=skill_module._resolve_skill_level_placeholders.cache_clear,
+        ),
+        measure(f"Skill.resolved_description x{len(skills)} (warm)", resolve_all, repeat=10),
+    ]
+
+
+def view_app():
+    import streamlit as st
+    from pages.character_view import view
+
+    view.build(st.session_state.char_controller)
+
+
+def bench_view() -> list[dict]:
+    from streamlit.testing.v1 import AppTest
+
+    previous = storage.STORAGE
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "character_images").mkdir()
+        storage.STORAGE = storage.create_storage("yaml", Path(tmp))
+        at = AppTest.from_function(view_app, default_timeout=60)
+        at.session_state["char_controller"] = build_controller()
+        at.session_state["language"] = LangEnum.en
+        at.run()
+        assert not at.exception, at.exception
+        result = measure("view.build via AppTest", at.run, repeat=10)
+    storage.STORAGE = previous
+    return [result]
+
+
+def current_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[dict], baseline_path: Path, threshold: float) -> bool:
+    baseline = {result["name"]: result for result in json.loads(baseline_path.read_text())["results"]}
+    regressed = False
+    print(f"\nCompared with {baseline_path} (regression above x{threshold:.2f} median):")
+    for result in results:
+        before = baseline.get(result["name"])
+        if before is None:
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        flag = "REGRESSED" if ratio > threshold else ""
+        regressed = regressed or bool(flag)
+        print(f"{result['name']:<50} {before['median_ms']:>10.3f} -> {result['median_ms']:>10.3f} ms  x{ratio:.2f} {flag}")
+    return not regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the hot-path benchmarks and save the timings as JSON.")
+    parser.add_argument("--output", type=Path, help="result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier result file to compare medians against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="median ratio counted as a regression")
+    parser.add_argument("--quick", action="store_true", help="skip the 10k-character cases")
+    args = parser.parse_args()
+
+    init_localizator(LOCALS_DIRECTORY)
+    results = bench_compendium()
+    results += bench_saved_characters(CHARACTER_COUNTS[:-1] if args.quick else CHARACTER_COUNTS)
+    results += bench_persistence()
+    results += bench_derived_stats()
+    results += bench_skill_descriptions()
+    results += bench_view()
+
+    commit = current_commit()
+    output = args.output or RESULTS_DIRECTORY / f"{commit or 'results'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "commit": commit,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }, indent=2))
+    print(f"\nSaved {len(results)} results to {output}")
+
+    if args.compare and not compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
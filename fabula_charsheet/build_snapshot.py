@@ -0,0 +1,13 @@
+from data import compendium
+from data.snapshot import write_snapshot
+from config import ASSETS_DIRECTORY, COMPENDIUM_SNAPSHOT_PATH, COMPENDIUM_LOADER, COMPENDIUM_LOADER_WORKERS
+
+
+def main():
+    loaded = compendium.load_from_yaml(ASSETS_DIRECTORY, COMPENDIUM_LOADER, COMPENDIUM_LOADER_WORKERS)
+    write_snapshot(loaded, ASSETS_DIRECTORY, COMPENDIUM_SNAPSHOT_PATH)
+    print(f"Compendium snapshot written to {COMPENDIUM_SNAPSHOT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
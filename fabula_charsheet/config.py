@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 
@@ -15,11 +16,51 @@ SAVED_CHARS_IMG_DIRECTORY.mkdir(parents=True, exist_ok=True)
 SAVED_STATES_DIRECTORY = Path(SAVED_CHARS_DIRECTORY, "states").resolve()
 SAVED_STATES_DIRECTORY.mkdir(parents=True, exist_ok=True)
 
+# Play state changes are journaled here and compacted into the saved state after a quiet period
+STATE_JOURNAL_DIRECTORY = Path(SAVED_STATES_DIRECTORY, "journal").resolve()
+AUTOSAVE_DEBOUNCE_SECONDS = 5.0
+AUTOSAVE_MAX_JOURNAL_ENTRIES = 200
+
+# "yaml" keeps the file layout above, "sqlite" stores everything in SAVED_CHARS_DIRECTORY/characters.sqlite3
+STORAGE_BACKEND = os.environ.get("FABULA_STORAGE_BACKEND", "yaml")
+# File format of characters and states saved by the "yaml" backend: "json", "msgpack" (needs the msgpack package)
+# or "yaml". Saves in any of them are loaded; migrate_saves.py converts existing ones.
+SAVE_FORMAT = os.environ.get("FABULA_SAVE_FORMAT", "json")
+
 LOCALS_DIRECTORY = Path(ASSETS_DIRECTORY, "locals").resolve()
 LOCALS_DIRECTORY.mkdir(parents=True, exist_ok=True)
 
+COMPENDIUM_SNAPSHOT_PATH = Path(PROJECT_ROOT_DIRECTORY, "compendium.snapshot").resolve()
+
+# How compendium files are parsed without a valid snapshot: "serial", "thread", "process" (a pool of
+# COMPENDIUM_LOADER_WORKERS processes, one per core by default) or "auto" (processes for large asset sets)
+COMPENDIUM_LOADER = os.environ.get("FABULA_COMPENDIUM_LOADER", "auto")
+COMPENDIUM_LOADER_WORKERS = int(os.environ["FABULA_COMPENDIUM_WORKERS"]) if "FABULA_COMPENDIUM_WORKERS" in os.environ else None
+
+# Set FABULA_HOT_RELOAD=1 to reload the compendium and translations when their YAML files change
+# (needs the watchdog package). Changes are applied HOT_RELOAD_DEBOUNCE_SECONDS after the last one.
+HOT_RELOAD = os.environ.get("FABULA_HOT_RELOAD") == "1"
+HOT_RELOAD_DEBOUNCE_SECONDS = 0.5
+
+# Set FABULA_INSTRUMENTATION=1 to time reruns and show the debug panel in the sidebar
+INSTRUMENTATION = os.environ.get("FABULA_INSTRUMENTATION") == "1"
+RERUN_HISTORY_SIZE = 50
+PROFILE_DIRECTORY = Path(PROJECT_ROOT_DIRECTORY, "profiles").resolve()
+
 default_avatar_path = Path(ASSETS_DIRECTORY, "images/default_avatar_2.png")
 
+# Avatar display widths; a thumbnail is cached for each when an avatar is saved
+AVATAR_LIST_WIDTH = 150
+AVATAR_OVERVIEW_WIDTH = 300
+
+MIN_LEVEL = 1
+MAX_LEVEL = 60
+
+LOADER_PAGE_SIZE = 10
+# The party table re-reads play states and recomputes stats this often while it is open
+PARTY_REFRESH_SECONDS = 5
+DIALOG_PAGE_SIZE = 10
+
 MIN_ATTRIBUTE_VALUE = 6
 MAX_ATTRIBUTE_VALUE = 12
 
@@ -0,0 +1,20 @@
+"""
+Cached pydantic validators for lists of models.
+
+Validating a whole list in one `TypeAdapter` call keeps the per-item work in pydantic-core,
+instead of one Python-level `Model(**item)` call and kwargs dict per item.
+"""
+from __future__ import annotations
+
+import functools
+from typing import TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+@functools.cache
+def list_adapter(model_type: type[Model]) -> TypeAdapter[list[Model]]:
+    """The `list[model_type]` validator, built once per model type."""
+    return TypeAdapter(list[model_type])
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import uuid
+from pathlib import Path
+
+from data import storage
+from data.models import CharState
+from data.storage import Storage
+
+
+AUTOSAVE: StateAutosave | None = None
+
+
+class StateAutosave:
+    """
+    Persists play states as they change, without rewriting the whole state on every click.
+
+    `record` compares a state with the last recorded one and appends only the changed fields as
+    one JSON line to `{journal_directory}/{id}.journal`. The journal is compacted into the storage's
+    state snapshot once no change was recorded for `debounce_seconds`, or right away once it holds
+    `max_entries` lines. Snapshots are written atomically by the storage. `recover` replays the
+    journal over the last snapshot, so only the changes still in the OS write buffer are lost
+    when the app is killed. `peek` does the same replay for readers that only display a state
+    and must not reset what was recorded.
+
+    Journal lines hold the new values of the changed fields, not deltas, so replaying lines that
+    were already compacted (a crash between the snapshot and the truncation) is harmless.
+    """
+
+    def __init__(self, storage: Storage, journal_directory: Path, debounce_seconds: float = 5.0, max_entries: int = 200):
+        self.storage = storage
+        self.journal_directory = journal_directory
+        self.debounce_seconds = debounce_seconds
+        self.max_entries = max_entries
+        self.__lock = threading.RLock()
+        self.__recorded: dict[uuid.UUID, dict] = {}
+        self.__entries: dict[uuid.UUID, int] = {}
+        self.__timers: dict[uuid.UUID, threading.Timer] = {}
+
+    def journal_path(self, char_id: uuid.UUID) -> Path:
+        return Path(self.journal_directory, f"{char_id}.journal")
+
+    def record(self, char_id: uuid.UUID, state: CharState) -> bool:
+        """Journal the fields of `state` changed since the last call; returns whether anything changed."""
+        current = state.model_dump(mode="json")
+        with self.__lock:
+            recorded = self.__recorded.get(char_id)
+            if recorded is None:
+                # First sight of this character in the process: the snapshot plus journal is the baseline
+                recorded = self.__recover_raw(char_id)
+            changes = {key: value for key, value in current.items() if recorded.get(key) != value}
+            self.__recorded[char_id] = current
+            if not changes:
+                return False
+
+            self.journal_directory.mkdir(parents=True, exist_ok=True)
+            with self.journal_path(char_id).open("a", encoding="utf-8") as journal:
+                journal.write(json.dumps(changes, separators=(",", ":")) + "\n")
+            self.__entries[char_id] = self.__entries.get(char_id, 0) + 1
+            self.__schedule(char_id, 0 if self.__entries[char_id] >= self.max_entries else self.debounce_seconds)
+            return True
+
+    def save(self, char_id: uuid.UUID, state: CharState):
+        """Record `state` and write its snapshot now."""
+        with self.__lock:
+            self.record(char_id, state)
+            self.compact(char_id)
+
+    def compact(self, char_id: uuid.UUID):
+        """Write the recorded state as the snapshot and empty the journal."""
+        with self.__lock:
+            timer = self.__timers.pop(char_id, None)
+            if timer is not None:
+                timer.cancel()
+            recorded = self.__recorded.get(char_id)
+            if recorded is None:
+                recorded = self.__recover_raw(char_id)
+            self.storage.save_state(char_id, CharState.model_validate(recorded))
+            self.journal_path(char_id).unlink(missing_ok=True)
+            self.__entries[char_id] = 0
+
+    def flush(self):
+        """Compact every journal with pending changes, e.g. before shutting down."""
+        with self.__lock:
+            for char_id in list(self.__timers):
+                self.compact(char_id)
+
+    def recover(self, char_id: uuid.UUID) -> CharState | None:
+        """The last snapshot with the journal replayed over it, or None when neither exists."""
+        with self.__lock:
+            if self.storage.load_state(char_id) is None and not self.journal_path(char_id).is_file():
+                return None
+            recorded = self.__recover_raw(char_id)
+            self.__recorded[char_id] = recorded
+            return CharState.model_validate(recorded)
+
+    def peek(self, char_id: uuid.UUID) -> CharState | None:
+        """Like `recover`, but leaves the recorded state, the journal and its entry count untouched."""
+        with self.__lock:
+            snapshot = self.storage.load_state(char_id)
+            if snapshot is None and not self.journal_path(char_id).is_file():
+                return None
+            state, _, _ = self.__replay(char_id, snapshot)
+            return CharState.model_validate(state)
+
+    def __recover_raw(self, char_id: uuid.UUID) -> dict:
+        journal_path = self.journal_path(char_id)
+        state, entries, torn = self.__replay(char_id, self.storage.load_state(char_id))
+        if torn:
+            # New entries must not be appended to the torn line
+            self.storage.save_state(char_id, CharState.model_validate(state))
+            journal_path.unlink()
+            entries = 0
+        self.__entries[char_id] = entries
+        return state
+
+    def __replay(self, char_id: uuid.UUID, snapshot: CharState | None) -> tuple[dict, int, bool]:
+        """The snapshot with the journal applied, the number of journal entries and whether the last one was torn."""
+        state = (snapshot or CharState()).model_dump(mode="json")
+        entries = 0
+        torn = False
+        journal_path = self.journal_path(char_id)
+        if journal_path.is_file():
+            with journal_path.open(encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        changes = json.loads(line)
+                    except ValueError:
+                        # The app was killed mid-append; only the last line can be torn
+                        logging.warning(f"Ignoring a torn entry at the end of {journal_path}")
+                        torn = True
+                        break
+                    state.update(changes)
+                    entries += 1
+        return state, entries, torn
+
+    def __schedule(self, char_id: uuid.UUID, delay: float):
+        timer = self.__timers.pop(char_id, None)
+        if timer is not None:
+            timer.cancel()
+        timer = threading.Timer(delay, self.__compact_if_current, args=(char_id,))
+        timer.daemon = True
+        self.__timers[char_id] = timer
+        timer.start()
+
+    def __compact_if_current(self, char_id: uuid.UUID):
+        with self.__lock:
+            if self.__timers.get(char_id) is not threading.current_thread():
+                # Rescheduled or compacted since this timer was started
+                return
+            try:
+                self.compact(char_id)
+            except Exception as e:
+                logging.warning(f"Autosave of state {char_id} failed, the journal is kept: {e}")
+
+
+def load_state(char_id: uuid.UUID) -> CharState | None:
+    """The current state of a character for display, with journaled changes; None when it can't be read."""
+    try:
+        if AUTOSAVE is not None:
+            return AUTOSAVE.peek(char_id)
+        return storage.STORAGE.load_state(char_id)
+    except Exception as e:
+        logging.warning(f"Unable to load state {char_id}: {e}")
+        return None
+
+
+def init(storage: Storage, journal_directory: Path, debounce_seconds: float = 5.0, max_entries: int = 200):
+    global AUTOSAVE
+    if AUTOSAVE is not None:
+        return
+    AUTOSAVE = StateAutosave(storage, journal_directory, debounce_seconds, max_entries)
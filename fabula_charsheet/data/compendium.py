@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+import logging
+import multiprocessing
+import os
+import threading
 from collections import defaultdict
-from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-import yaml
 from pydantic import BaseModel
 
 from data.models import Weapon, CharClass, Spell, ClassName, WeaponCategory, Armor, Shield, Therioform, Dance, Quality, \
-    HeroicSkill, Skill, Arcanum, Invention
+    HeroicSkill, Skill, Arcanum, Invention, FrozenList, freeze
+from data import yaml_io
+from data.adapters import list_adapter
+from data.snapshot import read_snapshot
 
 COMPENDIUM: Compendium | None = None
+_pinned = threading.local()
+
+
+# Every entry is a frozen model (see data.models.frozen) and every list a FrozenList, so lookups hand
+# out the shared objects themselves. Thaw an entry when adding it to a character.
 
 
 @dataclass(frozen=True)
@@ -29,14 +40,15 @@ class Equipment:
 @dataclass(frozen=True)
 class Classes:
     classes: list[CharClass] = field(default_factory=list)
+    _by_name: dict[str, CharClass] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_by_name", {char_class.name: char_class for char_class in self.classes})
 
     def get_class(self, name: str | None) -> CharClass | None:
         if name is None:
             return None
-        for char_class in self.classes:
-            if char_class.name == name.lower():
-                return deepcopy(char_class)
-        return None
+        return self._by_name.get(name.lower())
 
 
 @dataclass(frozen=True)
@@ -45,24 +57,22 @@ class Spells:
 
     def get_spells(self, class_name: str | None) -> list[Spell]:
         if class_name is None:
-            return []
-        for char_class_name in self.spells.keys():
-            if char_class_name == class_name.lower():
-                return deepcopy(self.spells[char_class_name])
-        return []
+            return FrozenList()
+        return self.spells.get(class_name.lower(), FrozenList())
 
 
 @dataclass(frozen=True)
 class HeroicSkills:
     heroic_skills: list[HeroicSkill] = field(default_factory=list)
+    _by_name: dict[str, HeroicSkill] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_by_name", {skill.name: skill for skill in self.heroic_skills})
 
     def get_skill(self, name: str | None) -> HeroicSkill | None:
         if name is None:
             return None
-        for skill in self.heroic_skills:
-            if skill.name == name.lower():
-                return deepcopy(skill)
-        return None
+        return self._by_name.get(name.lower())
 
 
 @dataclass(frozen=True)
@@ -76,80 +86,211 @@ class Compendium:
     arcana: list[Arcanum] = field(default_factory=list)
     qualities: dict[str, Quality] = field(default_factory=dict)
     inventions: list[Invention] = field(default_factory=list)
+    _class_name_by_skill: dict[str, ClassName] = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        class_name_by_skill = {}
+        for char_class in self.classes.classes:
+            for skill in char_class.skills:
+                class_name_by_skill.setdefault(skill.name, char_class.name)
+        object.__setattr__(self, "_class_name_by_skill", class_name_by_skill)
 
     def get_class_name_from_skill(self, skill: Skill):
-        for char_class in self.classes.classes:
-            if char_class.get_skill(skill.name):
-                return char_class.name
-        return None
+        return self._class_name_by_skill.get(skill.name.lower())
 
 
 def get_assets_from_file(file_path: Path, asset_class: type[BaseModel]) -> list[BaseModel]:
     with file_path.open(encoding='utf8') as f:
-        raw_assets = yaml.load(f, Loader=yaml.UnsafeLoader)
-        if isinstance(raw_assets, list):
-            return [asset_class(**item) for item in raw_assets]
-        else:
-            return [asset_class(**raw_assets)]
-
-
-def init(assets_directory: Path) -> None:
+        raw_assets = yaml_io.load(f)
+    if not isinstance(raw_assets, list):
+        raw_assets = [raw_assets]
+    return FrozenList(freeze(asset) for asset in list_adapter(asset_class).validate_python(raw_assets))
+
+
+def init(
+        assets_directory: Path,
+        snapshot_path: Path | None = None,
+        loader: str = "auto",
+        workers: int | None = None,
+) -> None:
     global COMPENDIUM
     if COMPENDIUM is not None:
         return
 
-    equipment_directory = Path(assets_directory, 'equipment').resolve(strict=True)
-    equipment_dict = {}
-    for yaml_file in equipment_directory.glob('*.yaml'):
-        item_mapping = {
-            "weapons": Weapon,
-            "armors": Armor,
-            "shields": Shield,
-        }
-        equipment_dict[yaml_file.stem] = get_assets_from_file(yaml_file, item_mapping[yaml_file.stem])
-
-    classes_directory = Path(assets_directory, 'classes').resolve(strict=True)
-    classes_list = []
-    for yaml_file in classes_directory.glob('*.yaml'):
-        classes_list.extend(get_assets_from_file(yaml_file, CharClass))
-
-    spells_directory = Path(assets_directory, 'spells').resolve(strict=True)
-    spells_dict = {}
-    for yaml_file in spells_directory.glob('*.yaml'):
-        spells_dict[yaml_file.stem] = get_assets_from_file(yaml_file, Spell)
-
-    heroic_skills_directory = Path(assets_directory, 'skills').resolve(strict=True)
-    heroic_skills_list = []
-    for yaml_file in heroic_skills_directory.glob('*.yaml'):
-        heroic_skills_list.extend(get_assets_from_file(yaml_file, HeroicSkill))
-
-    special_directory = Path(assets_directory, 'special').resolve(strict=True)
-    special_dict = {}
-    for yaml_file in special_directory.glob('*.yaml'):
-        item_mapping = {
-            "therioforms": Therioform,
-            "dances": Dance,
-            "arcana": Arcanum,
-            "inventions": Invention
+    if snapshot_path is not None:
+        COMPENDIUM = read_snapshot(assets_directory, snapshot_path)
+        if COMPENDIUM is not None:
+            return
+
+    COMPENDIUM = load_from_yaml(assets_directory, loader, workers)
+
+
+ASSET_LOADERS = ("auto", "serial", "thread", "process")
+# Spawning worker processes takes about half a second, the time the main thread needs to parse
+# and validate roughly 1 MB of assets; below this size "auto" parses on the main thread
+PARALLEL_MIN_BYTES = 2 * 1024 * 1024
+
+EQUIPMENT_CLASSES = {"weapons": Weapon, "armors": Armor, "shields": Shield}
+SPECIAL_CLASSES = {"therioforms": Therioform, "dances": Dance, "arcana": Arcanum, "inventions": Invention}
+
+
+@dataclass(frozen=True)
+class AssetFile:
+    directory: str
+    path: Path
+    asset_class: type[BaseModel] | None
+
+
+class AssetLoadError(ValueError):
+    """Every asset file that could not be parsed or validated, with its error."""
+
+    def __init__(self, errors: dict[Path, Exception]):
+        self.errors = errors
+        super().__init__(
+            "Unable to load compendium assets:\n"
+            + "\n".join(f"  - {path}: {error}" for path, error in errors.items())
+        )
+
+
+def asset_files(assets_directory: Path) -> list[AssetFile]:
+    """The compendium's YAML files, sorted by name within each directory so that merges are deterministic."""
+    def files(directory: str) -> list[Path]:
+        return sorted(Path(assets_directory, directory).resolve(strict=True).glob("*.yaml"))
+
+    return [
+        *(AssetFile("equipment", path, EQUIPMENT_CLASSES.get(path.stem)) for path in files("equipment")),
+        *(AssetFile("classes", path, CharClass) for path in files("classes")),
+        *(AssetFile("spells", path, Spell) for path in files("spells")),
+        *(AssetFile("skills", path, HeroicSkill) for path in files("skills")),
+        *(AssetFile("special", path, SPECIAL_CLASSES.get(path.stem)) for path in files("special")),
+        *(AssetFile("qualities", path, Quality) for path in files("qualities")),
+    ]
+
+
+def parse_asset_files(files: list[AssetFile], loader: str = "auto", workers: int | None = None) -> list[list[BaseModel]]:
+    """
+    Run `get_assets_from_file` for every file, on the main thread or a thread or process pool.
+
+    Results come back in the order of `files`. Failures are collected and raised together
+    as an AssetLoadError, so one broken asset pack reports every bad file at once.
+    """
+    if loader not in ASSET_LOADERS:
+        raise ValueError(f"Unknown compendium loader '{loader}'. Expected one of: {', '.join(ASSET_LOADERS)}.")
+    errors: dict[Path, Exception] = {
+        asset_file.path: KeyError(f"no asset type for '{asset_file.path.stem}' in {asset_file.directory}")
+        for asset_file in files
+        if asset_file.asset_class is None
+    }
+    if errors:
+        raise AssetLoadError(errors)
+
+    if loader == "auto":
+        size = sum(asset_file.path.stat().st_size for asset_file in files)
+        parallel = size >= PARALLEL_MIN_BYTES and (workers or os.process_cpu_count() or 1) > 1
+        loader = "process" if parallel else "serial"
+
+    results = []
+    if loader == "serial":
+        for asset_file in files:
+            try:
+                results.append(get_assets_from_file(asset_file.path, asset_file.asset_class))
+            except Exception as e:
+                errors[asset_file.path] = e
+    else:
+        if loader == "thread":
+            executor = ThreadPoolExecutor(max_workers=workers)
+        else:
+            # Forking a process that runs threads (the Streamlit server does) can deadlock the children
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        with executor:
+            futures = [
+                executor.submit(get_assets_from_file, asset_file.path, asset_file.asset_class)
+                for asset_file in files
+            ]
+            for asset_file, future in zip(files, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    errors[asset_file.path] = e
+
+    if errors:
+        raise AssetLoadError(errors)
+    return results
+
+
+def load_from_yaml(assets_directory: Path, loader: str = "auto", workers: int | None = None) -> Compendium:
+    files = asset_files(assets_directory)
+    mtimes = [asset_file.path.stat().st_mtime_ns for asset_file in files]
+    results = parse_asset_files(files, loader, workers)
+    with _reload_lock:
+        _parsed_files.clear()
+        for asset_file, mtime_ns, assets in zip(files, mtimes, results):
+            _parsed_files[asset_file.path] = (mtime_ns, assets)
+    return build_compendium(files, results)
+
+
+# Assets of every parsed file with the mtime they were read at, so reloads only reparse changed files
+_parsed_files: dict[Path, tuple[int, list[BaseModel]]] = {}
+_reload_lock = threading.Lock()
+
+
+def reload(assets_directory: Path) -> list[Path]:
+    """
+    Rebuild the compendium, reparsing only the files changed since they were last parsed, and swap it in.
+
+    Returns the reparsed files. If any file fails to load, the error is raised and the current
+    compendium stays in place.
+    """
+    global COMPENDIUM
+    with _reload_lock:
+        files = asset_files(assets_directory)
+        mtimes = {asset_file.path: asset_file.path.stat().st_mtime_ns for asset_file in files}
+        changed = [
+            asset_file for asset_file in files
+            if _parsed_files.get(asset_file.path, (None,))[0] != mtimes[asset_file.path]
+        ]
+        reparsed = dict(zip((asset_file.path for asset_file in changed), parse_asset_files(changed, "serial")))
+        parsed_files = {
+            asset_file.path: (mtimes[asset_file.path], reparsed[asset_file.path])
+            if asset_file.path in reparsed else _parsed_files[asset_file.path]
+            for asset_file in files
         }
-        special_dict[yaml_file.stem] = get_assets_from_file(yaml_file, item_mapping[yaml_file.stem])
-
-    quality_directory = Path(assets_directory, 'qualities').resolve(strict=True)
-    quality_dict = {}
-    for yaml_file in quality_directory.glob('*.yaml'):
-        quality_dict[yaml_file.stem] = get_assets_from_file(yaml_file, Quality)
-
-    e = Equipment(**equipment_dict)
-    c = Compendium(
-        equipment=e,
-        classes=Classes(classes=classes_list),
-        spells=Spells(spells=spells_dict),
-        heroic_skills=HeroicSkills(heroic_skills=heroic_skills_list),
-        **special_dict,
-        qualities=quality_dict,
+        new_compendium = build_compendium(files, [parsed_files[asset_file.path][1] for asset_file in files])
+
+        _parsed_files.clear()
+        _parsed_files.update(parsed_files)
+        COMPENDIUM = new_compendium
+    logging.info(f"Compendium reloaded, {len(changed)} file(s) reparsed")
+    return [asset_file.path for asset_file in changed]
+
+
+def pin() -> Compendium | None:
+    """Make `get_compendium` return the current compendium in this thread, i.e. for the rest of a rerun."""
+    _pinned.compendium = COMPENDIUM
+    return COMPENDIUM
+
+
+def get_compendium() -> Compendium:
+    """The compendium pinned for the running rerun, so a reload never swaps it out halfway, or else the current one."""
+    return getattr(_pinned, "compendium", None) or COMPENDIUM
+
+
+def build_compendium(files: list[AssetFile], results: list[list[BaseModel]]) -> Compendium:
+    parsed = defaultdict(dict)
+    for asset_file, assets in zip(files, results):
+        parsed[asset_file.directory][asset_file.path.stem] = assets
+
+    def merged(directory: str) -> list:
+        return FrozenList(asset for assets in parsed[directory].values() for asset in assets)
+
+    return Compendium(
+        equipment=Equipment(**parsed["equipment"]),
+        classes=Classes(classes=merged("classes")),
+        spells=Spells(spells=parsed["spells"]),
+        heroic_skills=HeroicSkills(heroic_skills=merged("skills")),
+        **parsed["special"],
+        qualities=parsed["qualities"],
     )
-    COMPENDIUM = c
 
 
 if __name__ == "__main__":
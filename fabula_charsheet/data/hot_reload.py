@@ -0,0 +1,91 @@
+"""
+Reloads the compendium and translations when their YAML files change, without restarting the app.
+
+A watchdog observer collects the changed files; once no change came in for `debounce_seconds`,
+the compendium and/or the translations are rebuilt from the changed files only and swapped in.
+A rerun that already started keeps the compendium it pinned; the next rerun sees the new one.
+If an edit leaves a file unloadable, the error is logged and the previous data stays in use.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from pathlib import Path
+
+from data import compendium
+from data import localizator
+
+try:
+    from watchdog.events import FileSystemEvent, FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+
+WATCHER: AssetWatcher | None = None
+_init_lock = threading.Lock()
+
+
+class AssetWatcher(FileSystemEventHandler):
+    def __init__(self, assets_directory: Path, locals_directory: Path, debounce_seconds: float = 0.5):
+        self.assets_directory = assets_directory
+        self.locals_directory = locals_directory
+        self.debounce_seconds = debounce_seconds
+        self.__lock = threading.Lock()
+        self.__changed: set[Path] = set()
+        self.__timer: threading.Timer | None = None
+
+    def on_any_event(self, event: FileSystemEvent):
+        if event.is_directory or event.event_type in ("opened", "closed_no_write"):
+            return
+        paths = [event.src_path, getattr(event, "dest_path", "")]
+        changed = {Path(str(path)) for path in paths if str(path).endswith(".yaml")}
+        if not changed:
+            return
+        with self.__lock:
+            self.__changed |= changed
+            if self.__timer is not None:
+                self.__timer.cancel()
+            self.__timer = threading.Timer(self.debounce_seconds, self.reload)
+            self.__timer.daemon = True
+            self.__timer.start()
+
+    def reload(self):
+        """Rebuild whatever the files changed since the last reload belong to."""
+        with self.__lock:
+            changed, self.__changed = self.__changed, set()
+            self.__timer = None
+        if not changed:
+            return
+
+        if any(path.is_relative_to(self.locals_directory) for path in changed):
+            try:
+                localizator.reload_localizator(self.locals_directory)
+                logging.info("Translations reloaded")
+            except Exception as e:
+                logging.warning(f"Translations not reloaded, keeping the current ones: {e}")
+        if any(not path.is_relative_to(self.locals_directory) for path in changed):
+            try:
+                compendium.reload(self.assets_directory)
+            except Exception as e:
+                logging.warning(f"Compendium not reloaded, keeping the current one: {e}")
+
+
+def start(assets_directory: Path, locals_directory: Path, debounce_seconds: float = 0.5):
+    """Watch the asset directory for the rest of the process; later calls do nothing."""
+    global WATCHER
+    if WATCHER is not None:
+        return
+
+    with _init_lock:
+        if WATCHER is not None:
+            return
+        if Observer is None:
+            logging.warning("Hot reload needs the watchdog package; asset changes will need a restart")
+            return
+        WATCHER = AssetWatcher(assets_directory.resolve(), locals_directory.resolve(), debounce_seconds)
+        observer = Observer()
+        observer.daemon = True
+        observer.schedule(WATCHER, str(WATCHER.assets_directory), recursive=True)
+        observer.start()
@@ -1,69 +1,150 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 
-import yaml
 import streamlit as st
 
+from data import yaml_io
 from data.models import LangEnum, LocNamespace
 
 
+LOCALIZATOR: Localizator | None = None
+_init_lock = threading.Lock()
+_pinned = threading.local()
+
+MAX_CACHED_LANGUAGES = 4
+
+
 class Localizator:
     default_language = LangEnum.en
 
-    def __init__(self, translations: dict[LangEnum, dict[str, str]]):
-        self.__translations = translations
+    def __init__(self, locals_directory: Path, max_cached_languages: int = MAX_CACHED_LANGUAGES):
+        self.locals_directory = locals_directory
+        self.max_cached_languages = max_cached_languages
+        self.load_times: dict[LangEnum, float] = {}
+        self.__lock = threading.Lock()
+        self.__cache: OrderedDict[LangEnum, LocNamespace] = OrderedDict()
+        self.__default = LocNamespace(root=self.__load(LangEnum.en, fallback={}))
 
     def get(self, lang: LangEnum):
-        return LocNamespace(root=self.__translations.get(lang, {}))
+        if lang == self.default_language:
+            return self.__default
+
+        with self.__lock:
+            namespace = self.__cache.get(lang)
+            if namespace is not None:
+                self.__cache.move_to_end(lang)
+                return namespace
+
+            namespace = LocNamespace(root=self.__load(lang, fallback=self.__default.root))
+            self.__cache[lang] = namespace
+            while len(self.__cache) > max(self.max_cached_languages - 1, 0):
+                evicted, _ = self.__cache.popitem(last=False)
+                forget_translation_files(Path(self.locals_directory, evicted))
+            return namespace
+
+    def loaded_languages(self) -> list[LangEnum]:
+        return [self.default_language, *self.__cache.keys()]
+
+    def __load(self, lang: LangEnum, fallback: dict[str, str]) -> dict[str, str]:
+        start = time.perf_counter()
+        lang_dir = Path(self.locals_directory, lang).resolve(strict=True)
+        if not lang_dir.is_dir():
+            raise FileNotFoundError(f"Missing translations directory for {lang.value}")
+
+        # Fall back to English for any missing key
+        translations = {**fallback, **load_translations_from_dir(lang_dir)}
+
+        self.load_times[lang] = time.perf_counter() - start
+        logging.info(f"Loaded '{lang.value}' translations in {self.load_times[lang] * 1000:.1f} ms")
+        return translations
 
 
 def init_localizator(locals_directory: Path):
-    if st.session_state.get("localizator"):
+    global LOCALIZATOR
+    if LOCALIZATOR is not None:
         return
 
-    translations = {}
-
-    def load_translations_from_dir(lang_dir: Path) -> dict:
-        merged_translations = {}
-        key_origins = {}
-        for yaml_file in sorted(lang_dir.rglob("*.yaml")):
-            with yaml_file.open(encoding="utf8") as f:
-                data = yaml.load(f, Loader=yaml.SafeLoader) or {}
-                if not isinstance(data, dict):
-                    raise ValueError(f"Invalid YAML structure in {yaml_file}")
-
-                for key, value in data.items():
-                    if key in merged_translations:
-                        raise ValueError(
-                            f"Duplicate translation key '{key}' found in:\n"
-                            f"  - {key_origins[key]}\n"
-                            f"  - {yaml_file}"
-                        )
-                    merged_translations[key] = value
-                    key_origins[key] = yaml_file
-        return merged_translations
-
-    # Load English first as fallback
-    english_translations = load_translations_from_dir(
-        Path(locals_directory, LangEnum.en).resolve(strict=True)
-    )
-    translations[LangEnum.en] = english_translations
-
-    # Load other languages, fallback to English
-    for lang in LangEnum:
-        if lang == LangEnum.en:
-            continue
-
-        lang_dir = Path(locals_directory, lang).resolve(strict=True)
-        if not lang_dir.is_dir():
-            raise FileNotFoundError(f"Missing translations directory for {lang.value}")
+    with _init_lock:
+        if LOCALIZATOR is not None:
+            return
+        LOCALIZATOR = Localizator(locals_directory)
+
+
+def reload_localizator(locals_directory: Path):
+    """
+    Build a new Localizator and swap it in. Only translation files changed since they were last
+    read are parsed again. If a file fails to load, the error is raised and the current one stays.
+    """
+    global LOCALIZATOR
+    localizator = Localizator(locals_directory)
+    for lang in LOCALIZATOR.loaded_languages() if LOCALIZATOR is not None else []:
+        localizator.get(lang)
+    LOCALIZATOR = localizator
+
+
+def pin() -> Localizator | None:
+    """Make `get_localizator` return the current Localizator in this thread, i.e. for the rest of a rerun."""
+    _pinned.localizator = LOCALIZATOR
+    return LOCALIZATOR
+
+
+def get_localizator() -> Localizator:
+    """The Localizator pinned for the running rerun, so a reload never mixes translations in one page, or else the current one."""
+    return getattr(_pinned, "localizator", None) or LOCALIZATOR
+
+
+# Translations of the read files with the mtime they were read at, so reloads only reparse changed files.
+# A language's files are dropped when it leaves the Localizator cache.
+_parsed_files: dict[Path, tuple[int, dict]] = {}
+_parsed_files_lock = threading.Lock()
+
+
+def load_translation_file(yaml_file: Path) -> dict:
+    mtime_ns = yaml_file.stat().st_mtime_ns
+    with _parsed_files_lock:
+        cached = _parsed_files.get(yaml_file)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    with yaml_file.open(encoding="utf8") as f:
+        data = yaml_io.load(f) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid YAML structure in {yaml_file}")
+    with _parsed_files_lock:
+        _parsed_files[yaml_file] = (mtime_ns, data)
+    return data
+
+
+def forget_translation_files(lang_dir: Path):
+    lang_dir = lang_dir.resolve()
+    with _parsed_files_lock:
+        for yaml_file in [path for path in _parsed_files if path.is_relative_to(lang_dir)]:
+            del _parsed_files[yaml_file]
 
-        lang_translations = load_translations_from_dir(lang_dir)
 
-        merged_with_fallback = {**english_translations, **lang_translations}
+def load_translations_from_dir(lang_dir: Path) -> dict[str, str]:
+    merged_translations = {}
+    key_origins = {}
+    for yaml_file in sorted(lang_dir.rglob("*.yaml")):
+        for key, value in load_translation_file(yaml_file).items():
+            if key in merged_translations:
+                raise ValueError(
+                    f"Duplicate translation key '{key}' found in:\n"
+                    f"  - {key_origins[key]}\n"
+                    f"  - {yaml_file}"
+                )
+            merged_translations[key] = value
+            key_origins[key] = yaml_file
+    return merged_translations
 
-        translations[lang] = merged_with_fallback
 
-    st.session_state.localizator = Localizator(translations)
+def get_loc() -> LocNamespace:
+    return get_localizator().get(st.session_state.get("language", Localizator.default_language))
 
 
 def select_local():
@@ -82,4 +163,4 @@ def select_local():
             )
 
         if "char_controller" in st.session_state:
-            st.session_state.char_controller.loc = st.session_state.localizator.get(st.session_state.language)
+            st.session_state.char_controller.loc = get_loc()
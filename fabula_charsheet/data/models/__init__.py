@@ -57,6 +57,7 @@ from .dance import (
     DanceDuration
 )
 from .quality import Quality
+from .frozen import FrozenDict, FrozenList, FrozenSet, freeze, thaw, is_frozen
 from .arcana import Arcanum
 
 from .invention import Invention
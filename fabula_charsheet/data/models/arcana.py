@@ -14,22 +14,22 @@ class Arcanum(BaseModel):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"arcanum_{self.name}"
-        return getattr(loc, key, self.name)
+        return loc.get(key, self.name)
 
     def merge(self, loc: LocNamespace) -> str:
         if self.custom_merge is not None:
             return self.custom_merge
         key = f"arcanum_{self.name}_merge"
-        return getattr(loc, key, "No merge desciption found")
+        return loc.get(key, "No merge desciption found")
 
     def dismiss(self, loc: LocNamespace) -> str:
         if self.custom_dismiss is not None:
             return self.custom_dismiss
         key = f"arcanum_{self.name}_dismiss"
-        return getattr(loc, key, "No dismiss desciption found")
+        return loc.get(key, "No dismiss desciption found")
 
     def domains(self, loc: LocNamespace) -> str:
         if self.custom_domains is not None:
             return self.custom_domains
         key = f"arcanum_{self.name}_domains"
-        return getattr(loc, key, "No domains found")
+        return loc.get(key, "No domains found")
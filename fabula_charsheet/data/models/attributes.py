@@ -15,10 +15,7 @@ class AttributeName(StrEnum):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"attr_{self.name}"
-        try:
-            return getattr(loc, key)
-        except AttributeError:
-            return self.name.capitalize()
+        return loc.get(key, self.name.capitalize())
 
     def to_alias(self, loc: LocNamespace) -> str:
         key_map = {
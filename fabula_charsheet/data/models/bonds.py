@@ -17,10 +17,7 @@ class Emotion(StrEnum):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"emotion_{self.name}"
-        try:
-            return getattr(loc, key)
-        except AttributeError:
-            return self.name.capitalize()
+        return loc.get(key, self.name.capitalize())
 
 
 class Bond(BaseModel):
@@ -17,17 +17,11 @@ class ClassBonus(StrEnum):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"{self.name}"
-        try:
-            return getattr(loc, key)
-        except AttributeError:
-            return self.name.capitalize()
+        return loc.get(key, self.name.capitalize())
 
     def localized_full_name(self, loc: LocNamespace):
         key = f"{self.name}_full"
-        try:
-            return getattr(loc, key)
-        except AttributeError:
-            return self.name.capitalize()
+        return loc.get(key, self.name.capitalize())
 
 class Ritual(StrEnum):
     ritualism = auto()
@@ -39,10 +33,7 @@ class Ritual(StrEnum):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"ritual_{self.name}"
-        try:
-            return getattr(loc, key)
-        except AttributeError:
-            return self.name.capitalize()
+        return loc.get(key, self.name.capitalize())
 
 class CharClass(BaseModel):
     name: ClassName | None = None
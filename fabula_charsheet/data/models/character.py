@@ -1,22 +1,24 @@
 from __future__ import annotations
 
 import uuid
+from collections import Counter
 from typing import TYPE_CHECKING
 from enum import StrEnum, auto
 
-from pydantic import BaseModel, Field, ConfigDict, conint
+from pydantic import BaseModel, Field, ConfigDict, conint, field_validator
 
 from .bonds import Bond
 from .char_class import CharClass, ClassName
 from .attributes import Dexterity, Might, Willpower, Insight
 from .inventory import Inventory
-from .skill import HeroicSkill, HeroicSkillName
+from .skill import HeroicSkill, HeroicSkillName, Skill
 from .spell import Spell, ChimeristSpell
 from .therioform import Therioform
 from .dance import Dance
 from .arcana import Arcanum
 from .invention import Invention
 from .companion import Companion
+from .tracked_list import TrackedList, list_index
 
 
 if TYPE_CHECKING:
@@ -37,7 +39,7 @@ class CharacterTheme(StrEnum):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"theme_{self.name}"
-        return getattr(loc, key, self.name.capitalize())
+        return loc.get(key, self.name.capitalize())
 
 class InvalidCharacterField(Exception):
     pass
@@ -53,6 +55,32 @@ class CharSpecial(BaseModel):
     def get_special(self, attribute: str):
         return getattr(self, attribute, None)
 
+def _classes_by_name(classes: list[CharClass]) -> dict[str, CharClass]:
+    by_name = {}
+    for char_class in classes:
+        by_name.setdefault(char_class.name, char_class)
+    return by_name
+
+
+def _heroic_skill_counts(heroic_skills: list[HeroicSkill]) -> Counter[str]:
+    return Counter(skill.name for skill in heroic_skills)
+
+
+def _skills_by_name(classes: list[CharClass]) -> dict[str, list[Skill]]:
+    by_name = {}
+    for char_class in classes:
+        for skill in char_class.skills:
+            by_name.setdefault(skill.name, []).append(skill)
+    return by_name
+
+
+def _spells_by_name(spells: list[Spell]) -> dict[str, list[Spell]]:
+    by_name = {}
+    for spell in spells:
+        by_name.setdefault(spell.name, []).append(spell)
+    return by_name
+
+
 class Character(BaseModel):
     model_config = ConfigDict(validate_assignment=True)
 
@@ -62,7 +90,7 @@ class Character(BaseModel):
     identity: str = ""
     theme: str = ""
     origin: str = ""
-    classes: list[CharClass] = list()
+    classes: list[CharClass] = Field(default_factory=TrackedList)
     dexterity: Dexterity = Field(default_factory=Dexterity)
     might: Might = Field(default_factory=Might)
     insight: Insight = Field(default_factory=Insight)
@@ -70,9 +98,19 @@ class Character(BaseModel):
     inventory: Inventory = Field(default_factory=Inventory)
     spells: dict[ClassName, list[Spell | ChimeristSpell]] = dict()
     special: CharSpecial = Field(default_factory=CharSpecial)
-    heroic_skills: list[HeroicSkill] = list()
+    heroic_skills: list[HeroicSkill] = Field(default_factory=TrackedList)
     bonds: list[Bond] = list()
 
+    @field_validator("classes", "heroic_skills", mode="after")
+    @classmethod
+    def track_list(cls, value: list) -> TrackedList:
+        return TrackedList(value)
+
+    @field_validator("spells", mode="after")
+    @classmethod
+    def track_spell_lists(cls, value: dict) -> dict:
+        return {class_name: TrackedList(spells) for class_name, spells in value.items()}
+
     def set_level(self, level: int, loc: LocNamespace):
         if not 1 <= level <= 60:
             msg = loc.error_invalid_level.format(level=level) if hasattr(loc,
@@ -115,10 +153,15 @@ class Character(BaseModel):
     def get_spells_by_class(self, class_name: str | None) -> list[Spell]:
         if class_name is None:
             return []
-        for spell_class, spell_list in self.spells.items():
-            if spell_class == class_name.lower():
-                return spell_list
-        return []
+        return self.spells.get(class_name.lower(), [])
+
+    def has_spell(self, class_name: str, spell: Spell) -> bool:
+        """Whether the class already lists this spell; only spells sharing its name are compared."""
+        spells = self.get_spells_by_class(class_name)
+        return spell in list_index(spells, "by_name", _spells_by_name).get(spell.name, ())
+
+    def set_spells(self, class_name: ClassName, spells: list[Spell]):
+        self.spells[class_name] = TrackedList(spells)
 
     def get_all_spells(self) -> list[Spell]:
         spell_list = []
@@ -129,13 +172,15 @@ class Character(BaseModel):
     def get_class(self, class_name: str | None) -> CharClass | None:
         if class_name is None:
             return None
-        for char_class in self.classes:
-            if char_class.name == class_name.lower():
-                return char_class
-        return None
+        return list_index(self.classes, "by_name", _classes_by_name).get(class_name.lower())
+
+    def has_skill(self, skill_name: str) -> bool:
+        """Whether any class has the skill at level 1 or more; levels are read from the indexed skills themselves."""
+        skills = list_index(self.classes, "skills_by_name", _skills_by_name).get(skill_name.lower(), ())
+        return any(skill.current_level > 0 for skill in skills)
 
     def has_heroic_skill(self, heroic_skill_name: HeroicSkillName) -> bool:
-        for skill in self.heroic_skills:
-            if skill.name == heroic_skill_name:
-                return True
-        return False
+        return self.heroic_skill_count(heroic_skill_name) > 0
+
+    def heroic_skill_count(self, heroic_skill_name: str) -> int:
+        return list_index(self.heroic_skills, "counts", _heroic_skill_counts)[heroic_skill_name]
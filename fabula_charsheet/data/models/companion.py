@@ -45,11 +45,11 @@ class CompanionSkill(BaseModel):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"npc_skill_{self.name}"
-        return getattr(loc, key, self.name.replace("_", " ").capitalize())
+        return loc.get(key, self.name.replace("_", " ").capitalize())
 
     def localized_description(self, loc: LocNamespace) -> str:
         key = f"npc_skill_{self.name}_description"
-        return getattr(loc, key, f"[Missing description for {self.name}]")
+        return loc.get(key, f"[Missing description for {self.name}]")
 
 
 class CompanionAttack(BaseModel):
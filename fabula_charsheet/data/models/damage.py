@@ -21,7 +21,4 @@ class DamageType(StrEnum):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"damage_{self.name}"
-        try:
-            return getattr(loc, key)
-        except AttributeError:
-            return self.name.capitalize()
+        return loc.get(key, self.name.capitalize())
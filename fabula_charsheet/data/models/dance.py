@@ -14,10 +14,7 @@ class DanceDuration(StrEnum):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"dance_duration_{self.name}"
-        try:
-            return getattr(loc, key)
-        except AttributeError:
-            return self.name.capitalize()
+        return loc.get(key, self.name.capitalize())
 
 class Dance(BaseModel):
     name: str = ""
@@ -25,8 +22,8 @@ class Dance(BaseModel):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"dance_{self.name}"
-        return getattr(loc, key, self.name.capitalize())
+        return loc.get(key, self.name.capitalize())
 
     def localized_description(self, loc: LocNamespace) -> str:
         key = f"dance_{self.name}_description"
-        return getattr(loc, key, f"[Missing description for {self.name}]")
+        return loc.get(key, f"[Missing description for {self.name}]")
@@ -0,0 +1,178 @@
+"""
+Frozen variants of the models, used for the compendium's shared entries.
+
+`freeze` turns a model into an instance of a generated `Frozen<Model>` subclass, so
+lookups can hand out the compendium's own objects instead of copies: assigning a
+field raises a ValidationError and list, dict and set fields are `FrozenList`s,
+`FrozenDict`s and `FrozenSet`s that refuse changes.
+A frozen model still is an instance of its model and compares equal to a thawed copy.
+`thaw` gives back a mutable copy; call it when an entry is added to a character.
+"""
+from __future__ import annotations
+
+from functools import cache
+from typing import TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class FrozenList(list):
+    """A list that refuses changes. Being a list, it still compares equal to and serializes like one."""
+
+    def _refuse(self, *args, **kwargs):
+        raise TypeError("compendium entries are shared and cannot be changed, thaw() them first")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _refuse
+    append = extend = insert = pop = remove = clear = sort = reverse = _refuse
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __reduce__(self):
+        return FrozenList, (list(self),)
+
+
+class FrozenDict(dict):
+    """A dict that refuses changes. Being a dict, it still compares equal to and serializes like one."""
+
+    def _refuse(self, *args, **kwargs):
+        raise TypeError("compendium entries are shared and cannot be changed, thaw() them first")
+
+    __setitem__ = __delitem__ = __ior__ = _refuse
+    clear = pop = popitem = setdefault = update = _refuse
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+class FrozenSet(set):
+    """A set that refuses changes. Being a set, it still compares equal to and serializes like one."""
+
+    def _refuse(self, *args, **kwargs):
+        raise TypeError("compendium entries are shared and cannot be changed, thaw() them first")
+
+    __ior__ = __iand__ = __isub__ = __ixor__ = _refuse
+    add = clear = discard = pop = remove = update = _refuse
+    difference_update = intersection_update = symmetric_difference_update = _refuse
+
+    def __hash__(self):
+        return hash(frozenset(self))
+
+    def __reduce__(self):
+        return FrozenSet, (set(self),)
+
+
+class _Frozen:
+    """Marker base of the generated frozen model classes."""
+
+
+def _frozen_eq(self, other):
+    # Python tries a subclass's __eq__ first, so this also handles `thawed == frozen`
+    if not isinstance(other, BaseModel) or thawed_type(type(other)) is not thawed_type(type(self)):
+        return NotImplemented
+    return (
+        self.__dict__ == other.__dict__
+        and self.__pydantic_private__ == other.__pydantic_private__
+        and self.__pydantic_extra__ == other.__pydantic_extra__
+    )
+
+
+def _frozen_hash(self):
+    return hash((thawed_type(type(self)), *self.__dict__.values()))
+
+
+@cache
+def frozen_type(model_type: type[M]) -> type[M]:
+    if issubclass(model_type, _Frozen):
+        return model_type
+    name = f"Frozen{model_type.__name__}"
+    return type(model_type)(name, (model_type, _Frozen), {
+        "__module__": __name__,
+        "__qualname__": name,
+        "model_config": ConfigDict(frozen=True),
+        "__eq__": _frozen_eq,
+        "__hash__": _frozen_hash,
+        "thaw": thaw,
+    })
+
+
+def thawed_type(model_type: type[M]) -> type[M]:
+    if issubclass(model_type, _Frozen):
+        return model_type.__bases__[0]
+    return model_type
+
+
+def __getattr__(name: str):
+    # Lets pickle find the generated classes, e.g. in a compendium snapshot or from a worker process
+    from data import models
+
+    model_type = getattr(models, name.removeprefix("Frozen"), None) if name.startswith("Frozen") else None
+    if not (isinstance(model_type, type) and issubclass(model_type, BaseModel)):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return frozen_type(model_type)
+
+
+def is_frozen(model: BaseModel) -> bool:
+    return isinstance(model, _Frozen)
+
+
+def freeze(model: M) -> M:
+    """The model as a frozen instance, with every nested model, list, dict and set frozen too."""
+    if is_frozen(model):
+        return model
+    return _rebuild(model, frozen_type(type(model)), _freeze_value)
+
+
+def thaw(model: M) -> M:
+    """A mutable copy of a frozen or thawed model; nested models and containers are copied, other values are shared."""
+    return _rebuild(model, thawed_type(type(model)), _thaw_value)
+
+
+def _rebuild(model: BaseModel, model_type: type[M], convert) -> M:
+    # What BaseModel.__copy__ does, minus validation and with the values converted
+    rebuilt = model_type.__new__(model_type)
+    object.__setattr__(rebuilt, "__dict__", {name: convert(value) for name, value in model.__dict__.items()})
+    object.__setattr__(rebuilt, "__pydantic_fields_set__", set(model.__pydantic_fields_set__))
+    object.__setattr__(rebuilt, "__pydantic_extra__", None if model.__pydantic_extra__ is None else {
+        name: convert(value) for name, value in model.__pydantic_extra__.items()
+    })
+    object.__setattr__(rebuilt, "__pydantic_private__", None if model.__pydantic_private__ is None else {
+        name: value for name, value in model.__pydantic_private__.items()
+    })
+    return rebuilt
+
+
+def _freeze_value(value):
+    # Every container comes out hashable, which _frozen_hash relies on
+    if isinstance(value, BaseModel):
+        return freeze(value)
+    if isinstance(value, list):
+        return value if isinstance(value, FrozenList) else FrozenList(_freeze_value(item) for item in value)
+    if isinstance(value, dict):
+        return value if isinstance(value, FrozenDict) else FrozenDict(
+            (key, _freeze_value(item)) for key, item in value.items()
+        )
+    if isinstance(value, set):
+        return value if isinstance(value, FrozenSet) else FrozenSet(_freeze_value(item) for item in value)
+    if isinstance(value, tuple):
+        return tuple(_freeze_value(item) for item in value)
+    return value
+
+
+def _thaw_value(value):
+    if isinstance(value, BaseModel):
+        return thaw(value)
+    if isinstance(value, list):
+        return [_thaw_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _thaw_value(item) for key, item in value.items()}
+    if isinstance(value, set):
+        return {_thaw_value(item) for item in value}
+    if isinstance(value, tuple):
+        return tuple(_thaw_value(item) for item in value)
+    return value
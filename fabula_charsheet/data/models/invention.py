@@ -13,8 +13,8 @@ class Invention(BaseModel):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"invention_{self.name}"
-        return getattr(loc, key, self.name.capitalize())
+        return loc.get(key, self.name.capitalize())
 
     def localized_description(self, loc: LocNamespace) -> str:
         key = f"invention_{self.name}_description"
-        return getattr(loc, key, f"[Missing description for {self.name}]")
+        return loc.get(key, f"[Missing description for {self.name}]")
@@ -22,21 +22,17 @@ class Item(BaseModel):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"item_{self.name}"
-        try:
-            return getattr(loc, key)
-        except AttributeError:
-            return self.name.capitalize()
+        return loc.get(key, self.name.capitalize())
 
     def localized_quality(self, loc: LocNamespace) -> str:
         if self.quality == "no_quality":
-            return getattr(loc, "item_no_quality", self.quality)
+            return loc.get("item_no_quality", self.quality)
         elif self.quality == "improvised":
-            return getattr(loc, "improvised_quality", self.quality)
+            return loc.get("improvised_quality", self.quality)
         else:
-            try:
-                loc_quality =  getattr(loc, f"quality_{self.quality}_short")
-                if self.quality_detail:
-                    return loc_quality.format(*[q.localized_name(loc) for q in self.quality_detail])
-                return loc_quality
-            except AttributeError:
+            loc_quality = loc.get(f"quality_{self.quality}_short")
+            if loc_quality is None:
                 return self.quality
+            if self.quality_detail:
+                return loc_quality.format(*[q.localized_name(loc) for q in self.quality_detail])
+            return loc_quality
@@ -1,18 +1,93 @@
-from enum import StrEnum, auto
+from __future__ import annotations
 
-from pydantic import RootModel
+import keyword
+import string
+from collections.abc import Callable, Mapping
+from enum import StrEnum, auto
 
 
 class LangEnum(StrEnum):
     en = auto()
     ru = auto()
 
-class LocNamespace(RootModel[dict[str, str]]):
-    def __getattr__(self, item: str) -> str:
+
+_FORMATTER = string.Formatter()
+
+
+def _compile_template(template: str) -> Callable[..., str] | None:
+    """Turn a `{placeholder}` template into an equivalent f-string lambda, or None if it can't be."""
+    try:
+        parsed = list(_FORMATTER.parse(template))
+    except ValueError:
+        return None
+
+    source = []
+    fields = []
+    for literal, field_name, spec, conversion in parsed:
+        source.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field_name is None:
+            continue
+        if not field_name.isidentifier() or keyword.iskeyword(field_name) or "{" in spec:
+            return None
+        if field_name not in fields:
+            fields.append(field_name)
+        source.append(
+            "{" + field_name + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}"
+        )
+
+    if not fields:
+        return None
+    try:
+        return eval(f"lambda *, {', '.join(fields)}, **_: f{''.join(source)!r}", {"__builtins__": {}})
+    except SyntaxError:
+        return None
+
+
+class LocTemplate(str):
+    """Translation string whose `.format(**kwargs)` runs a renderer compiled once at load time."""
+
+    def format(self, *args, **kwargs) -> str:
+        if args:
+            return str.format(self, *args, **kwargs)
         try:
-            return self.root[item]
-        except KeyError:
-            raise AttributeError(f"Translation key '{item}' not found")
+            return self._render(**kwargs)
+        except TypeError:
+            # Missing placeholder: let str.format raise its usual KeyError
+            return str.format(self, **kwargs)
+
+
+def _prepare(value):
+    if isinstance(value, str) and "{" in value:
+        render = _compile_template(value)
+        if render is not None:
+            template = LocTemplate(value)
+            template._render = render
+            return template
+    return value
+
+
+class LocNamespace:
+    """
+    Translation lookup backed by the instance __dict__, so `loc.some_key` is a plain attribute hit.
+
+    Use `get(key, default)` when a key may be missing; attribute access raises AttributeError.
+    """
+
+    def __init__(self, root: Mapping[str, str]):
+        self.__dict__.update({key: _prepare(value) for key, value in root.items()})
+
+    @property
+    def root(self) -> dict[str, str]:
+        return self.__dict__
+
+    def __getattr__(self, item: str) -> str:
+        raise AttributeError(f"Translation key '{item}' not found")
 
     def __getitem__(self, item: str) -> str:
-        return self.root[item]
+        return self.__dict__[item]
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.__dict__
+
+    def get(self, item: str, default: str | None = None) -> str | None:
+        return self.__dict__.get(item, default)
@@ -13,8 +13,8 @@ class Quality(BaseModel):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"quality_{self.name}"
-        return getattr(loc, key, self.name)
+        return loc.get(key, self.name)
 
     def localized_description(self, loc: LocNamespace) -> str:
         key = f"quality_{self.name}_description"
-        return getattr(loc, key, "No description found")
+        return loc.get(key, "No description found")
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import ast
 import re
+from functools import lru_cache
+from types import CodeType
 
 from pydantic import BaseModel
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 from enum import StrEnum, auto
 
 from .class_name import ClassName
@@ -27,32 +29,72 @@ _ALLOWED_AST_NODES = (
 )
 
 
-def _resolve_skill_level_placeholders(text: str, level: int, token: str) -> str:
-    if not token:
-        return text
+_LEVEL_NAME = "_level"
+
+
+class _CompiledBracket(NamedTuple):
+    content: str
+    code: CodeType | None
+
+
+@lru_cache(maxsize=64)
+def _token_pattern(token: str) -> re.Pattern:
+    return re.compile(rf"\b{re.escape(token)}\b")
+
 
-    token_pattern = re.compile(rf"\b{re.escape(token)}\b")
+def _compile_bracket(content: str, token_pattern: re.Pattern) -> _CompiledBracket:
+    expression = token_pattern.sub(_LEVEL_NAME, content)
+    expression = expression.replace("&nbsp;", " ").replace("×", "*").replace("x", "*")
+    try:
+        tree = ast.parse(expression, mode="eval")
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Load) or (isinstance(node, ast.Name) and node.id == _LEVEL_NAME):
+                continue
+            if not isinstance(node, _ALLOWED_AST_NODES):
+                raise ValueError("disallowed expression")
+            if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+                raise ValueError("disallowed constant")
+        return _CompiledBracket(content, compile(tree, "<skill_level_expr>", "eval"))
+    except (SyntaxError, ValueError):
+        return _CompiledBracket(content, None)
 
-    def resolve_bracket(match: re.Match) -> str:
-        content = token_pattern.sub(str(level), match.group(1))
 
-        expression = content.replace("&nbsp;", " ").replace("×", "*").replace("x", "*")
+@lru_cache(maxsize=512)
+def _compile_description(text: str, token: str) -> tuple[str | _CompiledBracket, ...]:
+    """Split a description into literal text and bracket expressions parsed once per (text, token)."""
+    token_pattern = _token_pattern(token)
+    parts = []
+    position = 0
+    for match in _BRACKET_PATTERN.finditer(text):
+        parts.append(text[position:match.start()])
+        parts.append(_compile_bracket(match.group(1), token_pattern))
+        position = match.end()
+    parts.append(text[position:])
+    return tuple(parts)
+
+
+def _resolve_bracket(bracket: _CompiledBracket, level: int, token: str) -> str:
+    if bracket.code is not None:
         try:
-            tree = ast.parse(expression, mode="eval")
-            for node in ast.walk(tree):
-                if not isinstance(node, _ALLOWED_AST_NODES):
-                    raise ValueError("disallowed expression")
-                if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
-                    raise ValueError("disallowed constant")
-            total = eval(compile(tree, "<skill_level_expr>", "eval"))
-        except (SyntaxError, ValueError, ZeroDivisionError, TypeError):
-            return f"【{content}】"
-
-        if isinstance(total, float) and total.is_integer():
-            total = int(total)
-        return f"【{total}】"
-
-    return _BRACKET_PATTERN.sub(resolve_bracket, text)
+            total = eval(bracket.code, {"__builtins__": {}}, {_LEVEL_NAME: level})
+        except (ZeroDivisionError, TypeError):
+            pass
+        else:
+            if isinstance(total, float) and total.is_integer():
+                total = int(total)
+            return f"【{total}】"
+    return f"【{_token_pattern(token).sub(str(level), bracket.content)}】"
+
+
+@lru_cache(maxsize=4096)
+def _resolve_skill_level_placeholders(text: str, level: int, token: str) -> str:
+    if not token:
+        return text
+
+    return "".join(
+        part if isinstance(part, str) else _resolve_bracket(part, level, token)
+        for part in _compile_description(text, token)
+    )
 
 class HeroicSkillName(StrEnum):
     deep_pockets = auto()
@@ -79,14 +121,14 @@ class Skill(BaseModel):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"skill_{self.name}"
-        return getattr(loc, key, self.name.capitalize())
+        return loc.get(key, self.name.capitalize())
 
     def localized_description(self, loc: LocNamespace) -> str:
         key = f"skill_{self.name}_description"
-        return getattr(loc, key, f"[Missing description for {self.name}]")
+        return loc.get(key, f"[Missing description for {self.name}]")
 
     def resolved_description(self, loc: LocNamespace) -> str:
-        token = getattr(loc, "skill_level_short", "")
+        token = loc.get("skill_level_short", "")
         return _resolve_skill_level_placeholders(self.localized_description(loc), self.current_level, token)
 
 class HeroicSkill(BaseModel):
@@ -97,8 +139,8 @@ class HeroicSkill(BaseModel):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"skill_{self.name}"
-        return getattr(loc, key, self.name.capitalize())
+        return loc.get(key, self.name.capitalize())
 
     def localized_description(self, loc: LocNamespace) -> str:
         key = f"skill_{self.name}_description"
-        return getattr(loc, key, f"[Missing description for {self.name}]")
+        return loc.get(key, f"[Missing description for {self.name}]")
@@ -18,7 +18,4 @@ class Species(StrEnum):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"species_{self.name}"
-        try:
-            return getattr(loc, key)
-        except AttributeError:
-            return self.name.capitalize()
+        return loc.get(key, self.name.capitalize())
@@ -20,10 +20,7 @@ class SpellTarget(StrEnum):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"spell_target_{self.name}"
-        try:
-            return getattr(loc, key)
-        except AttributeError:
-            return self.name.replace("_", " ").capitalize()
+        return loc.get(key, self.name.replace("_", " ").capitalize())
 
 class SpellDuration(StrEnum):
     instantaneous = auto()
@@ -31,10 +28,7 @@ class SpellDuration(StrEnum):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"spell_duration_{self.name}"
-        try:
-            return getattr(loc, key)
-        except AttributeError:
-            return self.name.capitalize()
+        return loc.get(key, self.name.capitalize())
 
 class Spell(BaseModel):
     name: str = ""
@@ -47,15 +41,15 @@ class Spell(BaseModel):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"spell_{self.name}"
-        return getattr(loc, key, self.name)
+        return loc.get(key, self.name)
 
     def localized_description(self, loc: LocNamespace) -> str:
         key = f"spell_{self.name}_description"
-        return getattr(loc, key, "No description found")
+        return loc.get(key, "No description found")
 
     def localized_damage(self, loc: LocNamespace) -> str:
         key = f"damage_{self.damage_type}"
-        return getattr(loc, key, "Unknown damage")
+        return loc.get(key, "Unknown damage")
 
 class ChimeristSpell(Spell):
     species: Species
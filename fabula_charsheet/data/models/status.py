@@ -17,7 +17,4 @@ class Status(StrEnum):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"status_{self.name}"
-        try:
-            return getattr(loc, key)
-        except AttributeError:
-            return self.name.capitalize()
+        return loc.get(key, self.name.capitalize())
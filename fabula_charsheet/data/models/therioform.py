@@ -13,12 +13,12 @@ class Therioform(BaseModel):
 
     def localized_name(self, loc: LocNamespace) -> str:
         key = f"therioform_{self.name}"
-        return getattr(loc, key, self.name.capitalize())
+        return loc.get(key, self.name.capitalize())
 
     def localized_description(self, loc: LocNamespace) -> str:
         key = f"therioform_{self.name}_description"
-        return getattr(loc, key, f"[Missing description for {self.name}]")
+        return loc.get(key, f"[Missing description for {self.name}]")
 
     def localized_creatures(self, loc: LocNamespace) -> str:
         key = f"therioform_{self.name}_creatures"
-        return getattr(loc, key, f"[Missing creatures for {self.name}]")
+        return loc.get(key, f"[Missing creatures for {self.name}]")
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+def _tracked(method_name: str):
+    method = getattr(list, method_name)
+
+    def wrapper(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = method_name
+    return wrapper
+
+
+class TrackedList(list):
+    """
+    A list that counts its in-place mutations in `version`.
+
+    Lets a model cache lookups built from a list field and tell in O(1) whether the list
+    changed since, without owning every call site that appends to or removes from it.
+    """
+
+    version = 0
+
+    def cached(self, name: str, build: Callable[[list], T]) -> T:
+        """Return `build(self)`, reusing the result until the list is mutated."""
+        indexes = self.__dict__.setdefault("indexes", {})
+        entry = indexes.get(name)
+        if entry is None or entry[0] != self.version:
+            entry = (self.version, build(self))
+            indexes[name] = entry
+        return entry[1]
+
+    append = _tracked("append")
+    extend = _tracked("extend")
+    insert = _tracked("insert")
+    remove = _tracked("remove")
+    pop = _tracked("pop")
+    clear = _tracked("clear")
+    sort = _tracked("sort")
+    reverse = _tracked("reverse")
+    __setitem__ = _tracked("__setitem__")
+    __delitem__ = _tracked("__delitem__")
+    __iadd__ = _tracked("__iadd__")
+    __imul__ = _tracked("__imul__")
+
+
+def list_index(items: list, name: str, build: Callable[[list], T]) -> T:
+    """Cached `build(items)` for a TrackedList; plain lists can't report changes and are rebuilt each call."""
+    if isinstance(items, TrackedList):
+        return items.cached(name, build)
+    return build(items)
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from pathlib import Path
-
-import yaml
+import threading
+import uuid
+from dataclasses import dataclass, field
 
 from data.models import Character
+from data.storage import Storage, CharacterEntry
 
 
 SAVED_CHARS: SavedChars | None = None
@@ -13,26 +13,63 @@ SAVED_CHARS: SavedChars | None = None
 
 @dataclass(frozen=True)
 class SavedChars:
-    char_list: list[Character]
+    """In-memory list of saved characters; full characters are only read from storage on `load`."""
+    storage: Storage
+    entries: dict[uuid.UUID, CharacterEntry] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    _sorted: list[CharacterEntry] | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def char_list(self) -> list[CharacterEntry]:
+        sorted_entries = self._sorted
+        if sorted_entries is None:
+            sorted_entries = sorted(self.entries.values(), key=lambda entry: (entry.name.lower(), str(entry.id)))
+            object.__setattr__(self, "_sorted", sorted_entries)
+        return sorted_entries
+
+    def search(self, name: str = "", min_level: int | None = None, max_level: int | None = None) -> list[CharacterEntry]:
+        """Filter the index by a case-insensitive name fragment and an inclusive level range."""
+        name = name.strip().lower()
+        return [
+            entry for entry in self.char_list
+            if (not name or name in entry.name.lower())
+            and (min_level is None or entry.level >= min_level)
+            and (max_level is None or entry.level <= max_level)
+        ]
+
+    def get_entry(self, char_id: uuid.UUID) -> CharacterEntry | None:
+        return self.entries.get(char_id)
+
+    def load(self, char_id: uuid.UUID) -> Character:
+        if char_id not in self.entries:
+            raise KeyError(f"No saved character with id {char_id}")
+        return self.storage.load_character(char_id)
 
+    def add(self, entry: CharacterEntry) -> None:
+        with self._lock:
+            self.entries[entry.id] = entry
+            object.__setattr__(self, "_sorted", None)
 
-def init(saved_chars_directory: Path) -> None:
+    def remove(self, char_id: uuid.UUID) -> None:
+        with self._lock:
+            self.entries.pop(char_id, None)
+            object.__setattr__(self, "_sorted", None)
+
+
+def init(storage: Storage) -> None:
     global SAVED_CHARS
     if SAVED_CHARS is not None:
         return
 
-    char_list = []
-    for yaml_file in saved_chars_directory.glob('*.yaml'):
-        with yaml_file.open(encoding='utf8') as f:
-            raw_char = yaml.load(f, Loader=yaml.Loader)
-            char_list.append(Character(**dict(raw_char)))
-
-    s = SavedChars(
-        char_list=char_list,
+    SAVED_CHARS = SavedChars(
+        storage=storage,
+        entries={entry.id: entry for entry in storage.list_characters()},
     )
-    SAVED_CHARS = s
 
 
 if __name__ == "__main__":
-    init(Path("fabula_charsheet/characters"))
+    from pathlib import Path
+    from data.storage import create_storage
+
+    init(create_storage("yaml", Path("fabula_charsheet/characters")))
     print(SAVED_CHARS)
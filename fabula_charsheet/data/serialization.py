@@ -0,0 +1,82 @@
+"""
+Encoding of saved characters and states.
+
+Saves are written as JSON by default (pydantic's native `model_dump_json`/`model_validate_json`),
+or as msgpack when the optional `msgpack` package is installed. YAML stays available for older
+saves and for human-readable exports. Loading looks at the content rather than the file name,
+so a save in any of the formats can be read back.
+"""
+from __future__ import annotations
+
+from typing import TypeVar
+
+import pydantic_core
+from pydantic import BaseModel, ValidationError
+
+from data import yaml_io
+
+try:
+    import msgpack
+except ImportError:  # optional, only needed for the "msgpack" save format
+    msgpack = None
+
+SAVE_FORMATS = ("json", "msgpack", "yaml")
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+def check_save_format(save_format: str):
+    if save_format not in SAVE_FORMATS:
+        raise ValueError(f"Unknown save format '{save_format}'. Expected one of: {', '.join(SAVE_FORMATS)}.")
+    if save_format == "msgpack" and msgpack is None:
+        raise ValueError("The 'msgpack' save format requires the msgpack package (install the msgpack extra).")
+
+
+def detect_format(content: bytes) -> str:
+    """Save format of `content`: a JSON object, a msgpack map, or otherwise YAML."""
+    if _may_be_json(content):
+        try:
+            pydantic_core.from_json(content)
+            return "json"
+        except ValueError:
+            # Flow-style YAML starts with "{" too
+            return "yaml"
+    if _may_be_msgpack(content):
+        return "msgpack"
+    return "yaml"
+
+
+def _may_be_json(content: bytes) -> bool:
+    return content.lstrip()[:1] == b"{"
+
+
+def _may_be_msgpack(content: bytes) -> bool:
+    # fixmap, map16 and map32 markers; none of them can start UTF-8 text
+    return bool(content) and (0x80 <= content[0] <= 0x8f or content[0] in (0xde, 0xdf))
+
+
+def dump_model(model: BaseModel, save_format: str) -> bytes:
+    match save_format:
+        case "json":
+            return model.model_dump_json().encode("utf-8")
+        case "msgpack":
+            check_save_format(save_format)
+            return msgpack.packb(model.model_dump(mode="json"))
+        case "yaml":
+            return yaml_io.dump(model.model_dump(mode="json")).encode("utf-8")
+        case _:
+            check_save_format(save_format)
+
+
+def load_model(model_type: type[Model], content: bytes) -> Model:
+    # Same detection as `detect_format`, without parsing JSON content twice
+    if _may_be_json(content):
+        try:
+            return model_type.model_validate_json(content)
+        except ValidationError as e:
+            if e.errors()[0]["type"] != "json_invalid":
+                raise
+    elif _may_be_msgpack(content):
+        check_save_format("msgpack")
+        return model_type.model_validate(msgpack.unpackb(content))
+    return model_type.model_validate(yaml_io.load(content))
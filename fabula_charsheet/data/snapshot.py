@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import pickle
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pydantic
+
+if TYPE_CHECKING:
+    from data.compendium import Compendium
+
+
+SNAPSHOT_VERSION = 1
+
+ASSET_SUBDIRECTORIES = (
+    "equipment",
+    "classes",
+    "spells",
+    "skills",
+    "special",
+    "qualities",
+)
+
+DATA_DIRECTORY = Path(__file__).parent
+MODEL_SOURCES = (
+    DATA_DIRECTORY / "compendium.py",
+    *sorted(Path(DATA_DIRECTORY, "models").glob("*.py")),
+)
+
+
+def assets_hash(assets_directory: Path) -> str:
+    """Hash every compendium source file, plus the model sources they are validated against."""
+    digest = hashlib.sha256()
+    digest.update(f"{SNAPSHOT_VERSION}:{pydantic.VERSION}".encode())
+
+    sources = [
+        (subdirectory, yaml_file)
+        for subdirectory in ASSET_SUBDIRECTORIES
+        for yaml_file in sorted(Path(assets_directory, subdirectory).glob("*.yaml"))
+    ]
+    sources.extend(("models", py_file) for py_file in MODEL_SOURCES)
+
+    for group, source_file in sources:
+        digest.update(f"{group}/{source_file.name}".encode())
+        digest.update(source_file.read_bytes())
+    return digest.hexdigest()
+
+
+def write_snapshot(compendium: Compendium, assets_directory: Path, snapshot_path: Path) -> None:
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "hash": assets_hash(assets_directory),
+    }
+    tmp_path = snapshot_path.with_suffix(snapshot_path.suffix + ".tmp")
+    with tmp_path.open("wb") as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(compendium, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(snapshot_path)
+
+
+def read_snapshot(assets_directory: Path, snapshot_path: Path) -> Compendium | None:
+    """Return the snapshotted compendium, or None if it is missing, stale or unreadable."""
+    if not snapshot_path.is_file():
+        return None
+
+    try:
+        with snapshot_path.open("rb") as f:
+            header = pickle.load(f)
+            if header.get("version") != SNAPSHOT_VERSION:
+                return None
+            if header.get("hash") != assets_hash(assets_directory):
+                return None
+            return pickle.load(f)
+    except Exception as e:
+        logging.warning(f"Unable to read compendium snapshot {snapshot_path}: {e}")
+        return None
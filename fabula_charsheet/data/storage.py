@@ -0,0 +1,543 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from io import BytesIO
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from data.models import Character, CharState
+from data.serialization import SAVE_FORMATS, check_save_format, dump_model, load_model
+
+
+STORAGE: Storage | None = None
+
+AVATAR_EXTENSIONS = ("jpg", "jpeg", "png", "gif")
+THUMBNAIL_FORMAT = "webp"
+
+
+@dataclass(frozen=True)
+class CharacterEntry:
+    id: uuid.UUID
+    name: str
+    level: int
+
+
+class Storage:
+    """
+    Persistence for characters, their play states and avatars, addressed by character id.
+
+    Subclasses implement every method; `delete_*` return False when there was nothing to delete.
+    """
+
+    def list_characters(self) -> list[CharacterEntry]:
+        raise NotImplementedError
+
+    def load_character(self, char_id: uuid.UUID) -> Character:
+        raise NotImplementedError
+
+    def save_character(self, character: Character) -> CharacterEntry:
+        raise NotImplementedError
+
+    def character_version(self, char_id: uuid.UUID) -> int | None:
+        """A number that changes whenever the character is saved, or None if it is not saved."""
+        raise NotImplementedError
+
+    def delete_character(self, char_id: uuid.UUID) -> bool:
+        raise NotImplementedError
+
+    def load_state(self, char_id: uuid.UUID) -> CharState | None:
+        raise NotImplementedError
+
+    def save_state(self, char_id: uuid.UUID, state: CharState) -> None:
+        raise NotImplementedError
+
+    def load_avatar(self, char_id: uuid.UUID) -> Path | bytes | None:
+        raise NotImplementedError
+
+    def save_avatar(self, character: Character, image: bytes, suffix: str) -> None:
+        raise NotImplementedError
+
+    def delete_avatar(self, char_id: uuid.UUID) -> bool:
+        raise NotImplementedError
+
+    def load_avatar_thumbnail(self, char_id: uuid.UUID, width: int) -> Path | bytes | None:
+        """The avatar scaled down to `width` pixels, generated once and cached by the storage."""
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class IndexRecord:
+    entry: CharacterEntry
+    file_name: str
+    mtime_ns: int
+
+    def to_json(self) -> dict:
+        return {
+            "id": str(self.entry.id),
+            "name": self.entry.name,
+            "level": self.entry.level,
+            "file_name": self.file_name,
+            "mtime_ns": self.mtime_ns,
+        }
+
+    @classmethod
+    def from_json(cls, raw: dict) -> IndexRecord:
+        return cls(
+            entry=CharacterEntry(id=uuid.UUID(raw["id"]), name=raw["name"], level=raw["level"]),
+            file_name=raw["file_name"],
+            mtime_ns=raw["mtime_ns"],
+        )
+
+
+class YamlStorage(Storage):
+    """
+    The original on-disk layout: `{name}.{id}.character.{format}` files, `states/{id}.{format}`
+    and `character_images/{name}.{id}.{ext}`.
+
+    Files are written in `save_format` and read in whichever format they were saved in; saving
+    a character or state replaces its files in other formats. Named after the format the layout
+    started with.
+
+    A JSON index next to the character files records id, name, level and mtime, so listing
+    only parses files that are new or changed since the index was written.
+    """
+
+    index_file_name = "index.json"
+    index_version = 1
+
+    def __init__(
+            self,
+            characters_directory: Path,
+            images_directory: Path,
+            states_directory: Path,
+            thumbnail_widths: tuple[int, ...] = (),
+            save_format: str = "json",
+    ):
+        check_save_format(save_format)
+        self.save_format = save_format
+        self.characters_directory = characters_directory
+        self.images_directory = images_directory
+        self.states_directory = states_directory
+        self.thumbnails_directory = Path(images_directory, "thumbnails")
+        self.thumbnail_widths = thumbnail_widths
+        self.__lock = threading.RLock()
+        self.__records: dict[uuid.UUID, IndexRecord] = {}
+        self.__avatars: dict[uuid.UUID, Path] | None = None
+        self.__thumbnails: dict[tuple[uuid.UUID, int], Path] = {}
+
+    @property
+    def index_path(self) -> Path:
+        return Path(self.characters_directory, self.index_file_name)
+
+    def list_characters(self) -> list[CharacterEntry]:
+        with self.__lock:
+            indexed = {record.file_name: record for record in self.read_index()}
+            records = []
+            for char_file in self.character_files("*"):
+                mtime_ns = char_file.stat().st_mtime_ns
+                record = indexed.get(char_file.name)
+                if record is None or record.mtime_ns != mtime_ns:
+                    character = read_character(char_file)
+                    record = IndexRecord(
+                        entry=CharacterEntry(id=character.id, name=character.name, level=character.level),
+                        file_name=char_file.name,
+                        mtime_ns=mtime_ns,
+                    )
+                records.append(record)
+
+            self.__records = {record.entry.id: record for record in records}
+            if {record.file_name: record for record in records} != indexed:
+                self.write_index()
+            return [record.entry for record in records]
+
+    def load_character(self, char_id: uuid.UUID) -> Character:
+        record = self.__records.get(char_id)
+        if record is None or not Path(self.characters_directory, record.file_name).is_file():
+            self.list_characters()
+            record = self.__records.get(char_id)
+        if record is None:
+            raise KeyError(f"No saved character with id {char_id}")
+        return read_character(Path(self.characters_directory, record.file_name))
+
+    def character_version(self, char_id: uuid.UUID) -> int | None:
+        record = self.__records.get(char_id)
+        if record is not None:
+            try:
+                return Path(self.characters_directory, record.file_name).stat().st_mtime_ns
+            except FileNotFoundError:
+                pass
+        # Saved under another name since the index was read
+        for char_file in self.character_files(f"*.{char_id}.character"):
+            return char_file.stat().st_mtime_ns
+        return None
+
+    def save_character(self, character: Character) -> CharacterEntry:
+        with self.__lock:
+            char_file_path = Path(
+                self.characters_directory, f"{character.name}.{character.id}.character.{self.save_format}"
+            )
+            write_atomic(char_file_path, dump_model(character, self.save_format))
+            # Only once the new file is in place, so a failed write keeps the previous save
+            for old_file in self.character_files(f"*.{character.id}.character"):
+                if old_file != char_file_path:
+                    old_file.unlink()
+            entry = CharacterEntry(id=character.id, name=character.name, level=character.level)
+            self.__records[character.id] = IndexRecord(
+                entry=entry,
+                file_name=char_file_path.name,
+                mtime_ns=char_file_path.stat().st_mtime_ns,
+            )
+            self.write_index()
+            return entry
+
+    def delete_character(self, char_id: uuid.UUID) -> bool:
+        with self.__lock:
+            char_paths = self.character_files(f"*.{char_id}.character")
+            for char_path in char_paths:
+                char_path.unlink()
+            if self.__records.pop(char_id, None) is not None:
+                self.write_index()
+            return bool(char_paths)
+
+    def load_state(self, char_id: uuid.UUID) -> CharState | None:
+        for state_path in self.state_files(char_id):
+            return load_model(CharState, state_path.read_bytes())
+        return None
+
+    def save_state(self, char_id: uuid.UUID, state: CharState) -> None:
+        state_path = Path(self.states_directory, f"{char_id}.{self.save_format}")
+        write_atomic(state_path, dump_model(state, self.save_format))
+        for old_file in self.state_files(char_id):
+            if old_file != state_path:
+                old_file.unlink()
+
+    def character_files(self, stem: str) -> list[Path]:
+        """Character files matching the `stem` glob, in any save format."""
+        return [
+            path
+            for save_format in SAVE_FORMATS
+            for path in self.characters_directory.glob(f"{stem}.{save_format}")
+            if path.name != self.index_file_name
+        ]
+
+    def state_files(self, char_id: uuid.UUID) -> list[Path]:
+        """State files of a character, the one in the current save format first."""
+        formats = sorted(SAVE_FORMATS, key=lambda save_format: save_format != self.save_format)
+        paths = (Path(self.states_directory, f"{char_id}.{save_format}") for save_format in formats)
+        return [path for path in paths if path.is_file()]
+
+    def convert_saves(self) -> int:
+        """Rewrite every character and state saved in another format in `save_format`; returns the file count."""
+        converted = 0
+        with self.__lock:
+            for char_file in self.character_files("*"):
+                if char_file.suffix != f".{self.save_format}":
+                    self.save_character(read_character(char_file))
+                    converted += 1
+            stale_states = {
+                uuid.UUID(state_file.stem)
+                for save_format in SAVE_FORMATS
+                if save_format != self.save_format
+                for state_file in self.states_directory.glob(f"*.{save_format}")
+            }
+            for char_id in stale_states:
+                # A state already saved in `save_format` is the newer one and wins
+                self.save_state(char_id, self.load_state(char_id))
+                converted += 1
+        return converted
+
+    def load_avatar(self, char_id: uuid.UUID) -> Path | None:
+        return self.__avatar_index().get(char_id)
+
+    def save_avatar(self, character: Character, image: bytes, suffix: str) -> None:
+        with self.__lock:
+            self.delete_avatar(character.id)
+            avatar_path = Path(self.images_directory, f"{character.name}.{character.id}{suffix}")
+            avatar_path.write_bytes(image)
+            self.__avatar_index()[character.id] = avatar_path
+            for width in self.thumbnail_widths:
+                self.load_avatar_thumbnail(character.id, width)
+
+    def delete_avatar(self, char_id: uuid.UUID) -> bool:
+        with self.__lock:
+            for key in [key for key in self.__thumbnails if key[0] == char_id]:
+                self.__thumbnails.pop(key).unlink(missing_ok=True)
+            for thumbnail_path in self.thumbnails_directory.glob(f"{char_id}.*"):
+                thumbnail_path.unlink()
+
+            avatar_path = self.__avatar_index().pop(char_id, None)
+            if avatar_path is None:
+                return False
+            avatar_path.unlink(missing_ok=True)
+            return True
+
+    def load_avatar_thumbnail(self, char_id: uuid.UUID, width: int) -> Path | None:
+        thumbnail_path = self.__thumbnails.get((char_id, width))
+        if thumbnail_path is not None:
+            return thumbnail_path
+
+        with self.__lock:
+            avatar_path = self.load_avatar(char_id)
+            if avatar_path is None:
+                return None
+            if avatar_path.suffix.lower() == ".gif":
+                # Keep animations: GIFs are served as uploaded
+                return avatar_path
+            thumbnail_path = Path(self.thumbnails_directory, f"{char_id}.{width}.{THUMBNAIL_FORMAT}")
+            if not thumbnail_path.is_file() or thumbnail_path.stat().st_mtime_ns < avatar_path.stat().st_mtime_ns:
+                self.thumbnails_directory.mkdir(parents=True, exist_ok=True)
+                thumbnail_path.write_bytes(make_thumbnail(avatar_path.read_bytes(), width))
+            self.__thumbnails[(char_id, width)] = thumbnail_path
+            return thumbnail_path
+
+    def __avatar_index(self) -> dict[uuid.UUID, Path]:
+        """Map character id to avatar file, built from a single directory listing."""
+        if self.__avatars is None:
+            with self.__lock:
+                avatars = {}
+                for image_path in sorted(self.images_directory.iterdir(), key=avatar_priority):
+                    char_id = avatar_id(image_path)
+                    if char_id is not None:
+                        avatars.setdefault(char_id, image_path)
+                self.__avatars = avatars
+        return self.__avatars
+
+    def read_index(self) -> list[IndexRecord]:
+        if not self.index_path.is_file():
+            return []
+        try:
+            raw_index = json.loads(self.index_path.read_text(encoding="utf8"))
+            if raw_index.get("version") != self.index_version:
+                return []
+            return [IndexRecord.from_json(raw) for raw in raw_index["entries"]]
+        except (ValueError, KeyError, TypeError) as e:
+            logging.warning(f"Ignoring unreadable character index {self.index_path}: {e}")
+            return []
+
+    def write_index(self) -> None:
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({
+            "version": self.index_version,
+            "entries": [record.to_json() for record in self.__records.values()],
+        }), encoding="utf8")
+        tmp_path.replace(self.index_path)
+
+
+class SqliteStorage(Storage):
+    """
+    Everything in one SQLite database: characters and states as JSON documents keyed by id,
+    avatars as blobs. Each call runs in its own short transaction, so concurrent sessions
+    never observe a half-written character.
+    """
+
+    schema = (
+        """
+        CREATE TABLE IF NOT EXISTS characters (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            level INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            updated_ns INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS characters_name ON characters (name COLLATE NOCASE)",
+        "CREATE TABLE IF NOT EXISTS states (id TEXT PRIMARY KEY, data TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS avatars (id TEXT PRIMARY KEY, suffix TEXT NOT NULL, data BLOB NOT NULL)",
+        """
+        CREATE TABLE IF NOT EXISTS thumbnails (
+            id TEXT NOT NULL,
+            width INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            PRIMARY KEY (id, width)
+        )
+        """,
+    )
+
+    def __init__(self, database_path: Path, thumbnail_widths: tuple[int, ...] = ()):
+        self.database_path = database_path
+        self.thumbnail_widths = thumbnail_widths
+        with closing(self.connect()) as connection, connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            for statement in self.schema:
+                connection.execute(statement)
+
+    def connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.database_path, timeout=10)
+
+    def list_characters(self) -> list[CharacterEntry]:
+        with closing(self.connect()) as connection:
+            rows = connection.execute("SELECT id, name, level FROM characters").fetchall()
+        return [CharacterEntry(id=uuid.UUID(char_id), name=name, level=level) for char_id, name, level in rows]
+
+    def load_character(self, char_id: uuid.UUID) -> Character:
+        with closing(self.connect()) as connection:
+            row = connection.execute("SELECT data FROM characters WHERE id = ?", (str(char_id),)).fetchone()
+        if row is None:
+            raise KeyError(f"No saved character with id {char_id}")
+        return Character.model_validate_json(row[0])
+
+    def character_version(self, char_id: uuid.UUID) -> int | None:
+        with closing(self.connect()) as connection:
+            row = connection.execute("SELECT updated_ns FROM characters WHERE id = ?", (str(char_id),)).fetchone()
+        return row[0] if row is not None else None
+
+    def save_character(self, character: Character) -> CharacterEntry:
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                """
+                INSERT INTO characters (id, name, level, data, updated_ns) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    name = excluded.name,
+                    level = excluded.level,
+                    data = excluded.data,
+                    updated_ns = excluded.updated_ns
+                """,
+                (str(character.id), character.name, character.level, character.model_dump_json(), time.time_ns()),
+            )
+        return CharacterEntry(id=character.id, name=character.name, level=character.level)
+
+    def delete_character(self, char_id: uuid.UUID) -> bool:
+        with closing(self.connect()) as connection, connection:
+            cursor = connection.execute("DELETE FROM characters WHERE id = ?", (str(char_id),))
+        return cursor.rowcount > 0
+
+    def load_state(self, char_id: uuid.UUID) -> CharState | None:
+        with closing(self.connect()) as connection:
+            row = connection.execute("SELECT data FROM states WHERE id = ?", (str(char_id),)).fetchone()
+        return CharState.model_validate_json(row[0]) if row is not None else None
+
+    def save_state(self, char_id: uuid.UUID, state: CharState) -> None:
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "INSERT INTO states (id, data) VALUES (?, ?) ON CONFLICT (id) DO UPDATE SET data = excluded.data",
+                (str(char_id), state.model_dump_json()),
+            )
+
+    def load_avatar(self, char_id: uuid.UUID) -> bytes | None:
+        with closing(self.connect()) as connection:
+            row = connection.execute("SELECT data FROM avatars WHERE id = ?", (str(char_id),)).fetchone()
+        return row[0] if row is not None else None
+
+    def save_avatar(self, character: Character, image: bytes, suffix: str) -> None:
+        thumbnails = [] if suffix.lower() == ".gif" else [
+            (str(character.id), width, make_thumbnail(image, width)) for width in self.thumbnail_widths
+        ]
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                """
+                INSERT INTO avatars (id, suffix, data) VALUES (?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET suffix = excluded.suffix, data = excluded.data
+                """,
+                (str(character.id), suffix, image),
+            )
+            connection.execute("DELETE FROM thumbnails WHERE id = ?", (str(character.id),))
+            connection.executemany("INSERT INTO thumbnails (id, width, data) VALUES (?, ?, ?)", thumbnails)
+
+    def delete_avatar(self, char_id: uuid.UUID) -> bool:
+        with closing(self.connect()) as connection, connection:
+            connection.execute("DELETE FROM thumbnails WHERE id = ?", (str(char_id),))
+            cursor = connection.execute("DELETE FROM avatars WHERE id = ?", (str(char_id),))
+        return cursor.rowcount > 0
+
+    def load_avatar_thumbnail(self, char_id: uuid.UUID, width: int) -> bytes | None:
+        with closing(self.connect()) as connection:
+            row = connection.execute(
+                "SELECT data FROM thumbnails WHERE id = ? AND width = ?", (str(char_id), width)
+            ).fetchone()
+            if row is not None:
+                return row[0]
+            row = connection.execute("SELECT suffix, data FROM avatars WHERE id = ?", (str(char_id),)).fetchone()
+        if row is None:
+            return None
+        suffix, image = row
+        if suffix.lower() == ".gif":
+            return image
+        thumbnail = make_thumbnail(image, width)
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO thumbnails (id, width, data) VALUES (?, ?, ?)",
+                (str(char_id), width, thumbnail),
+            )
+        return thumbnail
+
+
+def avatar_id(image_path: Path) -> uuid.UUID | None:
+    """Character id from a `{name}.{id}.{ext}` avatar file name, or None for anything else."""
+    if image_path.suffix.lower().lstrip(".") not in AVATAR_EXTENSIONS:
+        return None
+    try:
+        return uuid.UUID(image_path.stem.rsplit(".", 1)[-1])
+    except ValueError:
+        return None
+
+
+def avatar_priority(image_path: Path) -> tuple[int, str]:
+    extension = image_path.suffix.lower().lstrip(".")
+    rank = AVATAR_EXTENSIONS.index(extension) if extension in AVATAR_EXTENSIONS else len(AVATAR_EXTENSIONS)
+    return rank, image_path.name
+
+
+def make_thumbnail(image: bytes, width: int) -> bytes:
+    with Image.open(BytesIO(image)) as source:
+        thumbnail = ImageOps.exif_transpose(source)
+        if thumbnail.width > width:
+            thumbnail = thumbnail.resize((width, max(1, round(thumbnail.height * width / thumbnail.width))))
+        output = BytesIO()
+        thumbnail.save(output, format=THUMBNAIL_FORMAT)
+        return output.getvalue()
+
+
+def write_atomic(path: Path, content: bytes):
+    """Replace `path` with `content` so that readers, or a restart after a crash, see the old or the new file whole."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("wb") as tmp_file:
+        tmp_file.write(content)
+        tmp_file.flush()
+        os.fsync(tmp_file.fileno())
+    tmp_path.replace(path)
+
+
+def read_character(char_file: Path) -> Character:
+    return load_model(Character, char_file.read_bytes())
+
+
+def create_storage(
+        backend: str,
+        saved_chars_directory: Path,
+        thumbnail_widths: tuple[int, ...] = (),
+        save_format: str = "json",
+) -> Storage:
+    match backend:
+        case "yaml":
+            return YamlStorage(
+                characters_directory=saved_chars_directory,
+                images_directory=Path(saved_chars_directory, "character_images"),
+                states_directory=Path(saved_chars_directory, "states"),
+                thumbnail_widths=thumbnail_widths,
+                save_format=save_format,
+            )
+        case "sqlite":
+            return SqliteStorage(Path(saved_chars_directory, "characters.sqlite3"), thumbnail_widths=thumbnail_widths)
+        case _:
+            raise ValueError(f"Unknown storage backend '{backend}'. Expected 'yaml' or 'sqlite'.")
+
+
+def init(
+        saved_chars_directory: Path,
+        backend: str = "yaml",
+        thumbnail_widths: tuple[int, ...] = (),
+        save_format: str = "json",
+):
+    global STORAGE
+    if STORAGE is not None:
+        return
+    STORAGE = create_storage(backend, saved_chars_directory, thumbnail_widths, save_format)
@@ -0,0 +1,62 @@
+"""
+Every YAML read and write goes through this module.
+
+It uses the libyaml-backed `CSafeLoader`/`CSafeDumper` when PyYAML was built with libyaml and
+the pure-Python safe classes otherwise. Loading is always safe. The only python tags accepted are
+the enum and UUID tags found in character saves written before the JSON format, and they are read
+back as plain values that pydantic validates. The dumper writes enums and UUIDs as plain values too.
+"""
+import enum
+import uuid
+
+import yaml
+from yaml.constructor import ConstructorError
+
+try:
+    from yaml import CSafeDumper as _SafeDumper, CSafeLoader as _SafeLoader
+    LIBYAML = True
+except ImportError:
+    from yaml import SafeDumper as _SafeDumper, SafeLoader as _SafeLoader
+    LIBYAML = False
+
+YAMLError = yaml.YAMLError
+
+
+class Loader(_SafeLoader):
+    pass
+
+
+class Dumper(_SafeDumper):
+    pass
+
+
+def _construct_legacy_enum(loader: Loader, suffix: str, node: yaml.Node):
+    # `!!python/object/apply:data.models.<module>.<Enum> [value]`
+    if not suffix.startswith("data.models.") or not isinstance(node, yaml.SequenceNode) or len(node.value) != 1:
+        raise ConstructorError(None, None, f"unsupported python tag {node.tag}", node.start_mark)
+    return loader.construct_object(node.value[0])
+
+
+def _construct_legacy_uuid(loader: Loader, node: yaml.Node) -> uuid.UUID:
+    # `!!python/object:uuid.UUID {int: ...}`
+    return uuid.UUID(int=loader.construct_mapping(node)["int"])
+
+
+Loader.add_multi_constructor("tag:yaml.org,2002:python/object/apply:", _construct_legacy_enum)
+Loader.add_constructor("tag:yaml.org,2002:python/object:uuid.UUID", _construct_legacy_uuid)
+
+Dumper.add_multi_representer(enum.Enum, lambda dumper, value: dumper.represent_data(value.value))
+Dumper.add_representer(uuid.UUID, lambda dumper, value: dumper.represent_str(str(value)))
+
+
+def load(stream):
+    """Parse one YAML document from a string, bytes or file."""
+    return yaml.load(stream, Loader=Loader)
+
+
+def dump(data, stream=None, **kwargs):
+    """Write `data` as block-style YAML in key order; returns the text when no stream is given."""
+    kwargs.setdefault("sort_keys", False)
+    kwargs.setdefault("allow_unicode", True)
+    kwargs.setdefault("default_flow_style", False)
+    return yaml.dump(data, stream, Dumper=Dumper, **kwargs)
@@ -0,0 +1,176 @@
+"""
+Opt-in timing of app reruns.
+
+While `ENABLED`, `span()` blocks and `timed`/`timed_method` functions add their wall time to the
+rerun that is running in the current thread (Streamlit runs each session's script in its own
+thread). Finished reruns are kept in a small ring buffer, `RERUNS`, which the debug sidebar panel
+reads. One rerun can also be captured with cProfile and written to `PROFILE_DIRECTORY`.
+
+When disabled, every entry point is a single flag check.
+"""
+from __future__ import annotations
+
+import cProfile
+import functools
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ENABLED = False
+RERUNS: deque[RerunTiming] = deque(maxlen=50)
+PROFILE_DIRECTORY: Path | None = None
+
+_lock = threading.Lock()
+_local = threading.local()
+_profile_requested = threading.Event()
+
+
+@dataclass
+class SpanTiming:
+    calls: int = 0
+    total_ms: float = 0.0
+
+
+@dataclass
+class RerunTiming:
+    label: str
+    started: float
+    total_ms: float = 0.0
+    spans: dict[str, SpanTiming] = field(default_factory=dict)
+    profile_path: Path | None = None
+
+    def slowest(self, count: int = 10) -> list[tuple[str, SpanTiming]]:
+        return sorted(self.spans.items(), key=lambda item: item[1].total_ms, reverse=True)[:count]
+
+
+def init(enabled: bool, history_size: int = 50, profile_directory: Path | None = None):
+    global ENABLED, RERUNS, PROFILE_DIRECTORY
+    ENABLED = enabled
+    PROFILE_DIRECTORY = profile_directory
+    if RERUNS.maxlen != history_size:
+        with _lock:
+            RERUNS = deque(RERUNS, maxlen=history_size)
+
+
+def recent_reruns() -> list[RerunTiming]:
+    with _lock:
+        return list(RERUNS)
+
+
+def request_profile():
+    """Capture the next rerun, in any session, with cProfile."""
+    _profile_requested.set()
+
+
+def profile_pending() -> bool:
+    return _profile_requested.is_set()
+
+
+@contextmanager
+def rerun(label: str) -> Iterator[RerunTiming | None]:
+    """Collect the spans of one rerun and store its timing when it ends, even if it raised."""
+    if not ENABLED or getattr(_local, "current", None) is not None:
+        yield getattr(_local, "current", None)
+        return
+
+    timing = RerunTiming(label=label, started=time.time())
+    profiler = _start_profiler() if _profile_requested.is_set() else None
+    _local.current = timing
+    _local.active = set()
+    start = time.perf_counter()
+    try:
+        yield timing
+    finally:
+        timing.total_ms = (time.perf_counter() - start) * 1000
+        _local.current = None
+        if profiler is not None:
+            timing.profile_path = _dump_profile(profiler, timing)
+        with _lock:
+            RERUNS.append(timing)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Add the time spent in the block to `name` in the current rerun.
+
+    Outside of a rerun (e.g. a fragment rerunning on its own) the span opens one named after itself.
+    A span nested in another span of the same name is not counted twice.
+    """
+    if not ENABLED:
+        yield
+        return
+    if getattr(_local, "current", None) is None:
+        with rerun(name):
+            with span(name):
+                yield
+        return
+    if name in _local.active:
+        yield
+        return
+
+    _local.active.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        _local.active.discard(name)
+        timing = _local.current.spans.setdefault(name, SpanTiming())
+        timing.calls += 1
+        timing.total_ms += elapsed
+
+
+def timed(name: str | None = None) -> Callable[[Callable], Callable]:
+    """Decorator timing every call as a span, named after the function's qualified name by default."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def timed_method(func: Callable) -> Callable:
+    """Like `timed`, but the span is named after the instance's class, so subclasses are told apart."""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not ENABLED:
+            return func(self, *args, **kwargs)
+        with span(f"{type(self).__name__}.{func.__name__}"):
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _start_profiler() -> cProfile.Profile | None:
+    _profile_requested.clear()
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler is already running in this process
+        return None
+    return profiler
+
+
+def _dump_profile(profiler: cProfile.Profile, timing: RerunTiming) -> Path | None:
+    profiler.disable()
+    if PROFILE_DIRECTORY is None:
+        return None
+    PROFILE_DIRECTORY.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(timing.started))
+    path = Path(PROFILE_DIRECTORY, f"rerun-{stamp}-{threading.get_ident()}.prof")
+    profiler.dump_stats(path)
+    return path
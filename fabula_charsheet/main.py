@@ -1,27 +1,70 @@
 import streamlit as st
 
-from data.localizator import init_localizator, select_local
+import instrumentation
+from data.localizator import init_localizator, pin as pin_localizator, select_local
 
-from data.compendium import init as init_compendium
+from data.compendium import init as init_compendium, pin as pin_compendium
+from data import autosave, hot_reload, storage
 from data.saved_characters import init as init_saved_characters
-from config import ASSETS_DIRECTORY, SAVED_CHARS_DIRECTORY, LOCALS_DIRECTORY
+from config import (
+    ASSETS_DIRECTORY,
+    SAVED_CHARS_DIRECTORY,
+    LOCALS_DIRECTORY,
+    COMPENDIUM_SNAPSHOT_PATH,
+    COMPENDIUM_LOADER,
+    COMPENDIUM_LOADER_WORKERS,
+    HOT_RELOAD,
+    HOT_RELOAD_DEBOUNCE_SECONDS,
+    STORAGE_BACKEND,
+    SAVE_FORMAT,
+    STATE_JOURNAL_DIRECTORY,
+    AUTOSAVE_DEBOUNCE_SECONDS,
+    AUTOSAVE_MAX_JOURNAL_ENTRIES,
+    AVATAR_LIST_WIDTH,
+    AVATAR_OVERVIEW_WIDTH,
+    INSTRUMENTATION,
+    RERUN_HISTORY_SIZE,
+    PROFILE_DIRECTORY,
+)
 from pages import build_pages
+from pages.utils.debug_panel import show_debug_panel
 
 
 def main():
-    init_compendium(ASSETS_DIRECTORY)
-    init_saved_characters(SAVED_CHARS_DIRECTORY)
-    init_localizator(LOCALS_DIRECTORY)
+    instrumentation.init(INSTRUMENTATION, RERUN_HISTORY_SIZE, PROFILE_DIRECTORY)
 
-    st.set_page_config(page_title="Fabula Ultima", page_icon=":material/person_play:")
+    with instrumentation.rerun("main"):
+        with instrumentation.span("init.compendium"):
+            init_compendium(ASSETS_DIRECTORY, COMPENDIUM_SNAPSHOT_PATH, COMPENDIUM_LOADER, COMPENDIUM_LOADER_WORKERS)
+        with instrumentation.span("init.storage"):
+            storage.init(
+                SAVED_CHARS_DIRECTORY, STORAGE_BACKEND, (AVATAR_LIST_WIDTH, AVATAR_OVERVIEW_WIDTH), SAVE_FORMAT
+            )
+            autosave.init(
+                storage.STORAGE, STATE_JOURNAL_DIRECTORY, AUTOSAVE_DEBOUNCE_SECONDS, AUTOSAVE_MAX_JOURNAL_ENTRIES
+            )
+        with instrumentation.span("init.saved_characters"):
+            init_saved_characters(storage.STORAGE)
+        with instrumentation.span("init.localizator"):
+            init_localizator(LOCALS_DIRECTORY)
+        if HOT_RELOAD:
+            hot_reload.start(ASSETS_DIRECTORY, LOCALS_DIRECTORY, HOT_RELOAD_DEBOUNCE_SECONDS)
+        # A reload during this rerun must not change the compendium or translations halfway through it
+        pin_compendium()
+        pin_localizator()
 
-    select_local()
+        st.set_page_config(page_title="Fabula Ultima", page_icon=":material/person_play:")
 
-    pages = build_pages()
+        select_local()
 
-    pg = st.navigation([st.Page(**p) for p in pages], position="top")
+        pages = build_pages()
 
-    pg.run()
+        pg = st.navigation([st.Page(**p) for p in pages], position="top")
+
+        pg.run()
+
+    if instrumentation.ENABLED:
+        show_debug_panel()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,19 @@
+import argparse
+
+from data import storage
+from data.serialization import SAVE_FORMATS
+from config import SAVED_CHARS_DIRECTORY, SAVE_FORMAT
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert saved characters and states to one save format.")
+    parser.add_argument("--format", choices=SAVE_FORMATS, default=SAVE_FORMAT, help=f"target format (default: {SAVE_FORMAT})")
+    args = parser.parse_args()
+
+    file_storage = storage.create_storage("yaml", SAVED_CHARS_DIRECTORY, save_format=args.format)
+    converted = file_storage.convert_saves()
+    print(f"Converted {converted} saved files in {SAVED_CHARS_DIRECTORY} to {args.format}")
+
+
+if __name__ == "__main__":
+    main()
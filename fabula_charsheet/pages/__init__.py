@@ -3,18 +3,22 @@ from functools import partial
 from typing import Callable
 
 import streamlit as st
+import instrumentation
+from data.localizator import get_loc
 from . import error
 from .character_creation import character_creation
 from .character_view import character_view
+from .party import party
 
 
 PAGE_MODULES = (
     character_view,
     character_creation,
+    party,
 )
 
 def build_pages():
-    loc = st.session_state.localizator.get(st.session_state.language)
+    loc = get_loc()
     pages = []
 
     for page in PAGE_MODULES:
@@ -28,7 +32,7 @@ def build_pages():
 
         # Determine title
         if hasattr(page, "title_key"):
-            title = getattr(loc, page.title_key, page.__name__)
+            title = loc.get(page.title_key, page.__name__)
         elif hasattr(page, "title"):
             title = page.title
         else:
@@ -42,7 +46,7 @@ def build_pages():
 
         # Build config
         page_config = {
-            "page": getattr(page, "build", build_error),
+            "page": instrumentation.timed(f"{page.__name__}.build")(getattr(page, "build", build_error)),
             "title": title,
             "icon": getattr(page, "icon", None),
             "url_path": getattr(page, "url_path", page.__name__),
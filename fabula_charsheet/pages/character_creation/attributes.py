@@ -1,5 +1,6 @@
 import streamlit as st
 
+from data.localizator import get_loc
 from data.models import Dexterity, Might, Insight, Willpower, LocNamespace
 from .creation_state import CreationState
 from pages.utils import set_creation_state
@@ -8,7 +9,7 @@ from pages.controller import CharacterController
 
 
 def build(controller: CharacterController):
-    loc: LocNamespace = st.session_state.localizator.get(st.session_state.language)
+    loc: LocNamespace = get_loc()
     st.title(loc.page_attributes_title)
     st.markdown(loc.page_attributes_title)
     dexterity = st.select_slider(
@@ -7,10 +7,11 @@ from pages.utils import set_creation_state, WeaponTableWriter, ArmorTableWriter,
 from pages.controller import CharacterController
 from data.models import Inventory, LocNamespace
 from data import compendium as c
+from data.localizator import get_loc
 
 
 def build(controller: CharacterController):
-    loc: LocNamespace = st.session_state.localizator.get(st.session_state.language)
+    loc: LocNamespace = get_loc()
     st.session_state.start_equipment = st.session_state.get("start_equipment", Inventory(zenit=500))
     st.session_state.additional_zenit = st.session_state.get(
         "additional_zenit",
@@ -21,7 +22,7 @@ def build(controller: CharacterController):
 
     show_martial(controller.character, loc)
 
-    base_equipment = c.COMPENDIUM.equipment
+    base_equipment = c.get_compendium().equipment
     weapons = base_equipment.weapons_by_categories()
     with st.expander(loc.page_equipment_weapons):
         sorted_categories = sorted(weapons.keys(), key=lambda cat: cat.localized_name(loc))
@@ -3,11 +3,12 @@ import streamlit as st
 from .creation_state import CreationState
 from pages.utils import set_creation_state
 from pages.controller import CharacterController
+from data.localizator import get_loc
 from data.models import CharacterTheme, LocNamespace
 
 
 def build(controller: CharacterController):
-    loc: LocNamespace = st.session_state.localizator.get(st.session_state.language)
+    loc: LocNamespace = get_loc()
     not_ready_for_the_next_step = True
 
     st.title(loc.page_identity_character_info_title)
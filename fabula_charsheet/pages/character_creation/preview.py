@@ -5,11 +5,11 @@ from pages.utils import show_martial, add_new_class, avatar_uploader, edit_ident
     unequip_item, equip_item, add_bond, remove_bond, BondTableWriter
 from pages.controller import CharacterController, ClassController
 from data.models import CharClass, LocNamespace
-from data import saved_characters as s
+from data.localizator import get_loc
 
 
 def build(controller: CharacterController):
-    loc: LocNamespace = st.session_state.localizator.get(st.session_state.language)
+    loc: LocNamespace = get_loc()
 
     @st.dialog(loc.page_class_add_dialog_title, width="large")
     @st.fragment
@@ -66,7 +66,6 @@ def build(controller: CharacterController):
         if st.button(loc.save_character_button, disabled= not controller.has_enough_skills()):
             controller.dump_character()
             controller.dump_avatar(st.session_state.avatar)
-            s.SAVED_CHARS.char_list.append(controller.character)
             st.toast(loc.page_save_character_toast, icon="🧙")
         if not controller.has_enough_skills():
             st.warning(
@@ -107,11 +106,12 @@ def build(controller: CharacterController):
         st.write(f"{loc.attr_insight}: {loc.dice_prefix}{controller.character.insight.base}")
         st.write(f"{loc.attr_willpower}: {loc.dice_prefix}{controller.character.willpower.base}")
         st.write("")
+        stats = controller.derived_stats()
         st.markdown(
-            f"**{loc.hp}**: {controller.max_hp()} | **{loc.mp}**: {controller.max_mp()} | **{loc.ip}**: {controller.max_ip()}"
+            f"**{loc.hp}**: {stats.max_hp} | **{loc.mp}**: {stats.max_mp} | **{loc.ip}**: {stats.max_ip}"
         )
         st.markdown(
-            f"**{loc.column_defense}**: {controller.defense()} | **{loc.column_magic_defense}**: {controller.magic_defense()}"
+            f"**{loc.column_defense}**: {stats.defense} | **{loc.column_magic_defense}**: {stats.magic_defense}"
         )
 
         c1, c2, c3 = st.columns(3)
@@ -162,7 +162,7 @@ def build(controller: CharacterController):
         equipped_categories = ["main_hand", "off_hand", "armor"]
         for category in equipped_categories:
             key = f"item_{category}"
-            localized_category = getattr(loc, key, category.title())
+            localized_category = loc.get(key, category.title())
             eq_col1, eq_col_2 = st.columns([0.7, 0.3])
             with eq_col1:
                 equipped_item = getattr(controller.character.inventory.equipped, category)
@@ -1,48 +1,91 @@
+import math
+
 import streamlit as st
 
 import config
 from data import saved_characters as s
-from data.models import Character, LocNamespace
+from data.localizator import get_loc
+from data.models import LocNamespace
+from data.saved_characters import CharacterEntry
 from pages.controller import CharacterController
-from pages.utils import set_view_state, get_avatar_path, delete_character
+from pages.utils import set_view_state, get_avatar, delete_character
 from pages.character_view.view_state import ViewState
 
 
 def build(controller: CharacterController):
-    loc: LocNamespace = st.session_state.localizator.get(st.session_state.language)
+    loc: LocNamespace = get_loc()
 
     @st.dialog(title=loc.page_delete_character_title)
-    def delete_character_dialog(character: Character, loc: LocNamespace):
+    def delete_character_dialog(character: CharacterEntry, loc: LocNamespace):
         delete_character(character, loc)
 
     st.set_page_config(layout="centered")
     st.title(loc.page_load_character_title)
 
-    if s.SAVED_CHARS.char_list:
-        for char in s.SAVED_CHARS.char_list:
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                avatar_path = get_avatar_path(char.id)
-                if avatar_path:
-                    st.image(avatar_path, width=150)
-                else:
-                    st.image(config.default_avatar_path, width=150)
-            with col2:
-                st.write(loc.page_load_character_info.format(name=char.name, level=char.level))
-            with col3:
-                load_col, delete_col = st.columns(2)
-                with load_col:
-                    if st.button(loc.page_load_character_load_button, key=f"{char.id}-loader"):
-                        controller.character = char
-                        try:
-                            controller.load_state()
-                        except Exception as e:
-                            st.toast(e)
-                        set_view_state(ViewState.view)
-                with delete_col:
-                    if st.button(loc.page_load_character_delete_button, key=f"{char.id}-delete"):
-                        delete_character_dialog(char, loc)
-
-            st.divider()
-    else:
+    if not s.SAVED_CHARS.char_list:
         st.info(loc.page_load_character_no_saved, icon="👻")
+        return
+
+    name_col, level_col = st.columns(2)
+    with name_col:
+        name_filter = st.text_input(loc.page_load_character_filter_name)
+    with level_col:
+        min_level, max_level = st.slider(
+            loc.page_load_character_filter_level,
+            min_value=config.MIN_LEVEL,
+            max_value=config.MAX_LEVEL,
+            value=(config.MIN_LEVEL, config.MAX_LEVEL),
+        )
+
+    matches = s.SAVED_CHARS.search(name_filter, min_level, max_level)
+    if not matches:
+        st.info(loc.page_load_character_no_matches, icon="🔎")
+        return
+
+    page_count = math.ceil(len(matches) / config.LOADER_PAGE_SIZE)
+    page = 1
+    if page_count > 1:
+        page = st.number_input(
+            loc.page_load_character_page.format(count=page_count),
+            min_value=1,
+            max_value=page_count,
+            value=1,
+        )
+    st.caption(loc.page_load_character_found.format(count=len(matches)))
+    st.divider()
+
+    first = (page - 1) * config.LOADER_PAGE_SIZE
+    # Only the visible rows build widgets or touch avatar files
+    for char in matches[first:first + config.LOADER_PAGE_SIZE]:
+        show_character_row(char, controller, delete_character_dialog, loc)
+
+
+def show_character_row(char: CharacterEntry, controller: CharacterController, delete_dialog, loc: LocNamespace):
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        avatar = get_avatar(char.id, width=config.AVATAR_LIST_WIDTH)
+        if avatar:
+            st.image(avatar, width=config.AVATAR_LIST_WIDTH)
+        else:
+            st.image(config.default_avatar_path, width=config.AVATAR_LIST_WIDTH)
+    with col2:
+        st.write(loc.page_load_character_info.format(name=char.name, level=char.level))
+    with col3:
+        load_col, delete_col = st.columns(2)
+        with load_col:
+            if st.button(loc.page_load_character_load_button, key=f"{char.id}-loader"):
+                try:
+                    controller.character = s.SAVED_CHARS.load(char.id)
+                except Exception as e:
+                    st.error(e, icon="📜")
+                else:
+                    try:
+                        controller.load_state()
+                    except Exception as e:
+                        st.toast(e)
+                    set_view_state(ViewState.view)
+        with delete_col:
+            if st.button(loc.page_load_character_delete_button, key=f"{char.id}-delete"):
+                delete_dialog(char, loc)
+
+    st.divider()
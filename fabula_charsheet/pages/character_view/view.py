@@ -1,12 +1,15 @@
 import streamlit as st
 
 import config
+import instrumentation
+from data.localizator import get_loc
+from data.serialization import dump_model
 from data.models import Status, AttributeName, Weapon, GripType, WeaponCategory, \
     WeaponRange, ClassName, LocNamespace
 from pages.controller import CharacterController
 from pages.utils import WeaponTableWriter, ArmorTableWriter, SkillTableWriter, SpellTableWriter, DanceTableWriter, InventionTableWriter, \
     AccessoryTableWriter, ItemTableWriter, TherioformTableWriter, ShieldTableWriter, BondTableWriter, ArcanumTableWriter, \
-    show_martial, set_view_state, get_avatar_path, avatar_update, level_up, add_chimerist_spell, \
+    show_martial, set_view_state, rerun_fragment, get_avatar, avatar_update, level_up, add_chimerist_spell, \
     remove_chimerist_spell, add_item, remove_item, unequip_item, add_heroic_skill, add_spell, add_bond, remove_bond, \
     increase_attribute, add_therioform, add_dance, add_arcanum, manifest_therioform, display_equipped_item, add_invention, \
     colored_attr, add_companion, display_companion
@@ -15,7 +18,9 @@ from pages.character_view.view_state import ViewState
 
 def build(controller: CharacterController):
     st.set_page_config(layout="wide")
-    loc: LocNamespace = st.session_state.localizator.get(st.session_state.language)
+    loc: LocNamespace = get_loc()
+    # Journal what the last rerun changed; fragments do the same for their own reruns
+    controller.autosave_state()
 
     @st.dialog(loc.page_view_avatar_update_dialog_title)
     def avatar_update_dialog(controller: CharacterController, loc: LocNamespace):
@@ -89,25 +94,214 @@ def build(controller: CharacterController):
     def add_companion_dialog(controller: CharacterController, loc: LocNamespace):
         add_companion(controller, loc)
 
-    st.title(f"{controller.character.name}")
+    def accuracy_dice() -> tuple[int, ...]:
+        equipped = controller.character.inventory.equipped
+        # Mirrors the equipped section: unarmed strikes roll DEX + MIG
+        attributes = list(equipped.main_hand.accuracy if equipped.main_hand else (AttributeName.dexterity, AttributeName.might))
+        if isinstance(equipped.off_hand, Weapon):
+            attributes.extend(equipped.off_hand.accuracy)
+        return tuple(getattr(controller.character, attribute).current for attribute in attributes)
+
+    @st.fragment
+    @instrumentation.timed("view.resource_panel")
+    def resource_panel():
+        controller.autosave_state()
+        stats = controller.derived_stats()
+
+        def rerun():
+            # The crisis note is rendered by the overview, outside this fragment
+            rerun_fragment(invalidate_view=controller.derived_stats().in_crisis != stats.in_crisis)
+
+        col1, col2, col3, col4, col5 = st.columns([0.5, 0.2, 0.1, 0.1, 0.1])
+        with col1:
+            st.markdown(
+                """
+                <style>
+                    .stProgress > div > div > div > div {
+                        background-color: green;
+                    }
+                </style>""",
+                unsafe_allow_html=True,
+            )
+            st.progress(
+                max((stats.current_hp / stats.max_hp), 0),
+                text=f"{loc.hp} {stats.current_hp} / {stats.max_hp}"
+            )
+            st.write("")
+            st.write("")
 
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        loc.page_view_tab_overview,
-        loc.page_view_tab_skills,
-        loc.page_view_tab_spells,
-        loc.page_view_tab_equipment,
-        loc.page_view_tab_special,
-    ])
+            st.progress(
+                max((stats.current_mp / stats.max_mp), 0),
+                text=f"{loc.mp} {stats.current_mp} / {stats.max_mp}"
+            )
+            st.write("")
+            st.write("")
 
-    # Overview
-    with tab1:
+            st.progress(
+                max((stats.current_ip / stats.max_ip), 0),
+                text=f"{loc.ip} {stats.current_ip} / {stats.max_ip}"
+            )
+        with col2:
+            hp_input = st.number_input("hp_input", min_value=0, label_visibility="hidden", value=10)
+            mp_input = st.number_input("mp_input", min_value=0, label_visibility="hidden", value=10)
+            ip_input = st.number_input("ip_input", min_value=0, label_visibility="hidden", value=3)
+        with col3:
+            st.write("")
+            if st.button("", icon=":material/add:", key="add_hp"):
+                controller.state.minus_hp = max(0, controller.state.minus_hp - hp_input)
+                rerun()
+            st.write("")
+            st.write("")
+            if st.button("", icon=":material/add:", key="add_mp"):
+                controller.state.minus_mp = max(0, controller.state.minus_mp - mp_input)
+                rerun()
+            st.write("")
+            st.write("")
+            if st.button("", icon=":material/add:", key="add_ip"):
+                controller.state.minus_ip = max(0, controller.state.minus_ip - ip_input)
+                rerun()
+            st.write("")
+            st.write("")
+        with col4:
+            st.write("")
+            if st.button("", icon=":material/remove:", key="subtract_hp"):
+                controller.state.minus_hp = min(stats.max_hp, controller.state.minus_hp + hp_input)
+                rerun()
+            st.write("")
+            st.write("")
+            if st.button("", icon=":material/remove:", key="subtract_mp"):
+                controller.state.minus_mp = min(stats.max_mp, controller.state.minus_mp + mp_input)
+                rerun()
+            st.write("")
+            st.write("")
+            if st.button("", icon=":material/remove:", key="subtract_ip"):
+                controller.state.minus_ip = min(stats.max_ip, controller.state.minus_ip + ip_input)
+                rerun()
+            st.write("")
+            st.write("")
+        with col5:
+            st.write("")
+            if st.button("", icon=":material/laps:", key="reset_hp", help="Reset HP"):
+                controller.state.minus_hp = 0
+                rerun()
+            st.write("")
+            st.write("")
+            if st.button("", icon=":material/laps:", key="reset_mp", help="Reset MP"):
+                controller.state.minus_mp = 0
+                rerun()
+            st.write("")
+            st.write("")
+            if st.button("", icon=":material/laps:", key="reset_ip", help="Reset IP"):
+                controller.state.minus_ip = 0
+                rerun()
+            st.write("")
+            st.write("")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if st.button(loc.page_view_health_potion,
+                disabled=not controller.can_use_potion(),
+                use_container_width=True,
+            ):
+                controller.use_health_potion()
+                rerun()
+        with col2:
+            if st.button(loc.page_view_mana_potion,
+                disabled=not controller.can_use_potion(),
+                use_container_width=True
+            ):
+                controller.use_mana_potion()
+                rerun()
+        with col3:
+            if st.button(loc.page_view_magic_tent,
+                disabled=not controller.can_use_magic_tent(),
+                use_container_width=True
+            ):
+                controller.use_magic_tent()
+                rerun()
+
+    @st.fragment
+    @instrumentation.timed("view.status_panel")
+    def status_panel():
+        # Weapon accuracy in the overview is rolled with the current attributes that statuses change
+        shown_accuracy = accuracy_dice()
+        st.markdown(f"##### {loc.page_view_current_attributes}")
+        att_col1, att_col2 = st.columns(2)
+        initiative_column, _ = st.columns([0.9, 0.1])
+
+        st.markdown(f"##### {loc.page_view_statuses}")
+        col1, col2 = st.columns(2)
+        for idx, stat in enumerate(Status):
+            col = col1 if idx < 3 else col2
+            with col:
+                checked = st.checkbox(stat.localized_name(loc),
+                                      value=(stat in controller.state.statuses))
+                if checked:
+                    controller.add_status(stat)
+                else:
+                    controller.remove_status(stat)
+
+        st.markdown(f"##### {loc.page_view_bonus_to_attributes}")
+        col1, col2 = st.columns(2)
+        for idx, attribute in enumerate(AttributeName):
+            col = col1 if idx < 2 else col2
+            with col:
+                checked = st.checkbox(attribute.localized_name(loc),
+                                      value=(attribute in controller.state.improved_attributes))
+                if checked and attribute not in controller.state.improved_attributes:
+                    controller.state.improved_attributes.append(attribute)
+                if not checked and attribute in controller.state.improved_attributes:
+                    controller.state.improved_attributes.remove(attribute)
+
+        controller.autosave_state()
+        controller.apply_status()
+        stats = controller.derived_stats()
+        if accuracy_dice() != shown_accuracy:
+            rerun_fragment(invalidate_view=True)
+
+        if st.button(loc.page_view_refresh_attributes):
+            rerun_fragment()
+
+        with att_col1:
+            st.markdown(colored_attr(loc.attr_dexterity, loc.dice_prefix, controller.character.dexterity.current,
+                                     controller.character.dexterity.base), unsafe_allow_html=True)
+            st.markdown(colored_attr(loc.attr_might, loc.dice_prefix, controller.character.might.current,
+                                     controller.character.might.base), unsafe_allow_html=True)
+            st.markdown(f"**{loc.column_defense}**: {stats.defense}")
+
+        with att_col2:
+            st.markdown(colored_attr(loc.attr_insight, loc.dice_prefix, controller.character.insight.current,
+                                     controller.character.insight.base), unsafe_allow_html=True)
+            st.markdown(colored_attr(loc.attr_willpower, loc.dice_prefix, controller.character.willpower.current,
+                                     controller.character.willpower.base), unsafe_allow_html=True)
+            st.markdown(f"**{loc.column_magic_defense}**: {stats.magic_defense}")
+
+        with initiative_column:
+            st.markdown(f"**{loc.column_initiative}**: {stats.initiative}")
+
+        if ClassName.mutant in [char_class.name for char_class in controller.character.classes]:
+            st.markdown(f"##### {loc.page_view_manifested_terioforms}")
+            st.markdown(" • ".join(t.localized_name(loc) for t in controller.state.active_therioforms))
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button(loc.manifest_therioform_button):
+                    manifest_therioform_dialog(controller, loc)
+            with col2:
+                if st.button(loc.page_view_end_therioform_effect):
+                    controller.state.active_therioforms = list()
+                    rerun_fragment()
+
+    @st.fragment
+    @instrumentation.timed("view.overview_tab")
+    def overview_tab():
+        stats = controller.derived_stats()
         base_col, points_col, attributes_col = st.columns([0.35, 0.4, 0.25], gap="medium")
         with base_col:
             col1, col2 = st.columns(2)
             with col1:
-                avatar_path = get_avatar_path(controller.character.id)
-                if avatar_path:
-                    st.image(avatar_path, use_container_width=True)
+                avatar = get_avatar(controller.character.id, width=config.AVATAR_OVERVIEW_WIDTH)
+                if avatar:
+                    st.image(avatar, use_container_width=True)
                 else:
                     st.image(config.default_avatar_path, width=150)
                 if st.button(loc.update_avatar_button):
@@ -120,7 +314,7 @@ def build(controller: CharacterController):
                 st.markdown(f"**{loc.page_view_level}:** {controller.character.level}")
                 st.markdown(f"**{loc.page_view_theme}:** {controller.character.theme}")
                 st.number_input(loc.page_view_fabula_points, min_value=0)
-                if controller.current_hp() <= controller.crisis_value():
+                if stats.in_crisis:
                     st.write(f":red[{loc.page_view_crisis_text}]")
                 else:
                     st.write("")
@@ -140,7 +334,7 @@ def build(controller: CharacterController):
             st.write(f"{loc.attr_willpower}: {loc.dice_prefix}{controller.character.willpower.base}")
             st.write("")
             st.markdown(
-                f"**{loc.hp}**: {controller.max_hp()} | **{loc.mp}**: {controller.max_mp()} | **{loc.ip}**: {controller.max_ip()}")
+                f"**{loc.hp}**: {stats.max_hp} | **{loc.mp}**: {stats.max_mp} | **{loc.ip}**: {stats.max_ip}")
 
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -156,114 +350,9 @@ def build(controller: CharacterController):
             writer.write_in_columns(controller.character.bonds, header=False)
 
 
-        with points_col:
-            col1, col2, col3, col4, col5 = st.columns([0.5, 0.2, 0.1, 0.1, 0.1])
-            with col1:
-                st.markdown(
-                    """
-                    <style>
-                        .stProgress > div > div > div > div {
-                            background-color: green;
-                        }
-                    </style>""",
-                    unsafe_allow_html=True,
-                )
-                st.progress(
-                    max((controller.current_hp() / controller.max_hp()), 0),
-                    text=f"{loc.hp} {controller.current_hp()} / {controller.max_hp()}"
-                )
-                st.write("")
-                st.write("")
-
-                st.progress(
-                    max((controller.current_mp() / controller.max_mp()), 0),
-                    text=f"{loc.mp} {controller.current_mp()} / {controller.max_mp()}"
-                )
-                st.write("")
-                st.write("")
-
-                st.progress(
-                    max((controller.current_ip() / controller.max_ip()), 0),
-                    text=f"{loc.ip} {controller.current_ip()} / {controller.max_ip()}"
-                )
-            with col2:
-                hp_input = st.number_input("hp_input", min_value=0, label_visibility="hidden", value=10)
-                mp_input = st.number_input("mp_input", min_value=0, label_visibility="hidden", value=10)
-                ip_input = st.number_input("ip_input", min_value=0, label_visibility="hidden", value=3)
-            with col3:
-                st.write("")
-                if st.button("", icon=":material/add:", key="add_hp"):
-                    controller.state.minus_hp = max(0, controller.state.minus_hp - hp_input)
-                    st.rerun()
-                st.write("")
-                st.write("")
-                if st.button("", icon=":material/add:", key="add_mp"):
-                    controller.state.minus_mp = max(0, controller.state.minus_mp - mp_input)
-                    st.rerun()
-                st.write("")
-                st.write("")
-                if st.button("", icon=":material/add:", key="add_ip"):
-                    controller.state.minus_ip = max(0, controller.state.minus_ip - ip_input)
-                    st.rerun()
-                st.write("")
-                st.write("")
-            with col4:
-                st.write("")
-                if st.button("", icon=":material/remove:", key="subtract_hp"):
-                    controller.state.minus_hp = min(controller.max_hp(), controller.state.minus_hp + hp_input)
-                    st.rerun()
-                st.write("")
-                st.write("")
-                if st.button("", icon=":material/remove:", key="subtract_mp"):
-                    controller.state.minus_mp = min(controller.max_mp(), controller.state.minus_mp + mp_input)
-                    st.rerun()
-                st.write("")
-                st.write("")
-                if st.button("", icon=":material/remove:", key="subtract_ip"):
-                    controller.state.minus_ip = min(controller.max_ip(), controller.state.minus_ip + ip_input)
-                    st.rerun()
-                st.write("")
-                st.write("")
-            with col5:
-                st.write("")
-                if st.button("", icon=":material/laps:", key="reset_hp", help="Reset HP"):
-                    controller.state.minus_hp = 0
-                    st.rerun()
-                st.write("")
-                st.write("")
-                if st.button("", icon=":material/laps:", key="reset_mp", help="Reset MP"):
-                    controller.state.minus_mp = 0
-                    st.rerun()
-                st.write("")
-                st.write("")
-                if st.button("", icon=":material/laps:", key="reset_ip", help="Reset IP"):
-                    controller.state.minus_ip = 0
-                    st.rerun()
-                st.write("")
-                st.write("")
 
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                if st.button(loc.page_view_health_potion,
-                    disabled=not controller.can_use_potion(),
-                    use_container_width=True,
-                ):
-                    controller.use_health_potion()
-                    st.rerun()
-            with col2:
-                if st.button(loc.page_view_mana_potion,
-                    disabled=not controller.can_use_potion(),
-                    use_container_width=True
-                ):
-                    controller.use_mana_potion()
-                    st.rerun()
-            with col3:
-                if st.button(loc.page_view_magic_tent,
-                    disabled=not controller.can_use_magic_tent(),
-                    use_container_width=True
-                ):
-                    controller.use_magic_tent()
-                    st.rerun()
+        with points_col:
+            resource_panel()
 
             st.write(f"##### {loc.page_view_equipped}")
             main_hand = controller.character.inventory.equipped.main_hand or Weapon(
@@ -297,72 +386,13 @@ def build(controller: CharacterController):
 
 
         with attributes_col:
-            st.markdown(f"##### {loc.page_view_current_attributes}")
-            att_col1, att_col2 = st.columns(2)
-            initiative_column, _ = st.columns([0.9, 0.1])
-
-            st.markdown(f"##### {loc.page_view_statuses}")
-            col1, col2 = st.columns(2)
-            for idx, stat in enumerate(Status):
-                col = col1 if idx < 3 else col2
-                with col:
-                    checked = st.checkbox(stat.localized_name(loc),
-                                          value=(stat in controller.state.statuses))
-                    if checked:
-                        controller.add_status(stat)
-                    else:
-                        controller.remove_status(stat)
-
-            st.markdown(f"##### {loc.page_view_bonus_to_attributes}")
-            col1, col2 = st.columns(2)
-            for idx, attribute in enumerate(AttributeName):
-                col = col1 if idx < 2 else col2
-                with col:
-                    checked = st.checkbox(attribute.localized_name(loc),
-                                          value=(attribute in controller.state.improved_attributes))
-                    if checked and attribute not in controller.state.improved_attributes:
-                        controller.state.improved_attributes.append(attribute)
-                    if not checked and attribute in controller.state.improved_attributes:
-                        controller.state.improved_attributes.remove(attribute)
-
-            controller.apply_status()
-
-            if st.button(loc.page_view_refresh_attributes):
-                st.rerun()
-
-            with att_col1:
-                st.markdown(colored_attr(loc.attr_dexterity, loc.dice_prefix, controller.character.dexterity.current,
-                                         controller.character.dexterity.base), unsafe_allow_html=True)
-                st.markdown(colored_attr(loc.attr_might, loc.dice_prefix, controller.character.might.current,
-                                         controller.character.might.base), unsafe_allow_html=True)
-                st.markdown(f"**{loc.column_defense}**: {controller.defense()}")
-
-            with att_col2:
-                st.markdown(colored_attr(loc.attr_insight, loc.dice_prefix, controller.character.insight.current,
-                                         controller.character.insight.base), unsafe_allow_html=True)
-                st.markdown(colored_attr(loc.attr_willpower, loc.dice_prefix, controller.character.willpower.current,
-                                         controller.character.willpower.base), unsafe_allow_html=True)
-                st.markdown(f"**{loc.column_magic_defense}**: {controller.magic_defense()}")
-
-            with initiative_column:
-                st.markdown(f"**{loc.column_initiative}**: {controller.initiative()}")
-
-            if ClassName.mutant in [char_class.name for char_class in controller.character.classes]:
-                st.markdown(f"##### {loc.page_view_manifested_terioforms}")
-                st.markdown(" • ".join(t.localized_name(loc) for t in controller.state.active_therioforms))
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button(loc.manifest_therioform_button):
-                        manifest_therioform_dialog(controller, loc)
-                with col2:
-                    if st.button(loc.page_view_end_therioform_effect):
-                        controller.state.active_therioforms = list()
-                        st.rerun()
+            status_panel()
 
         st.divider()
 
-    # Skills
-    with tab2:
+    @st.fragment
+    @instrumentation.timed("view.skills_tab")
+    def skills_tab():
         sorted_classes = sorted(controller.character.classes, key=lambda x: x.class_level(), reverse=True)
         writer = SkillTableWriter(loc)
         writer.columns = writer.level_readonly_columns
@@ -377,8 +407,9 @@ def build(controller: CharacterController):
 
         st.divider()
 
-    # Spells
-    with tab3:
+    @st.fragment
+    @instrumentation.timed("view.spells_tab")
+    def spells_tab():
         for class_name, spell_list in controller.character.spells.items():
             chimerist_skills = controller.get_skills(ClassName.chimerist)
             chimerist_condition = (class_name == ClassName.chimerist
@@ -419,8 +450,10 @@ def build(controller: CharacterController):
                     writer.columns = writer.chimerist_columns
                 writer.write_in_columns(spell_list)
 
-    #Equipment
-    with tab4:
+
+    @st.fragment
+    @instrumentation.timed("view.equipment_tab")
+    def equipment_tab():
         col1, col2, col3, col4 = st.columns([0.2, 0.2, 0.2, 0.4])
         with col1:
             if st.button(loc.add_item_button):
@@ -442,12 +475,12 @@ def build(controller: CharacterController):
                 st.write("")
                 if st.button("", icon=":material/add:", key="add_zenit"):
                     controller.character.inventory.zenit += zenit_input
-                    st.rerun()
+                    rerun_fragment()
             with c3:
                 st.write("")
                 if st.button("", icon=":material/remove:", key="subtract_zenit"):
                     controller.character.inventory.zenit -= zenit_input
-                    st.rerun()
+                    rerun_fragment()
 
         backpack = controller.character.inventory.backpack
         if backpack.weapons:
@@ -467,8 +500,10 @@ def build(controller: CharacterController):
         if backpack.other:
             ItemTableWriter(loc).write_in_columns(backpack.other)
 
-    # Special
-    with tab5:
+
+    @st.fragment
+    @instrumentation.timed("view.special_tab")
+    def special_tab():
         st.divider()
         if controller.is_class_added(ClassName.mutant) and controller.has_skill("theriomorphosis"):
             added_therioforms = [t for t in controller.character.special.therioforms]
@@ -530,11 +565,43 @@ def build(controller: CharacterController):
             display_companion(controller, loc)
             st.divider()
 
-    col1, col2 = st.columns([0.2, 0.8])
+    st.title(f"{controller.character.name}")
+
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        loc.page_view_tab_overview,
+        loc.page_view_tab_skills,
+        loc.page_view_tab_spells,
+        loc.page_view_tab_equipment,
+        loc.page_view_tab_special,
+    ])
+
+
+    with tab1:
+        overview_tab()
+    with tab2:
+        skills_tab()
+    with tab3:
+        spells_tab()
+    with tab4:
+        equipment_tab()
+    with tab5:
+        special_tab()
+
+    col1, col2, col3 = st.columns([0.2, 0.2, 0.6])
     with col1:
         if st.button(loc.save_current_character_button):
             controller.dump_character()
             controller.dump_state()
     with col2:
+        # Dumped only on request, not on every rerun
+        if st.button(loc.export_character_button):
+            st.download_button(
+                loc.download_export_button,
+                data=dump_model(controller.character, "yaml"),
+                file_name=f"{controller.character.name}.character.yaml",
+                mime="application/yaml",
+                on_click="ignore",
+            )
+    with col3:
         if st.button(loc.load_another_character_button):
             set_view_state(ViewState.load)
@@ -3,16 +3,16 @@ import math
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-import yaml
 
+import instrumentation
 from config import (
-    SAVED_CHARS_DIRECTORY,
-    SAVED_CHARS_IMG_DIRECTORY,
-    SAVED_STATES_DIRECTORY,
     MIN_ATTRIBUTE_VALUE,
     MAX_ATTRIBUTE_VALUE,
 )
 from data import compendium as c
+from data import saved_characters as s
+from data import autosave, storage
+from pages.derived_stats import DerivedStats, DerivedStatsEngine
 from data.models import (
     Character,
     CharClass,
@@ -38,6 +38,7 @@ from data.models import (
     Companion,
     CompanionSkillName,
     SPECIES_STARTING_SKILLS,
+    thaw,
 )
 
 if TYPE_CHECKING:
@@ -47,11 +48,29 @@ if TYPE_CHECKING:
 from config import ATTRIBUTE_SUM_AT_LEVEL_20, ATTRIBUTE_SUM_AT_LEVEL_40
 
 
+# Attribute modifiers applied by `apply_status`; the party page builds its formulas from these too
+STATUS_MODIFIERS: dict[Status, dict[AttributeName, int]] = {
+    Status.dazed: {AttributeName.insight: -2},
+    Status.enraged: {AttributeName.dexterity: -2, AttributeName.insight: -2},
+    Status.poisoned: {AttributeName.might: -2, AttributeName.willpower: -2},
+    Status.shaken: {AttributeName.willpower: -2},
+    Status.slow: {AttributeName.dexterity: -2},
+    Status.weak: {AttributeName.might: -2},
+}
+IMPROVED_ATTRIBUTE_MODIFIER = 2
+THERIOFORM_MODIFIERS: dict[str, dict[AttributeName, int]] = {
+    "arpaktida": {AttributeName.insight: 2},
+    "dynamotheria": {AttributeName.might: 2},
+    "tachytheria": {AttributeName.dexterity: 2},
+}
+
+
 class CharacterController:
     def __init__(self, loc: LocNamespace):
         self.character = Character()
         self.loc = loc
         self.state = CharState()
+        self.stats_engine = DerivedStatsEngine(self)
 
     def get_character(self):
         return self.character
@@ -88,34 +107,33 @@ class CharacterController:
             msg = self.loc.error_unexpected_class_type.format(class_type=type(new_class))
             raise ValueError(msg)
 
-        return any(c.name == class_name for c in self.character.classes)
+        return class_name is not None and self.character.get_class(class_name) is not None
 
     def has_skill(self, skill_name: str) -> bool:
-        for char_class in self.character.classes:
-            if char_class.get_skill(skill_name) and char_class.get_skill(skill_name).current_level > 0:
-                return True
-        return False
+        return self.character.has_skill(skill_name)
 
     def get_skills(self, class_name: ClassName) -> list[Skill]:
-        if class_name in [c.name for c in self.character.classes]:
-            idx = [c.name for c in self.character.classes].index(class_name)
-            return self.character.classes[idx].skills
+        char_class = self.character.get_class(class_name)
+        if char_class is not None:
+            return char_class.skills
         return []
 
     def get_skill_level(self, char_class_name: ClassName, skill_name: str) -> int | None:
-        for char_class in self.character.classes:
-            if char_class.name == char_class_name:
-                return char_class.get_skill_level(skill_name)
+        char_class = self.character.get_class(char_class_name)
+        if char_class is not None:
+            return char_class.get_skill_level(skill_name)
 
     def add_spell(self, spell: Spell, class_name: ClassName):
-        if spell not in self.character.spells.get(class_name, []):
-            self.character.spells[class_name] = self.character.spells.get(class_name, [])
-            self.character.spells[class_name].append(spell)
+        if not self.character.has_spell(class_name, spell):
+            if class_name not in self.character.spells:
+                self.character.set_spells(class_name, [])
+            self.character.spells[class_name].append(thaw(spell))
 
     def remove_spell(self, spell: Spell, class_name: ClassName):
         if spell in self.character.spells.get(class_name, []):
             self.character.spells[class_name].remove(spell)
 
+    @instrumentation.timed()
     def max_hp(self) -> int:
         base_hp = (
                 self.character.level
@@ -132,6 +150,7 @@ class CharacterController:
 
         return base_hp + bonus
 
+    @instrumentation.timed()
     def max_mp(self) -> int:
         base_mp = (
                 self.character.level
@@ -148,6 +167,7 @@ class CharacterController:
 
         return base_mp + bonus
 
+    @instrumentation.timed()
     def max_ip(self) -> int:
         base_ip =  (
                 6
@@ -159,15 +179,23 @@ class CharacterController:
 
         return base_ip + bonus
 
+    @instrumentation.timed()
+    def derived_stats(self) -> DerivedStats:
+        return self.stats_engine.snapshot()
+
+    @instrumentation.timed()
     def current_hp(self) -> int:
         return self.max_hp() - self.state.minus_hp
 
+    @instrumentation.timed()
     def current_mp(self) -> int:
         return self.max_mp() - self.state.minus_mp
 
+    @instrumentation.timed()
     def current_ip(self) -> int:
         return self.max_ip() - self.state.minus_ip
 
+    @instrumentation.timed()
     def defense(self):
         item_bonus = 0
         for item in self.equipped_items():
@@ -197,6 +225,7 @@ class CharacterController:
 
         return defense
 
+    @instrumentation.timed()
     def magic_defense(self):
         bonus = 0
         for item in self.equipped_items():
@@ -204,6 +233,7 @@ class CharacterController:
 
         return self.character.insight.current + bonus
 
+    @instrumentation.timed()
     def initiative(self) -> str:
         initiative = f"{self.loc.dice_prefix}{self.character.insight.current} + {self.loc.dice_prefix}{self.character.dexterity.current}"
         bonus = 0
@@ -313,76 +343,36 @@ class CharacterController:
         self.character.inventory.backpack.remove_item(item)
 
     def dump_character(self):
-        for old_file in SAVED_CHARS_DIRECTORY.glob(f"*.{self.character.id}.character.yaml"):
-            old_file.unlink()
-        with Path(
-                SAVED_CHARS_DIRECTORY,
-                f"{self.character.name}.{self.character.id}.character.yaml"
-        ).open("w") as yaml_file:
-            yaml.dump(
-                self.character.model_dump(),
-                yaml_file,
-                sort_keys=False,
-                allow_unicode=True,
-                default_flow_style=False
-            )
+        entry = storage.STORAGE.save_character(self.character)
+        if s.SAVED_CHARS is not None:
+            s.SAVED_CHARS.add(entry)
 
     def dump_avatar(self, image: UploadedFile | None ):
         if image is not None:
-            for old_file in SAVED_CHARS_IMG_DIRECTORY.glob(f"*{self.character.id}.*"):
-                old_file.unlink()
-            image_file_path = Path(
-                    SAVED_CHARS_IMG_DIRECTORY,
-                    f"{self.character.name}.{self.character.id}{Path(image.name).suffix}"
-            )
-            image_file_path.write_bytes(image.getbuffer())
+            storage.STORAGE.save_avatar(self.character, bytes(image.getbuffer()), Path(image.name).suffix)
 
+    @instrumentation.timed()
     def apply_status(self):
-        dex_modifier = 0
-        mig_modifier = 0
-        ins_modifier = 0
-        wlp_modifier = 0
-
-        if Status.dazed in self.state.statuses:
-            ins_modifier -= 2
-        if Status.enraged in self.state.statuses:
-            ins_modifier -= 2
-            dex_modifier -= 2
-        if Status.poisoned in self.state.statuses:
-            mig_modifier -= 2
-            wlp_modifier -= 2
-        if Status.shaken in self.state.statuses:
-            wlp_modifier -= 2
-        if Status.slow in self.state.statuses:
-            dex_modifier -= 2
-        if Status.weak in self.state.statuses:
-            mig_modifier -= 2
+        modifiers = dict.fromkeys(AttributeName, 0)
+
+        for status, status_modifiers in STATUS_MODIFIERS.items():
+            if status in self.state.statuses:
+                for attribute, modifier in status_modifiers.items():
+                    modifiers[attribute] += modifier
 
         for attribute in self.state.improved_attributes:
-            match attribute:
-                case AttributeName.dexterity:
-                    dex_modifier += 2
-                case AttributeName.might:
-                    mig_modifier += 2
-                case AttributeName.insight:
-                    ins_modifier += 2
-                case AttributeName.willpower:
-                    wlp_modifier += 2
+            if attribute in modifiers:
+                modifiers[attribute] += IMPROVED_ATTRIBUTE_MODIFIER
 
         for t in self.state.active_therioforms:
-            match t.name:
-                case "arpaktida":
-                    ins_modifier += 2
-                case "dynamotheria":
-                    mig_modifier += 2
-                case "tachytheria":
-                    dex_modifier += 2
-
-        self.character.insight.current = min(MAX_ATTRIBUTE_VALUE, max(MIN_ATTRIBUTE_VALUE, self.character.insight.base + ins_modifier))
-        self.character.dexterity.current = min(MAX_ATTRIBUTE_VALUE, max(MIN_ATTRIBUTE_VALUE, self.character.dexterity.base + dex_modifier))
-        self.character.willpower.current = min(MAX_ATTRIBUTE_VALUE, max(MIN_ATTRIBUTE_VALUE, self.character.willpower.base + wlp_modifier))
-        self.character.might.current = min(MAX_ATTRIBUTE_VALUE, max(MIN_ATTRIBUTE_VALUE, self.character.might.base + mig_modifier))
+            for attribute, modifier in THERIOFORM_MODIFIERS.get(t.name, {}).items():
+                modifiers[attribute] += modifier
+
+        for name, modifier in modifiers.items():
+            attribute = getattr(self.character, name)
+            attribute.current = min(MAX_ATTRIBUTE_VALUE, max(MIN_ATTRIBUTE_VALUE, attribute.base + modifier))
 
+    @instrumentation.timed()
     def crisis_value(self) -> int:
         return math.floor(self.max_hp() / 2)
 
@@ -393,7 +383,7 @@ class CharacterController:
         return False
 
     def is_heroic_skill_available(self, skill: HeroicSkill) -> bool:
-        if skill in self.character.heroic_skills:
+        if self.character.heroic_skill_count(skill.name):
             return skill.can_add_several_times
         if skill.name == HeroicSkillName.heroic_companion and self.character.special.companion is None:
             return False
@@ -476,23 +466,22 @@ class CharacterController:
         return self.current_ip() >= ip_cost
 
     def dump_state(self):
-        with Path(SAVED_STATES_DIRECTORY, f"{self.character.id}.yaml").open("w", encoding="utf-8") as yaml_file:
-            yaml.dump(
-                self.state.model_dump(),
-                yaml_file,
-                sort_keys=False,
-                allow_unicode=True,
-                default_flow_style=False
-            )
+        if autosave.AUTOSAVE is not None:
+            autosave.AUTOSAVE.save(self.character.id, self.state)
+        else:
+            storage.STORAGE.save_state(self.character.id, self.state)
+
+    def autosave_state(self):
+        """Journal state changes made since the last call; they are written to storage shortly after."""
+        if autosave.AUTOSAVE is not None:
+            autosave.AUTOSAVE.record(self.character.id, self.state)
 
     def load_state(self):
-        try:
-            with Path(SAVED_STATES_DIRECTORY, f"{self.character.id}.yaml").open('r', encoding="utf-8") as yaml_file:
-                raw_state = yaml.load(yaml_file, Loader=yaml.Loader)
-                self.state = CharState(**dict(raw_state))
-        except:
+        state = autosave.load_state(self.character.id)
+        if state is None:
             self.state = CharState()
             raise Exception("Unable to load state. Switching to default.")
+        self.state = state
 
     def apply_levelup(self, skill: Skill, class_name: ClassName, new_class: CharClass | None, spells: list[Spell]):
         self.character.level += 1
@@ -504,10 +493,10 @@ class CharacterController:
         elif new_class is not None:
             self.add_class(new_class)
         if skill.can_add_spell:
-            self.character.spells[class_name] = spells
+            self.character.set_spells(class_name, [thaw(spell) for spell in spells])
 
     def add_heroic_skill(self, skill: HeroicSkill):
-        self.character.heroic_skills.append(skill)
+        self.character.heroic_skills.append(thaw(skill))
         self.apply_heroic_skill_effect(skill)
 
     def apply_heroic_skill_effect(self, skill: HeroicSkill):
@@ -577,7 +566,7 @@ class CharacterController:
         if skill_name == "theriomorphosis":
             return list(self.character.special.therioforms)
         if skill_name == "genoclepsis":
-            return list(c.COMPENDIUM.therioforms)
+            return list(c.get_compendium().therioforms)
         return []
 
     def max_manifest_therioforms(self, skill_name: str) -> int:
@@ -592,7 +581,7 @@ class CharacterController:
 
     def apply_manifest_therioform(self, therioforms: list[Therioform]):
         self.state.minus_hp += math.floor(self.current_hp() / 3)
-        self.state.active_therioforms = therioforms
+        self.state.active_therioforms = [thaw(therioform) for therioform in therioforms]
 
     def companion_skill_level(self) -> int:
         return self.get_skill_level(ClassName.wayfarer, "faithful_companion") or 0
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import math
+from collections import Counter
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pages.controller import CharacterController
+
+
+@dataclass(frozen=True)
+class DerivedStats:
+    """Everything the UI shows that is computed from the character and its state, taken at one moment."""
+    max_hp: int
+    max_mp: int
+    max_ip: int
+    current_hp: int
+    current_mp: int
+    current_ip: int
+    defense: int
+    magic_defense: int
+    initiative: str
+    crisis_value: int
+
+    @property
+    def in_crisis(self) -> bool:
+        return self.current_hp <= self.crisis_value
+
+
+def _freeze(value) -> Hashable:
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _item_key(item) -> Hashable:
+    if item is None:
+        return None
+    return (
+        item.bonus_defense,
+        item.bonus_magic_defense,
+        item.bonus_initiative,
+        _freeze(getattr(item, "defense", None)),
+    )
+
+
+class DerivedStatsEngine:
+    """
+    Caches each derived stat together with the inputs it was computed from.
+
+    Inputs are summarized into small hashable keys (level, attributes, classes, heroic skills,
+    equipment, therioforms, localization); a stat is recomputed with the controller's formula
+    only when one of the keys it depends on differs from the last computation.
+    """
+
+    dependencies: dict[str, tuple[str, ...]] = {
+        "max_hp": ("level", "attributes", "classes", "heroic_skills"),
+        "max_mp": ("level", "attributes", "classes", "heroic_skills"),
+        "max_ip": ("classes", "heroic_skills"),
+        "defense": ("attributes", "classes", "equipment", "therioforms"),
+        "magic_defense": ("attributes", "equipment"),
+        "initiative": ("attributes", "equipment", "loc"),
+    }
+
+    def __init__(self, controller: CharacterController):
+        self.controller = controller
+        self.recomputed: Counter[str] = Counter()
+        self.__cache: dict[str, tuple[tuple, int | str]] = {}
+        self.__snapshot: tuple[tuple, DerivedStats] | None = None
+
+    def input_keys(self) -> dict[str, Hashable]:
+        character = self.controller.character
+        equipped = character.inventory.equipped
+        dexterity, might, insight, willpower = character.dexterity, character.might, character.insight, character.willpower
+        return {
+            "level": character.level,
+            "attributes": (
+                dexterity.base, dexterity.current, might.base, might.current,
+                insight.base, insight.current, willpower.base, willpower.current,
+            ),
+            "classes": tuple(
+                (
+                    char_class.name,
+                    _freeze(char_class.class_bonus),
+                    char_class.bonus_value,
+                    *[skill.current_level for skill in char_class.skills],
+                )
+                for char_class in character.classes
+            ),
+            "heroic_skills": tuple([skill.name for skill in character.heroic_skills]),
+            "equipment": (
+                _item_key(equipped.main_hand),
+                _item_key(equipped.off_hand),
+                _item_key(equipped.armor),
+                _item_key(equipped.accessory),
+            ),
+            "therioforms": tuple([t.name for t in self.controller.state.active_therioforms]),
+            # The object itself, not its id: a reloaded or evicted language may reuse the id
+            "loc": self.controller.loc,
+        }
+
+    def snapshot(self) -> DerivedStats:
+        keys = self.input_keys()
+        state = self.controller.state
+        snapshot_key = (*keys.values(), state.minus_hp, state.minus_mp, state.minus_ip)
+        if self.__snapshot is not None and self.__snapshot[0] == snapshot_key:
+            return self.__snapshot[1]
+
+        max_hp = self.__get("max_hp", keys, self.controller.max_hp)
+        max_mp = self.__get("max_mp", keys, self.controller.max_mp)
+        max_ip = self.__get("max_ip", keys, self.controller.max_ip)
+        stats = DerivedStats(
+            max_hp=max_hp,
+            max_mp=max_mp,
+            max_ip=max_ip,
+            current_hp=max_hp - state.minus_hp,
+            current_mp=max_mp - state.minus_mp,
+            current_ip=max_ip - state.minus_ip,
+            defense=self.__get("defense", keys, self.controller.defense),
+            magic_defense=self.__get("magic_defense", keys, self.controller.magic_defense),
+            initiative=self.__get("initiative", keys, self.controller.initiative),
+            crisis_value=math.floor(max_hp / 2),
+        )
+        self.__snapshot = (snapshot_key, stats)
+        return stats
+
+    def invalidate(self):
+        self.__cache.clear()
+        self.__snapshot = None
+
+    def __get(self, stat: str, keys: dict[str, Hashable], compute: Callable[[], int | str]) -> int | str:
+        stat_key = tuple(keys[dependency] for dependency in self.dependencies[stat])
+        cached = self.__cache.get(stat)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+        value = compute()
+        self.recomputed[stat] += 1
+        self.__cache[stat] = (stat_key, value)
+        return value
@@ -0,0 +1,104 @@
+import uuid
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import instrumentation
+from config import PARTY_REFRESH_SECONDS
+from data import autosave
+from data import saved_characters as s
+from data.localizator import get_loc
+from data.models import Character, CharState, LocNamespace
+from data.saved_characters import CharacterEntry
+from pages.party_stats import party_stats
+
+
+title_key = "page_title_party"
+icon = ":material/groups:"
+
+
+def build():
+    loc = get_loc()
+    st.set_page_config(layout="wide")
+    st.title(loc.page_party_title)
+
+    if not s.SAVED_CHARS.char_list:
+        st.info(loc.page_load_character_no_saved, icon="👻")
+        return
+
+    selected = st.multiselect(
+        loc.page_party_select_members,
+        s.SAVED_CHARS.char_list,
+        format_func=lambda entry: loc.page_load_character_info.format(name=entry.name, level=entry.level),
+        key="party_members",
+    )
+    if not selected:
+        st.info(loc.page_party_empty, icon="🎲")
+        return
+
+    if st.button(loc.page_party_reload_button):
+        st.session_state.party_characters = {}
+
+    @st.fragment(run_every=PARTY_REFRESH_SECONDS)
+    @instrumentation.timed("party.table")
+    def party_table():
+        members = load_members([entry.id for entry in selected], loc)
+        if members:
+            show_party_table(members, loc)
+
+    party_table()
+
+
+def show_party_table(members: list[tuple[Character, CharState]], loc: LocNamespace):
+    stats = party_stats(members, loc.dice_prefix)
+
+    def points(current: str, maximum: str) -> pd.Series:
+        return stats[current].astype(str) + " / " + stats[maximum].astype(str)
+
+    crisis = np.where(stats["current_hp"] <= stats["crisis_value"], f" {loc.page_view_crisis_text}", "")
+    st.dataframe(
+        pd.DataFrame({
+            loc.page_party_column_name: stats["name"],
+            loc.column_level: stats["level"],
+            loc.hp: points("current_hp", "max_hp") + crisis,
+            loc.mp: points("current_mp", "max_mp"),
+            loc.ip: points("current_ip", "max_ip"),
+            loc.column_defense: stats["defense"],
+            loc.column_magic_defense: stats["magic_defense"],
+            loc.column_initiative: stats["initiative"],
+        }),
+        hide_index=True,
+    )
+
+
+def load_members(char_ids: list[uuid.UUID], loc: LocNamespace) -> list[tuple[Character, CharState]]:
+    """
+    The selected characters with their current play states.
+
+    Characters are read once per session, and again whenever they are saved.
+    States are read on every refresh, since players change them while the party table is open.
+    """
+    cached: dict[uuid.UUID, tuple[tuple[CharacterEntry, int | None], Character]] = st.session_state.get(
+        "party_characters", {}
+    )
+    characters = {}
+    members = []
+    for char_id in char_ids:
+        entry = s.SAVED_CHARS.get_entry(char_id)
+        if entry is None:
+            continue
+        version = (entry, s.SAVED_CHARS.storage.character_version(char_id))
+        if char_id in cached and cached[char_id][0] == version:
+            character = cached[char_id][1]
+        else:
+            try:
+                character = s.SAVED_CHARS.load(char_id)
+            except Exception as e:
+                st.error(loc.page_party_load_error.format(name=entry.name, error=e), icon="📜")
+                continue
+        characters[char_id] = (version, character)
+        members.append((character, autosave.load_state(char_id) or CharState()))
+    st.session_state.party_characters = characters
+    return members
+
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from config import MIN_ATTRIBUTE_VALUE, MAX_ATTRIBUTE_VALUE
+from data.models import AttributeName, Character, CharState, ClassName, HeroicSkillName
+from pages.controller import IMPROVED_ATTRIBUTE_MODIFIER, STATUS_MODIFIERS, THERIOFORM_MODIFIERS
+
+
+ATTRIBUTES = tuple(AttributeName)
+STATUSES = tuple(STATUS_MODIFIERS)
+THERIOFORMS = tuple(THERIOFORM_MODIFIERS)
+
+
+def _modifier_matrix(modifiers: dict[str, dict[AttributeName, int]]) -> np.ndarray:
+    # One row per status or therioform, one column per attribute in ATTRIBUTES order
+    return np.array([[row.get(attribute, 0) for attribute in ATTRIBUTES] for row in modifiers.values()], dtype=np.int64)
+
+
+STATUS_MATRIX = _modifier_matrix(STATUS_MODIFIERS)
+IMPROVED_ATTRIBUTE_MATRIX = IMPROVED_ATTRIBUTE_MODIFIER * np.eye(len(ATTRIBUTES), dtype=np.int64)
+THERIOFORM_MATRIX = _modifier_matrix(THERIOFORM_MODIFIERS)
+
+INPUTS = (
+    "level",
+    *map(str, ATTRIBUTES),
+    *(f"status_{status}" for status in STATUSES),
+    *(f"improved_{attribute}" for attribute in ATTRIBUTES),
+    *(f"therioform_{therioform}" for therioform in THERIOFORMS),
+    "hp_bonus", "mp_bonus", "ip_bonus", "extra_hp", "extra_mp", "extra_ip",
+    "item_defense", "item_magic_defense", "item_initiative", "armor_defense",
+    "dodge", "placophora", "theriomorphosis",
+    "minus_hp", "minus_mp", "minus_ip",
+)
+
+
+def _skill_level(character: Character, class_name: ClassName, skill_name: str) -> int:
+    char_class = character.get_class(class_name)
+    return (char_class.get_skill_level(skill_name) if char_class is not None else None) or 0
+
+
+def _input_row(character: Character, state: CharState) -> tuple[int, ...]:
+    equipped = character.inventory.equipped
+    items = [item for item in (equipped.main_hand, equipped.off_hand, equipped.armor, equipped.accessory) if item]
+    heroic_skills = {skill.name for skill in character.heroic_skills}
+    therioforms = [therioform.name for therioform in state.active_therioforms]
+    class_bonuses = {"hp": 0, "mp": 0, "ip": 0}
+    for char_class in character.classes:
+        if isinstance(char_class.class_bonus, str) and char_class.class_bonus in class_bonuses:
+            class_bonuses[char_class.class_bonus] += char_class.bonus_value
+    armor = equipped.armor
+    return (
+        character.level,
+        *(getattr(character, attribute).base for attribute in ATTRIBUTES),
+        *(status in state.statuses for status in STATUSES),
+        *(state.improved_attributes.count(attribute) for attribute in ATTRIBUTES),
+        *(therioforms.count(therioform) for therioform in THERIOFORMS),
+        class_bonuses["hp"],
+        class_bonuses["mp"],
+        class_bonuses["ip"],
+        HeroicSkillName.extra_hp in heroic_skills,
+        HeroicSkillName.extra_mp in heroic_skills,
+        HeroicSkillName.extra_ip in heroic_skills,
+        sum(item.bonus_defense for item in items),
+        sum(item.bonus_magic_defense for item in items),
+        sum(item.bonus_initiative for item in items),
+        armor.defense if armor is not None and isinstance(armor.defense, int) else -1,
+        _skill_level(character, ClassName.rogue, "dodge"),
+        "placophora" in therioforms,
+        _skill_level(character, ClassName.mutant, "theriomorphosis"),
+        state.minus_hp,
+        state.minus_mp,
+        state.minus_ip,
+    )
+
+
+def party_inputs(members: list[tuple[Character, CharState]]) -> dict[str, np.ndarray]:
+    """
+    The inputs of the derived stat formulas, one array per input with an entry per member.
+
+    This is the only loop over the members: it reads plain numbers off the models, so that
+    `party_stats` can apply every formula to the whole party at once.
+    """
+    table = np.array([_input_row(character, state) for character, state in members], dtype=np.int64)
+    table = table.reshape(len(members), len(INPUTS))
+    return {name: table[:, i] for i, name in enumerate(INPUTS)}
+
+
+def _columns(inputs: dict[str, np.ndarray], prefix: str) -> np.ndarray:
+    return np.column_stack([inputs[name] for name in inputs if name.startswith(prefix)])
+
+
+def party_stats(members: list[tuple[Character, CharState]], dice_prefix: str = "d") -> pd.DataFrame:
+    """
+    The derived stats of every member, one row each. Values match what `CharacterController.derived_stats`
+    gives for the member once `apply_status` has run.
+    """
+    x = party_inputs(members)
+    modifiers = (
+        _columns(x, "status_") @ STATUS_MATRIX
+        + _columns(x, "improved_") @ IMPROVED_ATTRIBUTE_MATRIX
+        + _columns(x, "therioform_") @ THERIOFORM_MATRIX
+    ) if members else np.zeros((0, len(ATTRIBUTES)), dtype=np.int64)
+    current = {
+        attribute: np.clip(x[attribute] + modifiers[:, i], MIN_ATTRIBUTE_VALUE, MAX_ATTRIBUTE_VALUE)
+        for i, attribute in enumerate(ATTRIBUTES)
+    }
+
+    heroic_bonus = np.where(x["level"] < 40, 10, 20)
+    max_hp = x["level"] + x["might"] * 5 + x["hp_bonus"] + x["extra_hp"] * heroic_bonus
+    max_mp = x["level"] + x["willpower"] * 5 + x["mp_bonus"] + x["extra_mp"] * heroic_bonus
+    max_ip = 6 + x["ip_bonus"] + x["extra_ip"] * 4
+
+    defense = np.where(x["armor_defense"] >= 0, x["armor_defense"], current[AttributeName.dexterity])
+    defense = defense + x["item_defense"] + x["dodge"]
+    defense = np.where(x["placophora"] == 1, np.maximum(defense, 13 + x["theriomorphosis"] // 2), defense)
+
+    bonus = x["item_initiative"]
+    initiative = reduce(np.char.add, (
+        dice_prefix, current[AttributeName.insight].astype(str),
+        " + ", dice_prefix, current[AttributeName.dexterity].astype(str),
+        np.where(bonus > 0, " +", np.where(bonus < 0, " ", "")),
+        np.where(bonus != 0, bonus.astype(str), ""),
+    ))
+
+    return pd.DataFrame({
+        "name": [character.name for character, _ in members],
+        "level": x["level"],
+        "max_hp": max_hp,
+        "max_mp": max_mp,
+        "max_ip": max_ip,
+        "current_hp": max_hp - x["minus_hp"],
+        "current_mp": max_mp - x["minus_mp"],
+        "current_ip": max_ip - x["minus_ip"],
+        "defense": defense,
+        "magic_defense": current[AttributeName.insight] + x["item_magic_defense"],
+        "initiative": initiative.astype(object),
+        "crisis_value": max_hp // 2,
+    })
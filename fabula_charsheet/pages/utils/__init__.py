@@ -1,6 +1,7 @@
 from .page_state import (
     set_creation_state,
-    set_view_state
+    set_view_state,
+    rerun_fragment,
 )
 
 from .table_writer import (
@@ -25,7 +26,7 @@ from .common import (
     list_skills,
     show_martial,
     show_skill,
-    get_avatar_path,
+    get_avatar,
     join_with_or,
     join_with_and,
     add_item_as,
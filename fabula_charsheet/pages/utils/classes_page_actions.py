@@ -4,7 +4,7 @@ from typing import Literal
 
 import streamlit as st
 
-from data.models import LocNamespace, ClassBonus
+from data.models import LocNamespace, ClassBonus, thaw
 from .table_writer import SkillTableWriter, SpellTableWriter
 from .common import if_show_spells, list_skills, show_martial
 from pages.controller import CharacterController, ClassController
@@ -19,11 +19,11 @@ def add_new_class(
 ):
     class_not_ready = True
     if mode == "creation":
-        available_classes = [char_class.name for char_class in sorted(c.COMPENDIUM.classes.classes, key=lambda x: x.name)]
+        available_classes = [char_class.name for char_class in sorted(c.get_compendium().classes.classes, key=lambda x: x.name)]
     else:
 
         available_classes = [char_class.name for char_class in
-                             sorted(c.COMPENDIUM.classes.classes, key=lambda x: x.name)
+                             sorted(c.get_compendium().classes.classes, key=lambda x: x.name)
                              if char_class.name not in [
                                  added_class.name for added_class in character_controller.character.classes
                              ]
@@ -36,9 +36,11 @@ def add_new_class(
         format_func=lambda x: x.localized_name(loc),
         accept_new_options=False,
     )
-    selected_class = c.COMPENDIUM.classes.get_class(selected_class_name)
+    selected_class = c.get_compendium().classes.get_class(selected_class_name)
 
     if selected_class:
+        # The skills picked below are levelled up on this copy
+        selected_class = thaw(selected_class)
         if character_controller.is_class_added(selected_class):
             st.error(loc.page_class_already_added_error)
         else:
@@ -74,7 +76,7 @@ def add_new_class(
                 class_not_ready = False
 
             if if_show_spells(casting_skill) and mode == "creation":
-                class_spells = c.COMPENDIUM.spells.get_spells(class_controller.char_class.name)
+                class_spells = c.get_compendium().spells.get_spells(class_controller.char_class.name)
                 max_n_spells = casting_skill.current_level
 
                 with st.expander(loc.page_class_select_spells_expander):
@@ -93,7 +95,9 @@ def add_new_class(
     if mode == "creation":
         if st.button(loc.page_class_add_button, disabled=class_not_ready):
             character_controller.add_class(class_controller.char_class)
-            character_controller.character.spells[selected_class_name] = st.session_state.class_spells
+            character_controller.character.set_spells(selected_class_name, [
+                thaw(spell) for spell in st.session_state.class_spells
+            ])
             st.session_state.class_spells = []
             st.info(loc.page_class_added_info.format(selected_class=selected_class.name.localized_name(loc)))
             st.rerun()
@@ -1,11 +1,9 @@
 import uuid
 from pathlib import Path
-from copy import deepcopy
 from itertools import chain
 
 import streamlit as st
 
-import config
 from data.models import (
     Skill,
     Weapon,
@@ -22,18 +20,17 @@ from data.models import (
     Status,
     DamageType,
     Species,
+    thaw,
 )
 from pages.controller import ClassController, CharacterController
 from data import compendium as c
+from data import storage
 
 
-def get_avatar_path(char_id: uuid.UUID) -> Path | None:
-    for ext in ("jpg", "jpeg", "png", "gif"):
-        matches = list(config.SAVED_CHARS_IMG_DIRECTORY.glob(f"*{char_id}.{ext}"))
-        if matches:
-            return matches[0]
-
-    return None
+def get_avatar(char_id: uuid.UUID, width: int | None = None) -> Path | bytes | None:
+    if width is None:
+        return storage.STORAGE.load_avatar(char_id)
+    return storage.STORAGE.load_avatar_thumbnail(char_id, width)
 
 
 def if_show_spells(casting_skill: Skill):
@@ -84,7 +81,7 @@ def add_item_as(item: Item, inventory: Inventory, loc: LocNamespace):
     button_label = loc.page_equipment_add_item_as_button.format(name=new_name)
 
     if st.button(button_label, disabled=not new_name):
-        item = deepcopy(item)
+        item = thaw(item)
         item.name = new_name
         if isinstance(item, Armor):
             inventory.backpack.armors.append(item)
@@ -172,11 +169,11 @@ def upgrade_item(controller: CharacterController, item: Item, loc: LocNamespace)
 
     if isinstance(item, Weapon):
         available_qualities.extend(
-            [q for q in c.COMPENDIUM.qualities["weapons"] if q.cost <= 1000]
+            [q for q in c.get_compendium().qualities["weapons"] if q.cost <= 1000]
         )
     else:
         available_qualities.extend(
-            [q for q in c.COMPENDIUM.qualities["armors"] if q.cost <= 1000]
+            [q for q in c.get_compendium().qualities["armors"] if q.cost <= 1000]
         )
 
     selected_quality, detail = select_quality(available_qualities, loc)
@@ -0,0 +1,38 @@
+import streamlit as st
+
+import instrumentation
+from data.localizator import get_loc
+
+
+def show_debug_panel():
+    """Sidebar panel with the timings of recent reruns; shown only while instrumentation is on."""
+    loc = get_loc()
+    reruns = instrumentation.recent_reruns()
+    with st.sidebar.expander(loc.debug_rerun_timings, icon=":material/timer:"):
+        if not reruns:
+            st.caption(loc.debug_no_reruns)
+        else:
+            last = reruns[-1]
+            st.metric(loc.debug_last_rerun.format(label=last.label), f"{last.total_ms:.1f} ms")
+            st.dataframe(
+                [
+                    {
+                        loc.debug_column_span: name,
+                        loc.debug_column_calls: timing.calls,
+                        loc.debug_column_total_ms: round(timing.total_ms, 2),
+                    }
+                    for name, timing in last.slowest(15)
+                ],
+                hide_index=True,
+            )
+            st.bar_chart([round(rerun.total_ms, 2) for rerun in reruns], height=150)
+
+        if instrumentation.profile_pending():
+            st.caption(loc.debug_profile_pending)
+        elif st.button(loc.debug_profile_next_rerun, key="debug-profile-next-rerun"):
+            instrumentation.request_profile()
+            st.rerun()
+
+        profiles = [rerun.profile_path for rerun in reruns if rerun.profile_path is not None]
+        if profiles:
+            st.caption(loc.debug_last_profile.format(path=profiles[-1]))
@@ -1,12 +1,12 @@
 import streamlit as st
 
-import config
 from data import saved_characters as s
-from data.models import Character, LocNamespace
-from .common import get_avatar_path
+from data import storage
+from data.models import LocNamespace
+from data.saved_characters import CharacterEntry
 
 
-def delete_character(character: Character, loc: LocNamespace):
+def delete_character(character: CharacterEntry, loc: LocNamespace):
     st.warning(loc.page_delete_character_warning, icon="❓")
     c1, c2 = st.columns([0.2, 0.8])
     with c1:
@@ -17,21 +17,14 @@ def delete_character(character: Character, loc: LocNamespace):
                     loc.page_delete_character_yes_button.format(name=character.name.title()),
                     icon="💀"
                 ):
-            s.SAVED_CHARS.char_list.remove(character)
-            char_paths = list(config.SAVED_CHARS_DIRECTORY.glob(f"*.{character.id}.character.yaml"))
-            if not char_paths:
-                st.error(loc.page_delete_character_file_missing, icon="📜")
-            for char_path in char_paths:
-                try:
-                    char_path.unlink()
-                except PermissionError:
-                    st.error(loc.page_delete_character_file_permission, icon="🔒")
-            avatar_path = get_avatar_path(character.id)
-            if avatar_path:
-                try:
-                    avatar_path.unlink()
-                    st.rerun()
-                except PermissionError:
-                    st.error(loc.page_delete_character_avatar_permission, icon="🔒")
-            else:
+            s.SAVED_CHARS.remove(character.id)
+            try:
+                if not storage.STORAGE.delete_character(character.id):
+                    st.error(loc.page_delete_character_file_missing, icon="📜")
+            except PermissionError:
+                st.error(loc.page_delete_character_file_permission, icon="🔒")
+            try:
+                storage.STORAGE.delete_avatar(character.id)
                 st.rerun()
+            except PermissionError:
+                st.error(loc.page_delete_character_avatar_permission, icon="🔒")
@@ -12,3 +12,19 @@ def set_view_state(state: ViewState):
 def set_creation_state(state: CreationState):
     st.session_state.creation_step = state
     st.rerun()
+
+
+def rerun_fragment(invalidate_view: bool = False):
+    """
+    Rerun only the fragment the calling widget lives in.
+
+    A fragment keeps its clicks from re-rendering the rest of the page, so when a change is also
+    shown by another fragment the caller has to invalidate the whole view instead. Streamlit refuses
+    fragment-scoped reruns while the fragment runs as part of a full rerun; those rerun the app.
+    """
+    if not invalidate_view:
+        try:
+            st.rerun(scope="fragment")
+        except st.errors.StreamlitAPIException:
+            pass
+    st.rerun()
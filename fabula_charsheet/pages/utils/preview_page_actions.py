@@ -5,7 +5,7 @@ import streamlit as st
 from pages.utils import SkillTableWriter, if_show_spells, SpellTableWriter, show_skill
 from config import BASE_ATTRIBUTE_SUM
 from pages.controller import CharacterController, ClassController
-from data.models import Dexterity, Might, Insight, Willpower, Item, CharacterTheme, CharClass, LocNamespace
+from data.models import Dexterity, Might, Insight, Willpower, Item, CharacterTheme, CharClass, LocNamespace, thaw
 from data import compendium as c
 
 
@@ -134,7 +134,7 @@ def edit_class(character_controller: CharacterController, char_class: CharClass,
         class_not_ready = False
 
     if if_show_spells(casting_skill):
-        class_spells = c.COMPENDIUM.spells.get_spells(class_controller.char_class.name)
+        class_spells = c.get_compendium().spells.get_spells(class_controller.char_class.name)
         with st.expander(loc.page_class_select_spells):
             SpellTableWriter(loc).write_in_columns(class_spells)
         total_class_spells = len(st.session_state["class_spells"])
@@ -149,7 +149,9 @@ def edit_class(character_controller: CharacterController, char_class: CharClass,
     if st.button(loc.page_class_update_button, disabled=class_not_ready):
         try:
             character_controller.update_class(class_controller.char_class)
-            character_controller.character.spells[char_class.name] = st.session_state.class_spells
+            character_controller.character.set_spells(char_class.name, [
+                thaw(spell) for spell in st.session_state.class_spells
+            ])
             st.session_state.class_spells = []
             st.info(loc.page_class_updated.format(class_name=char_class.name.title()))
             st.rerun()
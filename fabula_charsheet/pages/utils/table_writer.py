@@ -1,10 +1,15 @@
+import math
+import threading
+import zlib
+from collections import OrderedDict
 from collections.abc import Iterable, Callable
-from copy import deepcopy
 from typing import Optional
 
 import streamlit as st
 from pydantic import BaseModel
 
+import instrumentation
+
 from data.models import (
     Skill,
     Spell,
@@ -25,6 +30,8 @@ from data.models import (
     HeroicSkillName,
     Arcanum,
     Invention,
+    is_frozen,
+    thaw,
 )
 from pages.controller import CharacterController
 from .common import add_item_as, join_with_or, upgrade_item
@@ -34,9 +41,33 @@ class ColumnConfig(BaseModel):
     name: str
     width: float
     process: Optional[Callable]
+    # Plain-text cell used by the dataframe render mode
+    value: Optional[Callable] = None
+
+
+# Localized search keys of compendium entries by (writer, loc, columns, entry), least recently used first.
+# Candidates come from the compendium, so the same rows are searched over and over while a dialog is open.
+# The loc and the frozen entry are part of the key themselves: a reloaded or evicted language never
+# matches, and neither does another entry with the same name.
+MAX_SEARCH_KEYS = 4096
+_SEARCH_KEYS: OrderedDict[tuple, str] = OrderedDict()
+_search_keys_lock = threading.Lock()
+
+
+def _column_width(width: float) -> str:
+    if width < 0.15:
+        return "small"
+    if width < 0.4:
+        return "medium"
+    return "large"
+
 
 class TableWriter:
     columns = None
+    # Subclasses opt in to rendering one st.dataframe instead of a row of st.columns per item.
+    # Columns without a `value` render widgets, so their tables keep the columns layout,
+    # except for `select_row` checkboxes, which become an editable checkbox column.
+    dataframe_mode = False
 
     def __init__(
         self,
@@ -53,16 +84,40 @@ class TableWriter:
             else:
                 raise AssertionError("TableWriter requires 'columns' or 'base_columns' to be defined")
 
+    @instrumentation.timed_method
     def write_in_columns(
             self,
             data: Iterable,
             header: bool = True,
             description: bool = True,
+            page_size: int | None = None,
+            search: str | Callable[[object], bool] | None = None,
+            key: str | None = None,
     ):
+        """
+        Render `data`, one row per item.
+
+        `search` keeps only the items whose localized search key contains every word of the text,
+        or for which the predicate is true. With `page_size`, only one page of the remaining items
+        is rendered, picked by a page selector keyed by `key`.
+        """
+        rows = list(enumerate(data))
+        if search:
+            rows = [(idx, item) for idx, item in rows if self.matches(item, search)]
+            if not rows:
+                st.caption(self.loc.table_no_matches)
+                return
+        if page_size is not None:
+            rows = self._page(rows, page_size, key or type(self).__name__)
+
+        if self.dataframe_mode and self.can_write_dataframe():
+            self.write_dataframe([item for _, item in rows], description=description)
+            return
+
         if header:
             self._write_header()
 
-        for item_idx, item in enumerate(data):
+        for item_idx, item in rows:
             for cell, column_config in zip(
                 st.columns(spec=[col.width for col in self.columns]),
                 self.columns
@@ -73,22 +128,126 @@ class TableWriter:
             if description:
                 self._add_description(item, item_idx)
 
+    def matches(self, item, search: str | Callable[[object], bool]) -> bool:
+        if callable(search):
+            return search(item)
+        search_key = self.search_key(item)
+        return all(word in search_key for word in search.casefold().split())
+
+    def search_key(self, item) -> str:
+        if not is_frozen(item):
+            # A character's own items can change in place, so only compendium entries are cached
+            return self._search_text(item).casefold()
+
+        cache_key = (type(self), self.loc, tuple(col.name for col in self.columns), item)
+        with _search_keys_lock:
+            search_key = _SEARCH_KEYS.get(cache_key)
+            if search_key is not None:
+                _SEARCH_KEYS.move_to_end(cache_key)
+                return search_key
+
+        search_key = self._search_text(item).casefold()
+        with _search_keys_lock:
+            _SEARCH_KEYS[cache_key] = search_key
+            while len(_SEARCH_KEYS) > MAX_SEARCH_KEYS:
+                _SEARCH_KEYS.popitem(last=False)
+        return search_key
+
+    def _search_text(self, item) -> str:
+        parts = [col.value(item) for col in self.columns if col.value is not None]
+        if not parts and hasattr(item, "localized_name"):
+            parts.append(item.localized_name(self.loc))
+        description = self._description_text(item)
+        if description:
+            parts.append(description)
+        return " ".join(parts)
+
+    def _page(self, rows: list, page_size: int, key: str) -> list:
+        page_count = math.ceil(len(rows) / page_size)
+        if page_count <= 1:
+            return rows
+        page = st.number_input(
+            self.loc.table_page.format(count=page_count),
+            min_value=1,
+            max_value=page_count,
+            value=1,
+            # A new page count (the search changed) starts over from the first page
+            key=f"{key}-page-{page_count}",
+        )
+        first = (page - 1) * page_size
+        return rows[first:first + page_size]
+
+    def can_write_dataframe(self) -> bool:
+        return all(col.value is not None or col.process == self.select_row for col in self.columns)
+
+    def write_dataframe(self, data: Iterable, description: bool = True):
+        items = list(data)
+        if not items:
+            return
+        table = {}
+        column_config = {}
+        selection_label = None
+        for col in self.columns:
+            label = self._column_label(col.name)
+            if col.process == self.select_row:
+                selection_label = label
+                table[label] = [self._is_selected(item) for item in items]
+                column_config[label] = st.column_config.CheckboxColumn(label, width=_column_width(col.width))
+            else:
+                table[label] = [col.value(item) for item in items]
+                column_config[label] = st.column_config.TextColumn(label, width=_column_width(col.width))
+        if description and self._description_text(items[0]) is not None:
+            label = self._column_label("description")
+            table[label] = [self._description_text(item) for item in items]
+            column_config[label] = st.column_config.TextColumn(label, width="large")
+
+        names = "|".join(item.name for item in items)
+        key = f"{type(self).__name__}-{zlib.crc32(names.encode())}"
+        if selection_label is None:
+            st.dataframe(table, column_config=column_config, hide_index=True, key=key)
+            return
+
+        edited = st.data_editor(
+            table,
+            column_config=column_config,
+            disabled=[label for label in table if label != selection_label],
+            hide_index=True,
+            key=key,
+        )
+        for item, selected in zip(items, edited[selection_label]):
+            self._set_selected(item, bool(selected))
+
+    def _column_label(self, column_name: str) -> str:
+        return self.loc.get(f"column_{column_name}", column_name.capitalize())
+
     def _write_header(self):
         for cell, column_name in zip(
             st.columns(spec=[col.width for col in self.columns]),
             (col.name for col in self.columns)
         ):
             with cell:
-                key = f"column_{column_name}"
-                try:
-                    localized_value = getattr(self.loc, key)
-                except AttributeError:
-                    localized_value = column_name.capitalize()
-                st.markdown(f"##### {localized_value}")
+                st.markdown(f"##### {self._column_label(column_name)}")
 
     def _add_description(self, item, idx=None):
         raise NotImplementedError
 
+    def _description_text(self, item) -> str | None:
+        return None
+
+    def select_row(self, item, idx=None):
+        selected = st.checkbox("select",
+                               value=self._is_selected(item),
+                               label_visibility="hidden",
+                               key=f"{item.name}-toggle"
+                               )
+        self._set_selected(item, selected)
+
+    def _is_selected(self, item) -> bool:
+        raise NotImplementedError
+
+    def _set_selected(self, item, selected: bool):
+        raise NotImplementedError
+
     def _add_item_as(self, item: Item):
         @st.dialog(self.loc.page_equipment_create_new_name)
         def add_item_as_dialog(item: Item):
@@ -184,9 +343,10 @@ class SkillTableWriter(TableWriter):
                 label_visibility="hidden",
             )
 
-    def write_in_columns(self, data: Iterable, header: bool = True, description: bool = True):
+    @instrumentation.timed_method
+    def write_in_columns(self, data: Iterable, header: bool = True, description: bool = True, **kwargs):
         skills = list(data)
-        super().write_in_columns(skills, header=header, description=description)
+        super().write_in_columns(skills, header=header, description=description, **kwargs)
         if any(col.process == SkillTableWriter._level_input for col in self.columns):
             SkillTableWriter._sync_skill_levels(skills)
 
@@ -274,6 +434,8 @@ class HeroicSkillTableWriter(TableWriter):
 
 
 class SpellTableWriter(TableWriter):
+    dataframe_mode = True
+
     @property
     def base_columns(self):
         return (
@@ -281,26 +443,30 @@ class SpellTableWriter(TableWriter):
                 name="spell",
                 width=0.25,
                 process=self.write_spell_name,
+                value=self._spell_name,
             ),
             ColumnConfig(
                 name="mp",
                 width=0.15,
                 process=self.write_mp_cost,
+                value=self._mp_cost,
             ),
             ColumnConfig(
                 name="target",
                 width=0.25,
                 process=self.write_target,
+                value=self._target,
             ),
             ColumnConfig(
                 name="duration",
                 width=0.2,
                 process=self.write_duration,
+                value=self._duration,
             ),
             ColumnConfig(
                 name="select",
                 width=0.15,
-                process=self.spell_selector,
+                process=self.select_row,
             ),
         )
 
@@ -312,6 +478,7 @@ class SpellTableWriter(TableWriter):
                 name="species",
                 width=0.15,
                 process=self._process_species,
+                value=lambda spell: spell.species.localized_name(self.loc),
             ),
         )
 
@@ -326,33 +493,45 @@ class SpellTableWriter(TableWriter):
         return tuple(columns)
 
     def _add_description(self, spell: Spell, idx=None):
-        st.markdown(spell.localized_description(self.loc))
+        st.markdown(self._description_text(spell))
         st.divider()
 
+    def _description_text(self, spell: Spell) -> str:
+        return spell.localized_description(self.loc)
+
+    def _spell_name(self, spell: Spell) -> str:
+        return f"{spell.localized_name(self.loc)}{'⚡' if spell.is_offensive else ''}"
+
+    def _mp_cost(self, spell: Spell) -> str:
+        return f"{spell.mp_cost}{f' x {self.loc.spell_target_marker}' if spell.target == 'up_to_three' else ''}"
+
+    def _target(self, spell: Spell) -> str:
+        return spell.target.localized_name(self.loc)
+
+    def _duration(self, spell: Spell) -> str:
+        return spell.duration.localized_name(self.loc)
+
     def write_spell_name(self, spell: Spell, idx=None):
-        st.markdown(f"{spell.localized_name(self.loc)}{'⚡' if spell.is_offensive else ''}")
+        st.markdown(self._spell_name(spell))
 
     def write_mp_cost(self, spell: Spell, idx=None):
-        st.markdown(f"{spell.mp_cost}{f' x {self.loc.spell_target_marker}' if spell.target == 'up_to_three' else ''}")
+        st.markdown(self._mp_cost(spell))
 
     def write_target(self, spell: Spell, idx=None):
-        st.markdown(spell.target.localized_name(self.loc))
+        st.markdown(self._target(spell))
 
     def write_duration(self, spell: Spell, idx=None):
-        st.markdown(spell.duration.localized_name(self.loc))
+        st.markdown(self._duration(spell))
 
-    def spell_selector(self, spell: Spell, idx=None):
+    def _is_selected(self, spell: Spell) -> bool:
+        return spell in st.session_state.get("class_spells", [])
+
+    def _set_selected(self, spell: Spell, selected: bool):
         st.session_state.class_spells = st.session_state.get("class_spells", [])
-        if st.checkbox("add spell",
-                       value=(spell in st.session_state.class_spells),
-                       label_visibility="hidden",
-                       key=f"{spell.name}-toggle"
-                       ):
-            if spell not in st.session_state.class_spells:
-                st.session_state.class_spells.append(spell)
-        else:
-            if spell in st.session_state.class_spells:
-                st.session_state.class_spells.remove(spell)
+        if selected and spell not in st.session_state.class_spells:
+            st.session_state.class_spells.append(spell)
+        elif not selected and spell in st.session_state.class_spells:
+            st.session_state.class_spells.remove(spell)
 
     def _process_species(self, spell: ChimeristSpell, idx=None):
         st.markdown(spell.species.localized_name(self.loc))
@@ -366,21 +545,25 @@ class WeaponTableWriter(TableWriter):
                 name="weapon",
                 width=0.2,
                 process=self._process_weapon,
+                value=self._weapon_name,
             ),
             ColumnConfig(
                 name="cost",
                 width=0.15,
                 process=self._process_cost,
+                value=self._cost,
             ),
             ColumnConfig(
                 name="accuracy",
                 width=0.2,
                 process=self._process_accuracy,
+                value=lambda weapon: weapon.format_accuracy(self.loc),
             ),
             ColumnConfig(
                 name="damage",
                 width=0.2,
                 process=self._process_damage,
+                value=self._damage,
             ),
             ColumnConfig(
                 name="add",
@@ -400,35 +583,45 @@ class WeaponTableWriter(TableWriter):
             ),
         )
 
-    def _process_weapon(self, s, idx=None):
+    def _weapon_name(self, s) -> str:
         key = f"item_{s.name}"
-        weapon_name = getattr(self.loc, key, s.name.title())
-        st.markdown(f"{weapon_name} {'♦️' if s.martial else ''}")
+        weapon_name = self.loc.get(key, s.name.title())
+        return f"{weapon_name} {'♦️' if s.martial else ''}"
+
+    def _cost(self, s) -> str:
+        currency = self.loc.get("zenit_short", "z")
+        return f"{s.cost} {currency}"
+
+    def _damage(self, s, separator: str = " ") -> str:
+        hr_label = self.loc.get("hr", "HR")
+        damage_key = f"damage_{s.damage_type}"
+        damage_type = self.loc.get(damage_key, s.damage_type)
+        return f"【{hr_label}{separator}+{separator}{s.bonus_damage}】 {damage_type}"
+
+    def _process_weapon(self, s, idx=None):
+        st.markdown(self._weapon_name(s))
 
     def _process_cost(self, s, idx=None):
-        currency = getattr(self.loc, "zenit_short", "z")
-        st.markdown(f"{s.cost} {currency}")
+        st.markdown(self._cost(s))
 
     def _process_accuracy(self, s, idx=None):
         st.markdown(s.format_accuracy(self.loc))
 
     def _process_damage(self, s, idx=None):
-        hr_label = getattr(self.loc, "hr", "HR")
-        damage_key = f"damage_{s.damage_type}"
-        damage_type = getattr(self.loc, damage_key, s.damage_type)
-        st.markdown(f"【{hr_label}&nbsp;+&nbsp;{s.bonus_damage}】 {damage_type}")
+        st.markdown(self._damage(s, separator="&nbsp;"))
 
     def _add_description(self, item: Weapon, idx=None):
-        st.markdown(
-            " ◆ ".join((
-                item.weapon_category.localized_name(self.loc),
-                item.grip_type.localized_name(self.loc),
-                item.range.localized_name(self.loc),
-                item.localized_quality(self.loc),
-            ))
-        )
+        st.markdown(self._description_text(item))
         st.divider()
 
+    def _description_text(self, item: Weapon) -> str:
+        return " ◆ ".join((
+            item.weapon_category.localized_name(self.loc),
+            item.grip_type.localized_name(self.loc),
+            item.range.localized_name(self.loc),
+            item.localized_quality(self.loc),
+        ))
+
     def _add_weapon(self, weapon: Weapon, idx=None):
         cannot_equip = not self.controller.can_equip_martial(weapon)
 
@@ -437,7 +630,7 @@ class WeaponTableWriter(TableWriter):
                 key=f"{weapon.name}-add",
                 disabled=(cannot_equip or (self.inventory.zenit < weapon.cost))
         ):
-            self.inventory.backpack.weapons.append(deepcopy(weapon))
+            self.inventory.backpack.weapons.append(thaw(weapon))
             self.inventory.zenit -= weapon.cost
         if st.button(self.loc.add_as_button, key=f"{weapon.name}-add-as"):
             self._add_item_as(weapon)
@@ -517,11 +710,11 @@ class ArmorTableWriter(TableWriter):
 
     def _process_armor(self, s, idx=None):
         key = f"item_{s.name}"
-        armor_name = getattr(self.loc, key, s.name.title())
+        armor_name = self.loc.get(key, s.name.title())
         st.markdown(f"{armor_name} {'♦️' if s.martial else ''}")
 
     def _process_cost(self, s, idx=None):
-        currency = getattr(self.loc, "zenit_short", "z")
+        currency = self.loc.get("zenit_short", "z")
         st.markdown(f"{s.cost} {currency}")
 
     def _add_description(self, item: Armor, idx=None):
@@ -533,7 +726,7 @@ class ArmorTableWriter(TableWriter):
 
         disabled = cannot_equip or (self.inventory.zenit < armor.cost)
         if st.button(self.loc.add_button, key=f"{armor.name}-add", disabled=disabled):
-            self.inventory.backpack.armors.append(deepcopy(armor))
+            self.inventory.backpack.armors.append(thaw(armor))
             self.inventory.zenit -= armor.cost
 
         if st.button(self.loc.add_as_button, key=f"{armor.name}-add-as"):
@@ -630,11 +823,11 @@ class ShieldTableWriter(TableWriter):
 
     def _process_shield(self, s, idx=None):
         key = f"item_{s.name}"
-        shield_name = getattr(self.loc, key, s.name.title())
+        shield_name = self.loc.get(key, s.name.title())
         st.markdown(f"{shield_name} {'♦️' if s.martial else ''}")
 
     def _process_cost(self, s, idx=None):
-        currency = getattr(self.loc, "zenit_short", "z")
+        currency = self.loc.get("zenit_short", "z")
         st.markdown(f"{s.cost} {currency}")
 
     def _add_description(self, item: Shield, idx=None):
@@ -646,7 +839,7 @@ class ShieldTableWriter(TableWriter):
 
         disabled = cannot_equip or (self.inventory.zenit < shield.cost)
         if st.button(self.loc.add_button, key=f"{shield.name}-add", disabled=disabled):
-            self.inventory.backpack.shields.append(deepcopy(shield))
+            self.inventory.backpack.shields.append(thaw(shield))
             self.inventory.zenit -= shield.cost
 
         if st.button(self.loc.add_as_button, key=f"{shield.name}-add-as"):
@@ -714,11 +907,11 @@ class AccessoryTableWriter(TableWriter):
 
     def _process_name(self, s, idx=None):
         key = f"item_{s.name}"
-        item_name = getattr(self.loc, key, s.name.title())
+        item_name = self.loc.get(key, s.name.title())
         st.markdown(item_name)
 
     def _process_cost(self, s, idx=None):
-        currency = getattr(self.loc, "zenit_short", "z")
+        currency = self.loc.get("zenit_short", "z")
         st.markdown(f"{s.cost} {currency}")
 
     def _add_description(self, item: Accessory, idx=None):
@@ -2,13 +2,13 @@ from __future__ import annotations
 
 import streamlit as st
 
-from config import MAX_ATTRIBUTE_VALUE
+from config import MAX_ATTRIBUTE_VALUE, DIALOG_PAGE_SIZE
 from pages.controller import CharacterController, ClassController
 from data.models import AttributeName, Weapon, GripType, WeaponCategory, \
     WeaponRange, ClassName, SpellTarget, Spell, SpellDuration, DamageType, Armor, Shield, Accessory, Item, \
     Skill, LocNamespace, HeroicSkill, Species, ChimeristSpell, Therioform, HeroicSkillName, Dance, Arcanum, Invention, \
     Status, Companion, CompanionAttack, CompanionSkill, CompanionSkillName, SPECIES_STARTING_SKILLS, \
-    PLANT_VULNERABILITY_CHOICES
+    PLANT_VULNERABILITY_CHOICES, thaw
 from .table_writer import SkillTableWriter, HeroicSkillTableWriter, SpellTableWriter, TherioformTableWriter, \
     DanceTableWriter, ArcanumTableWriter, InventionTableWriter
 from .classes_page_actions import add_new_class
@@ -65,15 +65,21 @@ def level_up(controller: CharacterController, loc: LocNamespace):
         selected_skill: Skill = st.session_state.selected_hero_skills[0]
 
         if selected_skill.can_add_spell:
-            class_name = c.COMPENDIUM.get_class_name_from_skill(selected_skill)
-            class_spells = c.COMPENDIUM.spells.get_spells(class_name)
+            class_name = c.get_compendium().get_class_name_from_skill(selected_skill)
+            class_spells = c.get_compendium().spells.get_spells(class_name)
 
             class_spells = [spell for spell in class_spells if
                             spell not in controller.character.get_spells_by_class(class_name)]
             max_n_spells = 1
 
             with st.expander(loc.page_class_select_spells_expander):
-                SpellTableWriter(loc).write_in_columns(class_spells)
+                query = st.text_input(loc.table_search, key="level-up-spell-search")
+                SpellTableWriter(loc).write_in_columns(
+                    class_spells,
+                    page_size=DIALOG_PAGE_SIZE,
+                    search=query,
+                    key="level-up-spells",
+                )
             total_class_spells = len(st.session_state.class_spells)
 
             if total_class_spells != max_n_spells:
@@ -83,7 +89,7 @@ def level_up(controller: CharacterController, loc: LocNamespace):
                 ))
 
     if st.button(loc.confirm_button, disabled=(len(st.session_state.selected_hero_skills) != 1)):
-        selected_class_name = c.COMPENDIUM.get_class_name_from_skill(selected_skill)
+        selected_class_name = c.get_compendium().get_class_name_from_skill(selected_skill)
         new_class = class_controller.char_class if not controller.is_class_added(selected_class_name) else None
         controller.apply_levelup(
             skill=selected_skill,
@@ -109,12 +115,13 @@ def add_spell(controller: CharacterController, class_name: ClassName, loc: LocNa
             if spell in selected_spells:
                 selected_spells.remove(spell)
 
-    class_spells = c.COMPENDIUM.spells.get_spells(class_name)
+    class_spells = c.get_compendium().spells.get_spells(class_name)
     available_spells = [spell for spell in class_spells if spell not in controller.character.get_spells_by_class(class_name)]
 
+    query = st.text_input(loc.table_search, key="add-spell-search")
     writer = SpellTableWriter(loc)
     writer.columns = writer.add_one_spell_columns(single_spell_selector)
-    writer.write_in_columns(available_spells)
+    writer.write_in_columns(available_spells, page_size=DIALOG_PAGE_SIZE, search=query, key="add-spell")
 
     if st.button(loc.add_spell_button, disabled=(len(selected_spells) != 1)):
         controller.add_spell(selected_spells[0], class_name)
@@ -276,9 +283,15 @@ def add_heroic_skill(controller: CharacterController, loc: LocNamespace):
     st.session_state.selected_hero_skills = []
 
     st.write(loc.msg_add_heroic_skill)
+    query = st.text_input(loc.table_search, key="add-heroic-skill-search")
     writer = HeroicSkillTableWriter(loc)
-    sorted_skills = sorted(c.COMPENDIUM.heroic_skills.heroic_skills, key=lambda x: x.localized_name(loc))
-    writer.write_in_columns([skill for skill in sorted_skills if controller.is_heroic_skill_available(skill)])
+    sorted_skills = sorted(c.get_compendium().heroic_skills.heroic_skills, key=lambda x: x.localized_name(loc))
+    writer.write_in_columns(
+        [skill for skill in sorted_skills if controller.is_heroic_skill_available(skill)],
+        page_size=DIALOG_PAGE_SIZE,
+        search=query,
+        key="add-heroic-skill",
+    )
 
     if HeroicSkillName.extra_spells in [skill.name for skill in st.session_state.selected_hero_skills]:
         selected_class_name = st.pills(
@@ -301,13 +314,19 @@ def add_heroic_skill(controller: CharacterController, loc: LocNamespace):
                     if spell in selected_spells:
                         selected_spells.remove(spell)
 
-            class_spells = c.COMPENDIUM.spells.get_spells(selected_class_name)
+            class_spells = c.get_compendium().spells.get_spells(selected_class_name)
             available_spells = [spell for spell in class_spells if
                                 spell not in controller.character.get_spells_by_class(selected_class_name)]
 
+            query = st.text_input(loc.table_search, key="extra-spells-search")
             writer = SpellTableWriter(loc)
             writer.columns = writer.add_one_spell_columns(single_spell_selector)
-            writer.write_in_columns(available_spells)
+            # Both spells have to be on screen at once, so this list is searched but not paged,
+            # and spells that are already ticked stay visible whatever the search
+            writer.write_in_columns(
+                available_spells,
+                search=lambda spell: st.session_state.get(f"{spell.name}-toggle") or writer.matches(spell, query),
+            )
 
             if st.button(loc.confirm_button,
                          key="add-extra-spells-skill",
@@ -401,7 +420,7 @@ def add_therioform(controller: CharacterController, loc: LocNamespace):
             if therioform in selected_therioform:
                 selected_therioform.remove(therioform)
 
-    sorted_therioforms = sorted(c.COMPENDIUM.therioforms, key=lambda x: x.localized_name(loc))
+    sorted_therioforms = sorted(c.get_compendium().therioforms, key=lambda x: x.localized_name(loc))
     available_therioforms = [t for t in sorted_therioforms if t not in controller.character.special.therioforms]
 
     writer = TherioformTableWriter(loc)
@@ -410,7 +429,7 @@ def add_therioform(controller: CharacterController, loc: LocNamespace):
 
     if st.button(loc.add_therioform_button, key="add-new-therioform", disabled=(len(selected_therioform) != 1)):
         therioform = selected_therioform[0]
-        controller.character.special.therioforms.append(therioform)
+        controller.character.special.therioforms.append(thaw(therioform))
         st.rerun()
 
 
@@ -428,7 +447,7 @@ def add_dance(controller: CharacterController, loc: LocNamespace):
             if dance in selected_dance:
                 selected_dance.remove(dance)
 
-    sorted_dances = sorted(c.COMPENDIUM.dances, key=lambda x: x.localized_name(loc))
+    sorted_dances = sorted(c.get_compendium().dances, key=lambda x: x.localized_name(loc))
     available_dances = [t for t in sorted_dances if t not in controller.character.special.dances]
 
     writer = DanceTableWriter(loc)
@@ -437,7 +456,7 @@ def add_dance(controller: CharacterController, loc: LocNamespace):
 
     if st.button(loc.add_spell_button, disabled=(len(selected_dance) != 1)):
         dance = selected_dance[0]
-        controller.character.special.dances.append(dance)
+        controller.character.special.dances.append(thaw(dance))
         st.rerun()
 
 def add_invention(controller: CharacterController, loc: LocNamespace):
@@ -454,7 +473,7 @@ def add_invention(controller: CharacterController, loc: LocNamespace):
             if invention in selected_invention:
                 selected_invention.remove(invention)
 
-    sorted_inventions = sorted(c.COMPENDIUM.inventions, key=lambda x: x.localized_name(loc))
+    sorted_inventions = sorted(c.get_compendium().inventions, key=lambda x: x.localized_name(loc))
     available_inventions = [i for i in sorted_inventions if i not in controller.character.special.inventions]
 
     writer = InventionTableWriter(loc)
@@ -463,7 +482,7 @@ def add_invention(controller: CharacterController, loc: LocNamespace):
 
     if st.button(loc.add_invention_button, disabled=(len(selected_invention) != 1), key="add_invention"):
         invention = selected_invention[0]
-        controller.character.special.inventions.append(invention)
+        controller.character.special.inventions.append(thaw(invention))
         st.rerun()
 
 
@@ -487,7 +506,7 @@ def manifest_therioform(controller: CharacterController, loc: LocNamespace):
     skill = st.pills(
         "therioform selection",
         ["theriomorphosis", "genoclepsis"],
-        format_func=lambda x: getattr(loc, key.format(skill_name=x), x),
+        format_func=lambda x: loc.get(key.format(skill_name=x), x),
         label_visibility="hidden"
     )
     available_therioforms = sorted(
@@ -624,7 +643,7 @@ def add_arcanum(controller: CharacterController, loc: LocNamespace):
             if arcanum in selected_arcanum:
                 selected_arcanum.remove(arcanum)
 
-    sorted_arcana = sorted(c.COMPENDIUM.arcana, key=lambda x: x.localized_name(loc))
+    sorted_arcana = sorted(c.get_compendium().arcana, key=lambda x: x.localized_name(loc))
     available_arcana = [t for t in sorted_arcana if t not in controller.character.special.arcana]
 
     writer = ArcanumTableWriter(loc)
@@ -635,7 +654,7 @@ def add_arcanum(controller: CharacterController, loc: LocNamespace):
                  key="add-selected-arcanum",
                  disabled=(len(selected_arcanum) != 1)):
         arcanum = selected_arcanum[0]
-        controller.character.special.arcana.append(arcanum)
+        controller.character.special.arcana.append(thaw(arcanum))
         st.rerun()
 
 
@@ -652,10 +671,10 @@ def _describe_companion_skill(skill: CompanionSkill, loc: LocNamespace,
             return join_with_and([s.localized_name(loc) for s in skill.statuses], loc)
         case CompanionSkillName.improved_defenses:
             key = f"companion_defense_option_{skill.defense_option}"
-            return getattr(loc, key, skill.defense_option or "")
+            return loc.get(key, skill.defense_option or "")
         case CompanionSkillName.specialized:
             key = f"companion_check_type_{skill.check_type}"
-            base = getattr(loc, key, skill.check_type or "")
+            base = loc.get(key, skill.check_type or "")
             if skill.check_type == "opposed" and skill.check_context:
                 return f"{base} ({skill.check_context})"
             return base
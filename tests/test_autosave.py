@@ -0,0 +1,133 @@
+import json
+import time
+import uuid
+
+import pytest
+
+from data import autosave, storage
+from data.models import CharState, Status
+
+
+@pytest.fixture
+def backend(tmp_path):
+    (tmp_path / "character_images").mkdir()
+    (tmp_path / "states").mkdir()
+    return storage.create_storage("yaml", tmp_path)
+
+
+def make_autosave(backend, tmp_path, **kwargs):
+    kwargs.setdefault("debounce_seconds", 60)
+    return autosave.StateAutosave(backend, tmp_path / "journal", **kwargs)
+
+
+def journal_lines(service, char_id):
+    return [json.loads(line) for line in service.journal_path(char_id).read_text().splitlines()]
+
+
+def test_only_changed_fields_are_journaled(backend, tmp_path):
+    service = make_autosave(backend, tmp_path)
+    char_id = uuid.uuid4()
+    state = CharState()
+
+    assert service.record(char_id, state) is False
+    state.minus_hp = 10
+    assert service.record(char_id, state) is True
+    assert service.record(char_id, state) is False
+    state.statuses.append(Status.slow)
+    state.minus_hp = 12
+    service.record(char_id, state)
+
+    assert journal_lines(service, char_id) == [{"minus_hp": 10}, {"minus_hp": 12, "statuses": ["slow"]}]
+    # Nothing is written to the snapshot before the debounce
+    assert backend.load_state(char_id) is None
+
+
+def test_recover_replays_the_journal_over_the_snapshot(backend, tmp_path):
+    char_id = uuid.uuid4()
+    backend.save_state(char_id, CharState(minus_hp=5, minus_mp=7))
+    service = make_autosave(backend, tmp_path)
+    service.record(char_id, CharState(minus_hp=20, minus_mp=7))
+    service.record(char_id, CharState(minus_hp=25, minus_mp=7, statuses=[Status.weak]))
+
+    # A new process after a crash
+    recovered = make_autosave(backend, tmp_path).recover(char_id)
+
+    assert recovered == CharState(minus_hp=25, minus_mp=7, statuses=[Status.weak])
+    assert make_autosave(backend, tmp_path).recover(uuid.uuid4()) is None
+
+
+def test_torn_last_entry_is_dropped(backend, tmp_path):
+    char_id = uuid.uuid4()
+    service = make_autosave(backend, tmp_path)
+    service.record(char_id, CharState(minus_hp=3))
+    with service.journal_path(char_id).open("a") as journal:
+        journal.write('{"minus_hp": 4')
+
+    restarted = make_autosave(backend, tmp_path)
+    assert restarted.recover(char_id) == CharState(minus_hp=3)
+    restarted.record(char_id, CharState(minus_hp=6))
+
+    assert make_autosave(backend, tmp_path).recover(char_id) == CharState(minus_hp=6)
+
+
+def test_peek_leaves_the_autosave_untouched(backend, tmp_path, monkeypatch):
+    char_id = uuid.uuid4()
+    service = make_autosave(backend, tmp_path)
+    assert service.peek(char_id) is None
+    service.record(char_id, CharState(minus_hp=3))
+    with service.journal_path(char_id).open("a") as journal:
+        journal.write('{"minus_hp": 4')
+    journal = service.journal_path(char_id).read_text()
+
+    # Another page displaying the state, e.g. the party
+    monkeypatch.setattr(autosave, "AUTOSAVE", service)
+    assert service.peek(char_id) == CharState(minus_hp=3)
+    assert autosave.load_state(char_id) == CharState(minus_hp=3)
+    assert service.journal_path(char_id).read_text() == journal
+    assert backend.load_state(char_id) is None
+    # The change journaled since is still seen, not reset to the peeked state
+    assert service.record(char_id, CharState(minus_hp=3)) is False
+
+
+def test_journal_is_compacted_after_the_debounce(backend, tmp_path):
+    service = make_autosave(backend, tmp_path, debounce_seconds=0.05)
+    char_id = uuid.uuid4()
+    for minus_hp in range(1, 4):
+        service.record(char_id, CharState(minus_hp=minus_hp))
+
+    deadline = time.monotonic() + 5
+    while service.journal_path(char_id).exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert not service.journal_path(char_id).exists()
+    assert backend.load_state(char_id) == CharState(minus_hp=3)
+    assert not list((tmp_path / "states").glob(".*.tmp"))
+
+
+def test_full_journal_is_compacted_without_waiting(backend, tmp_path):
+    service = make_autosave(backend, tmp_path, max_entries=3)
+    char_id = uuid.uuid4()
+    for minus_hp in range(1, 4):
+        service.record(char_id, CharState(minus_hp=minus_hp))
+
+    deadline = time.monotonic() + 5
+    while backend.load_state(char_id) is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert backend.load_state(char_id) == CharState(minus_hp=3)
+
+
+def test_controller_saves_and_loads_through_autosave(controller, backend, tmp_path, monkeypatch):
+    service = make_autosave(backend, tmp_path)
+    monkeypatch.setattr(storage, "STORAGE", backend)
+    monkeypatch.setattr(autosave, "AUTOSAVE", service)
+
+    controller.state.minus_mp = 8
+    controller.dump_state()
+    assert backend.load_state(controller.character.id) == CharState(minus_mp=8)
+    assert not service.journal_path(controller.character.id).exists()
+
+    controller.state.minus_hp = 4
+    controller.autosave_state()
+    controller.state = CharState()
+    controller.load_state()
+    assert controller.state == CharState(minus_hp=4, minus_mp=8)
@@ -5,7 +5,7 @@ from data.models.skill import Skill
 def _get_class(name, assets_dir):
     compendium.COMPENDIUM = None
     compendium.init(assets_dir)
-    cls = compendium.COMPENDIUM.classes.get_class(name)
+    cls = compendium.COMPENDIUM.classes.get_class(name).thaw()
     cls.skills = [Skill(**s) if isinstance(s, dict) else s for s in cls.skills]
     return cls
 
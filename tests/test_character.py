@@ -4,6 +4,7 @@ import json
 from data.models import Character, HeroicSkill, HeroicSkillName
 from data.models.character import InvalidCharacterField
 from data import compendium
+from data import localizator
 from data.localizator import init_localizator
 from data.models import LangEnum
 
@@ -22,8 +23,9 @@ def _setup_loc(streamlit_stub, tmp_path):
     ru_dir = tmp_path / 'ru'
     ru_dir.mkdir()
     (ru_dir / 'base.yaml').write_text('{}')
+    localizator.LOCALIZATOR = None
     init_localizator(tmp_path)
-    return streamlit_stub.session_state['localizator'].get(LangEnum.en)
+    return localizator.LOCALIZATOR.get(LangEnum.en)
 
 
 def test_character_field_validations(streamlit_stub, tmp_path):
@@ -52,11 +54,8 @@ def test_character_utility_methods(assets_dir, streamlit_stub, tmp_path):
     compendium.COMPENDIUM = None
     compendium.init(assets_dir)
     c = compendium.COMPENDIUM
-    from data.models.skill import Skill
-    for cls in c.classes.classes:
-        cls.skills = [Skill(**s) if isinstance(s, dict) else s for s in cls.skills]
     char = Character()
-    arcanist = c.classes.get_class('arcanist')
+    arcanist = c.classes.get_class('arcanist').thaw()
     arcanist.skills[0].current_level = 1
     arcanist.skills[1].current_level = 2
     char.classes = [arcanist]
@@ -75,3 +74,73 @@ def test_character_utility_methods(assets_dir, streamlit_stub, tmp_path):
     assert char.has_heroic_skill(HeroicSkillName.deep_pockets)
     char.heroic_skills = []
     assert not char.has_heroic_skill(HeroicSkillName.deep_pockets)
+
+
+def test_lookup_indexes_follow_in_place_mutations():
+    from data.models import CharClass, ClassName, Skill, Spell
+
+    char = Character()
+    rogue = CharClass(name=ClassName.rogue)
+    char.classes.append(rogue)
+    assert char.get_class("rogue") is rogue
+
+    replacement = CharClass(name=ClassName.rogue, bonus_value=3)
+    char.classes[0] = replacement
+    assert char.get_class("rogue") is replacement
+    char.classes.remove(replacement)
+    assert char.get_class("rogue") is None
+    char.classes = [CharClass(name=ClassName.mutant)]
+    assert char.get_class(ClassName.mutant).name == ClassName.mutant
+
+    dodge = Skill(name="dodge", current_level=0)
+    char.classes.append(CharClass(name=ClassName.rogue, skills=[dodge]))
+    assert not char.has_skill("Dodge")
+    # Skill levels are read from the indexed skills, so levelling up needs no rebuild
+    dodge.current_level = 1
+    assert char.has_skill("Dodge")
+    char.classes.pop()
+    assert not char.has_skill("dodge")
+
+    char.heroic_skills.append(HeroicSkill(name=HeroicSkillName.extra_hp))
+    char.heroic_skills.append(HeroicSkill(name=HeroicSkillName.extra_hp))
+    assert char.heroic_skill_count(HeroicSkillName.extra_hp) == 2
+    char.heroic_skills.pop()
+    assert char.heroic_skill_count(HeroicSkillName.extra_hp) == 1
+    assert not char.has_heroic_skill(HeroicSkillName.extra_mp)
+
+    fireball = Spell(name="fireball", mp_cost=10)
+    assert not char.has_spell(ClassName.elementalist, fireball)
+    char.set_spells(ClassName.elementalist, [fireball])
+    assert char.has_spell(ClassName.elementalist, fireball)
+    char.spells[ClassName.elementalist].remove(fireball)
+    assert not char.has_spell(ClassName.elementalist, fireball)
+    # Plain lists assigned straight into the dict are still answered correctly
+    char.spells[ClassName.elementalist] = [fireball]
+    assert char.has_spell(ClassName.elementalist, fireball)
+    assert char.get_spells_by_class("Elementalist") == [fireball]
+
+
+def test_tracked_lists_survive_serialization():
+    from data.models import CharClass, ClassName
+
+    char = Character(classes=[CharClass(name=ClassName.rogue)])
+    restored = Character.model_validate_json(char.model_dump_json())
+    assert restored == char
+    restored.classes.append(CharClass(name=ClassName.mutant))
+    assert restored.get_class("mutant") is not None
+    assert char.get_class("mutant") is None
+    assert type(char.model_dump()["classes"]) is list
+
+
+def test_default_lists_are_tracked():
+    from data.models import CharClass, ClassName
+    from data.models.character import _classes_by_name
+    from data.models.tracked_list import TrackedList, list_index
+
+    char, other = Character(), Character()
+    assert type(char.classes) is TrackedList and type(char.heroic_skills) is TrackedList
+    char.classes.append(CharClass(name=ClassName.rogue))
+    assert other.classes == []
+    # Appends after default construction are served from the cached index
+    index = list_index(char.classes, "by_name", _classes_by_name)
+    assert list_index(char.classes, "by_name", _classes_by_name) is index
@@ -15,9 +15,6 @@ def test_compendium_retrieval_methods(assets_dir):
     compendium.COMPENDIUM = None
     compendium.init(assets_dir)
     c = compendium.COMPENDIUM
-    from data.models.skill import Skill
-    for cls in c.classes.classes:
-        cls.skills = [Skill(**s) if isinstance(s, dict) else s for s in cls.skills]
     arcanist = c.classes.get_class('arcanist')
     assert arcanist is not None and arcanist.name == 'arcanist'
     assert c.classes.get_class('unknown') is None
@@ -29,3 +26,182 @@ def test_compendium_retrieval_methods(assets_dir):
     assert c.heroic_skills.get_skill('unknown') is None
     skill = arcanist.skills[0]
     assert c.get_class_name_from_skill(skill) == 'arcanist'
+
+
+def test_compendium_lookups_hand_out_frozen_entries(assets_dir):
+    import pytest
+    from pydantic import ValidationError
+    from data.models import CharClass, Spell, is_frozen
+
+    compendium.COMPENDIUM = None
+    compendium.init(assets_dir)
+    c = compendium.COMPENDIUM
+    elementalist = c.classes.get_class('Elementalist')
+    assert elementalist is c.classes.get_class('elementalist')
+    assert isinstance(elementalist, CharClass) and is_frozen(elementalist)
+    with pytest.raises(ValidationError):
+        elementalist.skills[0].current_level = 1
+    with pytest.raises(TypeError):
+        elementalist.skills.append(elementalist.skills[0])
+    spells = c.spells.get_spells('elementalist')
+    assert spells is c.spells.get_spells('elementalist')
+    with pytest.raises(ValidationError):
+        spells[0].mp_cost = 99
+    with pytest.raises(TypeError):
+        spells.clear()
+
+    thawed = elementalist.thaw()
+    assert type(thawed) is CharClass and thawed == elementalist and elementalist == thawed
+    thawed.levelup_skill('cataclysm')
+    assert thawed.get_skill_level('cataclysm') == 1
+    assert c.classes.get_class('elementalist').get_skill_level('cataclysm') == 0
+    spell = spells[0].thaw()
+    spell.mp_cost = 99
+    assert type(spell) is Spell and spells[0].mp_cost == 5
+    assert spells[0] in [spells[0].thaw()] and spells[0].thaw() in spells
+
+
+def test_frozen_dict_and_set_fields():
+    import pickle
+    import pytest
+    from pydantic import BaseModel
+    from data.models import Character, ClassName, Spell, freeze, thaw
+
+    character = Character(spells={ClassName.elementalist: [Spell(name='fireball', mp_cost=10)]})
+    frozen = freeze(character)
+    with pytest.raises(TypeError):
+        frozen.spells[ClassName.entropist] = []
+    with pytest.raises(TypeError):
+        frozen.spells[ClassName.elementalist].clear()
+    assert hash(frozen) == hash(freeze(character.model_copy(deep=True)))
+    assert frozen == character and frozen.model_dump() == character.model_dump()
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+    thawed = thaw(frozen)
+    thawed.spells[ClassName.entropist] = []
+    assert ClassName.entropist not in frozen.spells
+
+    class Tagged(BaseModel):
+        tags: set[str] = set()
+
+    tagged = freeze(Tagged(tags={'fire'}))
+    with pytest.raises(TypeError):
+        tagged.tags.add('ice')
+    assert tagged.model_dump() == {'tags': {'fire'}}
+    assert hash(tagged) == hash(freeze(Tagged(tags={'fire'})))
+    assert thaw(tagged).tags == {'fire'} and type(thaw(tagged).tags) is set
+
+
+def test_frozen_entries_survive_pickling(assets_dir):
+    import pickle
+    from data.models import is_frozen
+
+    loaded = compendium.load_from_yaml(assets_dir, loader="serial")
+    restored = pickle.loads(pickle.dumps(loaded))
+    assert restored == loaded
+    assert is_frozen(restored.classes.get_class('arcanist'))
+
+
+def test_compendium_class_name_from_skill_uses_reverse_index(assets_dir):
+    compendium.COMPENDIUM = None
+    compendium.init(assets_dir)
+    from data.models.skill import Skill
+    c = compendium.COMPENDIUM
+    assert c.get_class_name_from_skill(Skill(name='elemental_magic')) == 'elementalist'
+    assert c.get_class_name_from_skill(Skill(name='unknown')) is None
+
+
+def test_pooled_loading_matches_serial_loading(assets_dir):
+    serial = compendium.load_from_yaml(assets_dir, loader="serial")
+    assert compendium.load_from_yaml(assets_dir, loader="thread", workers=4) == serial
+    assert compendium.load_from_yaml(assets_dir, loader="process", workers=2) == serial
+    assert [c.name for c in serial.classes.classes] == sorted(c.name for c in serial.classes.classes)
+
+
+def test_asset_errors_are_reported_per_file(assets_dir):
+    import pytest
+
+    (assets_dir / 'classes' / 'broken.yaml').write_text('name: [unclosed', encoding='utf8')
+    (assets_dir / 'spells' / 'invalid.yaml').write_text('- name: bolt\n  mp_cost: many\n', encoding='utf8')
+
+    for loader in ("serial", "thread", "process"):
+        with pytest.raises(compendium.AssetLoadError) as error:
+            compendium.load_from_yaml(assets_dir, loader=loader)
+        assert sorted(path.name for path in error.value.errors) == ['broken.yaml', 'invalid.yaml']
+
+    with pytest.raises(ValueError):
+        compendium.load_from_yaml(assets_dir, loader="gpu")
+
+
+def _touch(path, content):
+    import os
+
+    stat = path.stat()
+    path.write_text(content, encoding='utf8')
+    # Make sure the edit is seen even on filesystems with coarse timestamps
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_reload_reparses_only_changed_files(assets_dir, monkeypatch):
+    import json
+
+    compendium.COMPENDIUM = compendium.load_from_yaml(assets_dir, loader="serial")
+    before = compendium.COMPENDIUM
+    parsed = []
+    get_assets_from_file = compendium.get_assets_from_file
+    monkeypatch.setattr(
+        compendium, "get_assets_from_file",
+        lambda path, asset_class: parsed.append(path.name) or get_assets_from_file(path, asset_class),
+    )
+
+    _touch(assets_dir / 'spells' / 'elementalist.yaml', json.dumps([
+        {"name": "aura", "is_offensive": False, "mp_cost": 10, "target": "one_creature", "duration": "scene"}
+    ]))
+    (assets_dir / 'classes' / 'dark_blade.yaml').write_text(json.dumps({"name": "dark_blade", "skills": []}))
+    reparsed = compendium.reload(assets_dir)
+
+    assert sorted(parsed) == ['dark_blade.yaml', 'elementalist.yaml']
+    assert sorted(path.name for path in reparsed) == ['dark_blade.yaml', 'elementalist.yaml']
+    assert compendium.COMPENDIUM is not before
+    assert compendium.COMPENDIUM.spells.get_spells('elementalist')[0].mp_cost == 10
+    assert compendium.COMPENDIUM.classes.get_class('dark_blade') is not None
+    assert before.spells.get_spells('elementalist')[0].mp_cost == 5
+
+    parsed.clear()
+    compendium.reload(assets_dir)
+    assert parsed == []
+
+
+def test_failed_reload_keeps_the_current_compendium(assets_dir):
+    import pytest
+
+    compendium.COMPENDIUM = compendium.load_from_yaml(assets_dir, loader="serial")
+    before = compendium.COMPENDIUM
+    _touch(assets_dir / 'spells' / 'elementalist.yaml', '- name: bolt\n  mp_cost: many\n')
+    with pytest.raises(compendium.AssetLoadError):
+        compendium.reload(assets_dir)
+    assert compendium.COMPENDIUM is before
+
+    _touch(assets_dir / 'spells' / 'elementalist.yaml', '[]')
+    assert [path.name for path in compendium.reload(assets_dir)] == ['elementalist.yaml']
+    assert compendium.COMPENDIUM.spells.get_spells('elementalist') == []
+
+
+def test_pinned_compendium_survives_a_reload(assets_dir):
+    import threading
+
+    compendium.COMPENDIUM = compendium.load_from_yaml(assets_dir, loader="serial")
+    pinned = compendium.pin()
+    _touch(assets_dir / 'equipment' / 'armors.yaml', '[]')
+    threading.Thread(target=compendium.reload, args=(assets_dir,)).start()
+    try:
+        import time
+        deadline = time.monotonic() + 5
+        while compendium.COMPENDIUM is pinned and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert compendium.COMPENDIUM is not pinned
+        assert compendium.get_compendium() is pinned
+        assert compendium.pin() is compendium.COMPENDIUM
+        assert compendium.get_compendium() is compendium.COMPENDIUM
+    finally:
+        compendium._pinned.__dict__.clear()
@@ -0,0 +1,156 @@
+import math
+import random
+
+import pytest
+
+from data.models import (
+    Accessory,
+    Armor,
+    AttributeName,
+    CharClass,
+    ClassName,
+    HeroicSkill,
+    HeroicSkillName,
+    LocNamespace,
+    Shield,
+    Skill,
+    Status,
+    Therioform,
+    Weapon,
+)
+from pages.derived_stats import DerivedStats
+
+
+def _expected(controller) -> DerivedStats:
+    return DerivedStats(
+        max_hp=controller.max_hp(),
+        max_mp=controller.max_mp(),
+        max_ip=controller.max_ip(),
+        current_hp=controller.current_hp(),
+        current_mp=controller.current_mp(),
+        current_ip=controller.current_ip(),
+        defense=controller.defense(),
+        magic_defense=controller.magic_defense(),
+        initiative=controller.initiative(),
+        crisis_value=controller.crisis_value(),
+    )
+
+
+def _random_class(rng: random.Random) -> CharClass:
+    name = rng.choice([ClassName.rogue, ClassName.mutant, ClassName.elementalist, ClassName.arcanist])
+    skill_name = {ClassName.rogue: "dodge", ClassName.mutant: "theriomorphosis"}.get(name, "other")
+    return CharClass(
+        name=name,
+        class_bonus=rng.choice(["hp", "mp", "ip"]),
+        bonus_value=rng.randint(0, 5),
+        skills=[Skill(name=skill_name, current_level=rng.randint(0, 5), max_level=10)],
+    )
+
+
+def _random_item(rng: random.Random, item_type):
+    kwargs = dict(
+        name=f"item_{rng.randint(0, 3)}",
+        bonus_defense=rng.randint(-1, 2),
+        bonus_magic_defense=rng.randint(-1, 2),
+        bonus_initiative=rng.randint(-2, 2),
+    )
+    if item_type is Armor:
+        kwargs["defense"] = rng.choice([AttributeName.dexterity, rng.randint(9, 13)])
+    return item_type(**kwargs)
+
+
+def _mutate(controller, rng: random.Random):
+    character = controller.character
+    equipped = character.inventory.equipped
+    match rng.randrange(10):
+        case 0:
+            character.level = rng.randint(5, 60)
+        case 1:
+            attribute = rng.choice([character.dexterity, character.might, character.insight, character.willpower])
+            attribute.base = rng.choice([6, 8, 10, 12])
+        case 2:
+            controller.state.statuses = rng.sample(list(Status), rng.randint(0, 3))
+            controller.apply_status()
+        case 3:
+            character.classes.append(_random_class(rng))
+        case 4:
+            if character.classes:
+                rng.choice(character.classes).skills[0].current_level = rng.randint(0, 10)
+        case 5:
+            character.heroic_skills.append(HeroicSkill(name=rng.choice(
+                [HeroicSkillName.extra_hp, HeroicSkillName.extra_mp, HeroicSkillName.extra_ip, HeroicSkillName.comet]
+            )))
+        case 6:
+            slot, item_type = rng.choice(
+                [("main_hand", Weapon), ("off_hand", Shield), ("armor", Armor), ("accessory", Accessory)]
+            )
+            setattr(equipped, slot, _random_item(rng, item_type) if rng.random() < 0.8 else None)
+        case 7:
+            if equipped.armor is not None:
+                equipped.armor.bonus_defense += 1
+        case 8:
+            # Placophora can only be manifested by a mutant
+            has_mutant = any(c.name == ClassName.mutant for c in character.classes)
+            controller.state.active_therioforms = (
+                [Therioform(name="placophora")] if has_mutant and rng.random() < 0.5 else []
+            )
+        case 9:
+            controller.state.minus_hp = rng.randint(0, 40)
+            controller.state.minus_mp = rng.randint(0, 40)
+            controller.state.minus_ip = rng.randint(0, 6)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_cached_stats_match_formulas_for_random_characters(controller, seed):
+    rng = random.Random(seed)
+    for _ in range(60):
+        _mutate(controller, rng)
+        assert controller.derived_stats() == _expected(controller)
+
+
+def test_unchanged_inputs_are_not_recomputed(controller):
+    controller.derived_stats()
+    first_counts = dict(controller.stats_engine.recomputed)
+    for _ in range(5):
+        controller.derived_stats()
+    assert dict(controller.stats_engine.recomputed) == first_counts
+
+
+def test_only_dependent_stats_are_recomputed(controller):
+    controller.derived_stats()
+    engine = controller.stats_engine
+    engine.recomputed.clear()
+
+    controller.character.inventory.equipped.accessory = Accessory(name="ring", bonus_magic_defense=2)
+    stats = controller.derived_stats()
+    assert set(engine.recomputed) == {"defense", "magic_defense", "initiative"}
+    assert stats.magic_defense == controller.character.insight.current + 2
+
+    engine.recomputed.clear()
+    controller.state.minus_hp = 5
+    stats = controller.derived_stats()
+    assert not engine.recomputed
+    assert stats.current_hp == stats.max_hp - 5
+
+    engine.recomputed.clear()
+    controller.character.level = 20
+    controller.derived_stats()
+    assert set(engine.recomputed) == {"max_hp", "max_mp"}
+
+
+def test_new_language_recomputes_initiative(controller):
+    controller.loc = LocNamespace(root={"dice_prefix": "d"})
+    assert controller.derived_stats().initiative.startswith("d")
+
+    # Whether or not the new namespace happens to reuse the freed one's id
+    controller.loc = None
+    controller.loc = LocNamespace(root={"dice_prefix": "к"})
+    assert controller.derived_stats().initiative.startswith("к")
+
+
+def test_in_crisis_matches_crisis_value(controller):
+    stats = controller.derived_stats()
+    controller.state.minus_hp = stats.max_hp - math.floor(stats.max_hp / 2)
+    assert controller.derived_stats().in_crisis
+    controller.state.minus_hp = 0
+    assert not controller.derived_stats().in_crisis
@@ -1,8 +1,8 @@
 import types
 
 import pytest
-import yaml
 
+from data import storage
 from data.models import Character
 
 
@@ -14,27 +14,23 @@ def isolated_save_directories(monkeypatch, tmp_path):
     chars_dir.mkdir(parents=True)
     img_dir.mkdir(parents=True)
     states_dir.mkdir(parents=True)
-    monkeypatch.setattr("pages.controller.SAVED_CHARS_DIRECTORY", chars_dir)
-    monkeypatch.setattr("pages.controller.SAVED_CHARS_IMG_DIRECTORY", img_dir)
-    monkeypatch.setattr("pages.controller.SAVED_STATES_DIRECTORY", states_dir)
+    monkeypatch.setattr(storage, "STORAGE", storage.YamlStorage(chars_dir, img_dir, states_dir))
     return types.SimpleNamespace(chars=chars_dir, images=img_dir, states=states_dir)
 
 
 def test_dump_character_writes_expected_file(controller, isolated_save_directories):
     controller.character.name = "Alice"
     controller.dump_character()
-    expected = isolated_save_directories.chars / f"Alice.{controller.character.id}.character.yaml"
+    expected = isolated_save_directories.chars / f"Alice.{controller.character.id}.character.json"
     assert expected.exists()
 
 
-def test_dump_character_round_trips_via_yaml(controller, isolated_save_directories):
+def test_dump_character_round_trips_via_json(controller, isolated_save_directories):
     controller.character.name = "Bob"
     controller.character.level = 12
     controller.dump_character()
-    saved_path = isolated_save_directories.chars / f"Bob.{controller.character.id}.character.yaml"
-    with saved_path.open(encoding="utf-8") as f:
-        raw = yaml.load(f, Loader=yaml.UnsafeLoader)
-    reloaded = Character(**raw)
+    saved_path = isolated_save_directories.chars / f"Bob.{controller.character.id}.character.json"
+    reloaded = Character.model_validate_json(saved_path.read_bytes())
     assert reloaded.name == "Bob"
     assert reloaded.level == 12
     assert reloaded.id == controller.character.id
@@ -45,15 +41,15 @@ def test_dump_character_removes_stale_files_for_same_id(controller, isolated_sav
     controller.dump_character()
     controller.character.name = "New Name"
     controller.dump_character()
-    matches = list(isolated_save_directories.chars.glob(f"*.{controller.character.id}.character.yaml"))
+    matches = list(isolated_save_directories.chars.glob(f"*.{controller.character.id}.character.json"))
     assert len(matches) == 1
-    assert matches[0].name == f"New Name.{controller.character.id}.character.yaml"
+    assert matches[0].name == f"New Name.{controller.character.id}.character.json"
 
 
 def test_dump_state_writes_expected_file(controller, isolated_save_directories):
     controller.state.minus_hp = 7
     controller.dump_state()
-    expected = isolated_save_directories.states / f"{controller.character.id}.yaml"
+    expected = isolated_save_directories.states / f"{controller.character.id}.json"
     assert expected.exists()
 
 
@@ -97,3 +93,17 @@ def test_dump_avatar_removes_stale_images_for_same_id(controller, isolated_save_
     matches = list(isolated_save_directories.images.glob(f"*{controller.character.id}.*"))
     assert len(matches) == 1
     assert matches[0].suffix == ".jpg"
+
+
+def test_dump_character_updates_saved_characters_index(controller, isolated_save_directories, monkeypatch):
+    from data import saved_characters
+
+    monkeypatch.setattr(saved_characters, "SAVED_CHARS", None)
+    saved_characters.init(storage.STORAGE)
+    controller.character.name = "Carol"
+    controller.character.level = 3
+    controller.dump_character()
+
+    entry, = saved_characters.SAVED_CHARS.char_list
+    assert (entry.id, entry.name, entry.level) == (controller.character.id, "Carol", 3)
+    assert saved_characters.SAVED_CHARS.load(entry.id).name == "Carol"
@@ -8,6 +8,21 @@ def test_add_spell_appends_and_dedups(controller):
     assert controller.character.spells[ClassName.elementalist] == [spell]
 
 
+def test_added_compendium_entries_are_thawed(controller):
+    from data.models import freeze, is_frozen
+
+    spell = freeze(Spell(name="fireball", mp_cost=10))
+    controller.add_spell(spell, ClassName.elementalist)
+    added = controller.character.spells[ClassName.elementalist][0]
+    assert added == spell and not is_frozen(added)
+    added.mp_cost = 20
+    assert spell.mp_cost == 10
+
+    skill = freeze(HeroicSkill(name=HeroicSkillName.extra_hp))
+    controller.add_heroic_skill(skill)
+    assert not is_frozen(controller.character.heroic_skills[0])
+
+
 def test_remove_spell_removes_if_present(controller):
     spell = Spell(name="fireball", mp_cost=10)
     controller.add_spell(spell, ClassName.elementalist)
@@ -0,0 +1,69 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from data import compendium, hot_reload, localizator
+
+
+class FakeEvent:
+    def __init__(self, src_path, event_type="modified", is_directory=False):
+        self.src_path = str(src_path)
+        self.event_type = event_type
+        self.is_directory = is_directory
+
+
+def test_watcher_reloads_only_what_changed(tmp_path, monkeypatch):
+    locals_directory = tmp_path / 'locals'
+    reloads = []
+    monkeypatch.setattr(compendium, "reload", lambda directory: reloads.append(("compendium", directory)))
+    monkeypatch.setattr(localizator, "reload_localizator", lambda directory: reloads.append(("locals", directory)))
+    watcher = hot_reload.AssetWatcher(tmp_path, locals_directory, debounce_seconds=60)
+
+    watcher.on_any_event(FakeEvent(tmp_path / 'images' / 'avatar.png'))
+    watcher.on_any_event(FakeEvent(tmp_path / 'spells', is_directory=True))
+    watcher.reload()
+    assert reloads == []
+
+    watcher.on_any_event(FakeEvent(locals_directory / 'en' / 'base.yaml'))
+    watcher.on_any_event(FakeEvent(locals_directory / 'ru' / 'base.yaml'))
+    watcher.reload()
+    assert reloads == [("locals", locals_directory)]
+
+    reloads.clear()
+    watcher.on_any_event(FakeEvent(tmp_path / 'spells' / 'elementalist.yaml'))
+    watcher.reload()
+    assert reloads == [("compendium", tmp_path)]
+
+
+def test_watcher_keeps_running_when_a_reload_fails(tmp_path, monkeypatch):
+    observers = pytest.importorskip("watchdog.observers")
+    spell_file = tmp_path / 'spells' / 'x.yaml'
+    spell_file.parent.mkdir()
+    spell_file.write_text('[]')
+    failed, swapped = threading.Event(), threading.Event()
+
+    def reload(directory):
+        if spell_file.read_text() == 'broken':
+            failed.set()
+            raise compendium.AssetLoadError({spell_file: ValueError("bad")})
+        monkeypatch.setattr(compendium, "COMPENDIUM", "reloaded")
+        swapped.set()
+
+    monkeypatch.setattr(compendium, "reload", reload)
+    watcher = hot_reload.AssetWatcher(tmp_path, tmp_path / 'locals', debounce_seconds=0.05)
+    observer = observers.Observer()
+    observer.schedule(watcher, str(tmp_path), recursive=True)
+    observer.start()
+    try:
+        spell_file.write_text('broken')
+        assert failed.wait(timeout=5)
+        assert not swapped.is_set()
+
+        spell_file.write_text('[]')
+        assert swapped.wait(timeout=5)
+        assert compendium.COMPENDIUM == "reloaded"
+        assert observer.is_alive()
+    finally:
+        observer.stop()
+        observer.join()
@@ -0,0 +1,99 @@
+import pstats
+
+import pytest
+
+import instrumentation
+
+
+@pytest.fixture
+def enabled(tmp_path):
+    instrumentation.init(True, history_size=3, profile_directory=tmp_path)
+    instrumentation.RERUNS.clear()
+    yield tmp_path
+    instrumentation.init(False)
+    instrumentation.RERUNS.clear()
+
+
+class Writer:
+    @instrumentation.timed_method
+    def write(self, depth=0):
+        if depth:
+            self.write(depth - 1)
+
+
+class SubWriter(Writer):
+    pass
+
+
+def test_disabled_records_nothing():
+    instrumentation.init(False)
+    instrumentation.RERUNS.clear()
+
+    with instrumentation.rerun("main") as timing:
+        with instrumentation.span("init"):
+            Writer().write()
+
+    assert timing is None
+    assert instrumentation.recent_reruns() == []
+
+
+def test_spans_are_collected_per_rerun(enabled):
+    @instrumentation.timed()
+    def max_hp():
+        return 40
+
+    with instrumentation.rerun("main"):
+        with instrumentation.span("init"):
+            pass
+        assert max_hp() == 40
+        max_hp()
+        SubWriter().write(depth=2)
+
+    (timing,) = instrumentation.recent_reruns()
+    assert timing.label == "main"
+    assert timing.spans["init"].calls == 1
+    assert timing.spans[max_hp.__qualname__].calls == 2
+    # Recursive calls are counted once, under the subclass name
+    assert timing.spans["SubWriter.write"].calls == 1
+    assert timing.total_ms >= timing.spans["SubWriter.write"].total_ms
+
+
+def test_span_outside_rerun_records_its_own(enabled):
+    with instrumentation.span("view.spells_tab"):
+        pass
+
+    (timing,) = instrumentation.recent_reruns()
+    assert timing.label == "view.spells_tab"
+    assert list(timing.spans) == ["view.spells_tab"]
+
+
+def test_history_is_a_ring_buffer(enabled):
+    for i in range(5):
+        with instrumentation.rerun(f"rerun {i}"):
+            pass
+
+    assert [timing.label for timing in instrumentation.recent_reruns()] == ["rerun 2", "rerun 3", "rerun 4"]
+
+
+def test_rerun_is_recorded_when_it_raises(enabled):
+    with pytest.raises(RuntimeError):
+        with instrumentation.rerun("main"):
+            raise RuntimeError
+
+    assert [timing.label for timing in instrumentation.recent_reruns()] == ["main"]
+
+
+def test_requested_profile_covers_one_rerun(enabled):
+    instrumentation.request_profile()
+    assert instrumentation.profile_pending()
+
+    with instrumentation.rerun("profiled"):
+        sorted(range(100))
+    with instrumentation.rerun("plain"):
+        pass
+
+    profiled, plain = instrumentation.recent_reruns()
+    assert not instrumentation.profile_pending()
+    assert plain.profile_path is None
+    assert profiled.profile_path.parent == enabled
+    assert pstats.Stats(str(profiled.profile_path)).total_calls > 0
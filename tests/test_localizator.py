@@ -1,6 +1,7 @@
 from pathlib import Path
 import pytest
 
+from data import localizator
 from data.localizator import init_localizator
 from data.models import LangEnum
 
@@ -12,10 +13,10 @@ def test_init_localizator_loads_translations(streamlit_stub, tmp_path):
     ru_dir.mkdir()
     (en_dir / 'base.yaml').write_text('{"error_name_empty": "Name should not be empty.", "bond_explanation": "About Bonds"}', encoding='utf-8')
     (ru_dir / 'base.yaml').write_text('{"error_name_empty": "Имя не должно быть пустым."}', encoding='utf-8')
+    localizator.LOCALIZATOR = None
     init_localizator(tmp_path)
-    localizator = streamlit_stub.session_state['localizator']
-    en = localizator.get(LangEnum.en)
-    ru = localizator.get(LangEnum.ru)
+    en = localizator.LOCALIZATOR.get(LangEnum.en)
+    ru = localizator.LOCALIZATOR.get(LangEnum.ru)
     assert en.error_name_empty == "Name should not be empty."
     assert ru.error_name_empty == "Имя не должно быть пустым."
     assert ru.bond_explanation == en.bond_explanation
@@ -29,5 +30,151 @@ def test_init_localizator_duplicate_keys(tmp_path, streamlit_stub):
     (en_dir / 'a.yaml').write_text('{"key1": "value1"}')
     (en_dir / 'b.yaml').write_text('{"key1": "value2"}')
     (ru_dir / 'a.yaml').write_text('{"key1": "value1"}')
+    localizator.LOCALIZATOR = None
     with pytest.raises(ValueError):
         init_localizator(tmp_path)
+
+
+def test_init_localizator_is_shared_across_sessions(streamlit_stub, tmp_path):
+    (tmp_path / 'en').mkdir()
+    (tmp_path / 'ru').mkdir()
+    (tmp_path / 'en' / 'base.yaml').write_text('{"hp": "HP"}')
+    localizator.LOCALIZATOR = None
+    init_localizator(tmp_path)
+    shared = localizator.LOCALIZATOR
+    streamlit_stub.session_state.clear()
+    init_localizator(tmp_path)
+    assert localizator.LOCALIZATOR is shared
+    assert 'localizator' not in streamlit_stub.session_state
+    streamlit_stub.session_state.language = LangEnum.ru
+    assert localizator.get_loc() is shared.get(LangEnum.ru)
+    assert localizator.get_loc().hp == "HP"
+
+
+def test_localizator_loads_other_languages_on_demand(tmp_path):
+    (tmp_path / 'en').mkdir()
+    (tmp_path / 'ru').mkdir()
+    (tmp_path / 'en' / 'base.yaml').write_text('{"hp": "HP", "mp": "MP"}')
+    (tmp_path / 'ru' / 'base.yaml').write_text('{"hp": "ОЗ"}', encoding='utf-8')
+    loc = localizator.Localizator(tmp_path)
+    assert loc.loaded_languages() == [LangEnum.en]
+    assert LangEnum.ru not in loc.load_times
+    ru = loc.get(LangEnum.ru)
+    assert ru.hp == "ОЗ" and ru.mp == "MP"
+    assert loc.loaded_languages() == [LangEnum.en, LangEnum.ru]
+    assert loc.load_times[LangEnum.ru] >= 0
+    assert loc.get(LangEnum.ru) is ru
+
+
+def test_localizator_cache_is_bounded(tmp_path):
+    (tmp_path / 'en').mkdir()
+    (tmp_path / 'ru').mkdir()
+    (tmp_path / 'en' / 'base.yaml').write_text('{"hp": "HP"}')
+    loc = localizator.Localizator(tmp_path, max_cached_languages=1)
+    assert loc.get(LangEnum.ru).hp == "HP"
+    assert loc.loaded_languages() == [LangEnum.en]
+
+
+def test_evicted_language_files_are_not_kept(tmp_path):
+    (tmp_path / 'en').mkdir()
+    (tmp_path / 'ru').mkdir()
+    (tmp_path / 'en' / 'base.yaml').write_text('{"hp": "HP"}')
+    (tmp_path / 'ru' / 'base.yaml').write_text('{"hp": "ОЗ"}', encoding='utf-8')
+
+    localizator.Localizator(tmp_path).get(LangEnum.ru)
+    assert (tmp_path / 'ru' / 'base.yaml').resolve() in localizator._parsed_files
+    # With room for English only, Russian leaves the cache as soon as it is loaded
+    localizator.Localizator(tmp_path, max_cached_languages=1).get(LangEnum.ru)
+    assert (tmp_path / 'ru' / 'base.yaml').resolve() not in localizator._parsed_files
+    assert (tmp_path / 'en' / 'base.yaml').resolve() in localizator._parsed_files
+
+
+def test_loc_namespace_lookups_and_misses():
+    from data.models import LocNamespace
+    loc = LocNamespace(root={"hp": "HP", "class_info": "Class {class_name} at level {level}"})
+    assert loc.hp == "HP"
+    assert loc["hp"] == "HP"
+    assert loc.get("missing", "fallback") == "fallback"
+    assert loc.get("missing") is None
+    assert getattr(loc, "missing", "fallback") == "fallback"
+    assert not hasattr(loc, "missing")
+    with pytest.raises(AttributeError):
+        loc.missing
+
+
+@pytest.mark.parametrize("template, args, kwargs", [
+    ("Class {class_name} at level {level}", (), {"class_name": "Rogue", "level": 3}),
+    ("{name} {name}!", (), {"name": "Ann", "unused": 1}),
+    ("{{literal}} {value:>5} {value!r}", (), {"value": "x"}),
+    ("quote ' and \\ backslash {v}", (), {"v": 1}),
+    ("Positional {} and {}", ("a", "b"), {}),
+    ("Indexed {0[0]}", (["z"],), {}),
+])
+def test_loc_templates_match_str_format(template, args, kwargs):
+    from data.models import LocNamespace
+    loc = LocNamespace(root={"key": template})
+    assert loc.key == template
+    assert loc.key.format(*args, **kwargs) == template.format(*args, **kwargs)
+
+
+def test_loc_template_missing_placeholder_raises_key_error():
+    from data.models import LocNamespace
+    loc = LocNamespace(root={"key": "Hello {name}"})
+    with pytest.raises(KeyError):
+        loc.key.format(other="x")
+
+
+def test_reload_localizator_swaps_in_changed_translations(tmp_path, monkeypatch):
+    import os
+
+    (tmp_path / 'en').mkdir()
+    (tmp_path / 'ru').mkdir()
+    (tmp_path / 'en' / 'base.yaml').write_text('{"hp": "HP"}')
+    (tmp_path / 'en' / 'more.yaml').write_text('{"mp": "MP"}')
+    localizator.LOCALIZATOR = None
+    init_localizator(tmp_path)
+    before = localizator.LOCALIZATOR
+    before.get(LangEnum.ru)
+
+    stat = (tmp_path / 'en' / 'base.yaml').stat()
+    (tmp_path / 'en' / 'base.yaml').write_text('{"hp": "Hit Points"}')
+    os.utime(tmp_path / 'en' / 'base.yaml', ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    loaded = []
+    load = localizator.yaml_io.load
+    monkeypatch.setattr(localizator.yaml_io, "load", lambda stream: loaded.append(stream.name) or load(stream))
+    localizator.reload_localizator(tmp_path)
+
+    assert [Path(name).name for name in loaded] == ['base.yaml']
+    assert localizator.LOCALIZATOR is not before
+    assert localizator.LOCALIZATOR.get(LangEnum.en).hp == "Hit Points"
+    assert localizator.LOCALIZATOR.loaded_languages() == [LangEnum.en, LangEnum.ru]
+    assert before.get(LangEnum.en).hp == "HP"
+
+    (tmp_path / 'en' / 'more.yaml').write_text('{"hp": "duplicate"}')
+    with pytest.raises(ValueError):
+        localizator.reload_localizator(tmp_path)
+    assert localizator.LOCALIZATOR.get(LangEnum.en).hp == "Hit Points"
+
+
+def test_pinned_localizator_survives_a_reload(tmp_path):
+    import os
+
+    (tmp_path / 'en').mkdir()
+    (tmp_path / 'en' / 'base.yaml').write_text('{"hp": "HP"}')
+    localizator.LOCALIZATOR = None
+    init_localizator(tmp_path)
+    pinned = localizator.pin()
+    try:
+        stat = (tmp_path / 'en' / 'base.yaml').stat()
+        (tmp_path / 'en' / 'base.yaml').write_text('{"hp": "Hit Points"}')
+        os.utime(tmp_path / 'en' / 'base.yaml', ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        localizator.reload_localizator(tmp_path)
+        assert localizator.LOCALIZATOR is not pinned
+        assert localizator.get_localizator() is pinned
+        assert localizator.get_loc().hp == "HP"
+
+        # The next rerun pins the reloaded translations
+        assert localizator.pin() is localizator.LOCALIZATOR
+        assert localizator.get_loc().hp == "Hit Points"
+    finally:
+        localizator._pinned.__dict__.clear()
@@ -0,0 +1,83 @@
+import dataclasses
+import random
+
+from data.models import AttributeName, CharState, LocNamespace, Status, Therioform
+from pages.controller import CharacterController
+from pages.party_stats import party_stats
+from test_controller_derived_stats import _mutate
+
+
+def _random_party(size: int, seed: int) -> list[CharacterController]:
+    rng = random.Random(seed)
+    party = []
+    for i in range(size):
+        controller = CharacterController(LocNamespace(root={"dice_prefix": "d"}))
+        controller.character.name = f"member {i}"
+        for _ in range(rng.randint(0, 40)):
+            _mutate(controller, rng)
+        controller.state.improved_attributes = rng.sample(list(AttributeName), rng.randint(0, 2))
+        controller.state.active_therioforms = controller.state.active_therioforms + [
+            Therioform(name=name) for name in rng.sample(["arpaktida", "dynamotheria", "tachytheria"], rng.randint(0, 2))
+        ]
+        controller.apply_status()
+        party.append(controller)
+    return party
+
+
+def test_party_stats_match_each_controller():
+    for seed in range(10):
+        party = _random_party(8, seed)
+        stats = party_stats([(controller.character, controller.state) for controller in party])
+        assert list(stats["name"]) == [controller.character.name for controller in party]
+        for row, controller in zip(stats.to_dict("records"), party):
+            expected = dataclasses.asdict(controller.derived_stats())
+            assert {key: row[key] for key in expected} == expected
+
+
+def test_party_stats_use_statuses_of_the_state_not_stale_attributes(controller):
+    controller.character.dexterity.base = controller.character.dexterity.current = 10
+    state = CharState(statuses=[Status.slow, Status.enraged])
+    stats = party_stats([(controller.character, state)], dice_prefix="W")
+    assert stats["defense"][0] == 6
+    assert stats["initiative"][0] == "W6 + W6"
+
+
+def test_empty_party():
+    stats = party_stats([])
+    assert stats.empty and "current_hp" in stats.columns
+
+
+def test_party_members_are_reread_when_saved(tmp_path, monkeypatch):
+    import time
+
+    from data import autosave, storage
+    from data import saved_characters
+    from data.models import Character
+    from pages.party import party
+
+    (tmp_path / "character_images").mkdir()
+    (tmp_path / "states").mkdir()
+    backend = storage.create_storage("yaml", tmp_path)
+    monkeypatch.setattr(storage, "STORAGE", backend)
+    monkeypatch.setattr(autosave, "AUTOSAVE", None)
+    character = Character(name="Alice", level=5)
+    entry = backend.save_character(character)
+    monkeypatch.setattr(saved_characters, "SAVED_CHARS", saved_characters.SavedChars(storage=backend, entries={
+        entry.id: entry,
+    }))
+    loads = []
+    load = backend.load_character
+    monkeypatch.setattr(backend, "load_character", lambda char_id: loads.append(char_id) or load(char_id))
+    loc = LocNamespace(root={})
+
+    party.load_members([character.id], loc)
+    party.load_members([character.id], loc)
+    assert len(loads) == 1
+
+    # Same name and level, so the index entry is unchanged; file mtimes come from a coarse clock
+    time.sleep(0.02)
+    character.might.base = 12
+    backend.save_character(character)
+    [(member, _)] = party.load_members([character.id], loc)
+    assert len(loads) == 2
+    assert member.might.base == 12
@@ -1,9 +1,102 @@
+import uuid
+
+import pytest
+
 from data import saved_characters
+from data.storage import YamlStorage
+
+
+def _storage(directory):
+    return YamlStorage(directory, directory / "character_images", directory / "states")
 
 
 def test_saved_characters_init(tmp_path):
     saved_characters.SAVED_CHARS = None
     (tmp_path / 'char.yaml').write_text('{"name": "Test"}')
-    saved_characters.init(tmp_path)
+    saved_characters.init(_storage(tmp_path))
     assert saved_characters.SAVED_CHARS is not None
     assert saved_characters.SAVED_CHARS.char_list
+
+
+def _write_char(directory, name, level=5):
+    char_id = uuid.uuid4()
+    path = directory / f"{name}.{char_id}.character.yaml"
+    path.write_text(f'{{"name": "{name}", "level": {level}, "id": "{char_id}"}}')
+    return char_id, path
+
+
+def test_init_builds_index_without_keeping_characters(tmp_path):
+    saved_characters.SAVED_CHARS = None
+    char_id, _ = _write_char(tmp_path, "Alice", level=7)
+    saved_characters.init(_storage(tmp_path))
+
+    entry, = saved_characters.SAVED_CHARS.char_list
+    assert isinstance(entry, saved_characters.CharacterEntry)
+    assert (entry.id, entry.name, entry.level) == (char_id, "Alice", 7)
+    assert (tmp_path / YamlStorage.index_file_name).is_file()
+
+    character = saved_characters.SAVED_CHARS.load(char_id)
+    assert character.name == "Alice"
+    assert character.level == 7
+
+
+def test_init_uses_index_for_unchanged_files(tmp_path, monkeypatch):
+    from data import storage
+
+    saved_characters.SAVED_CHARS = None
+    _write_char(tmp_path, "Alice")
+    saved_characters.init(_storage(tmp_path))
+
+    saved_characters.SAVED_CHARS = None
+    monkeypatch.setattr(storage, "read_character", lambda path: pytest.fail(f"parsed {path}"))
+    saved_characters.init(_storage(tmp_path))
+    assert [entry.name for entry in saved_characters.SAVED_CHARS.char_list] == ["Alice"]
+
+
+def test_init_refreshes_changed_and_removed_files(tmp_path):
+    import os
+
+    saved_characters.SAVED_CHARS = None
+    char_id, path = _write_char(tmp_path, "Alice", level=5)
+    _, gone = _write_char(tmp_path, "Bob")
+    saved_characters.init(_storage(tmp_path))
+
+    path.write_text(f'{{"name": "Alice", "level": 9, "id": "{char_id}"}}')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    gone.unlink()
+
+    saved_characters.SAVED_CHARS = None
+    saved_characters.init(_storage(tmp_path))
+    entry, = saved_characters.SAVED_CHARS.char_list
+    assert entry.level == 9
+
+
+def test_add_and_remove_keep_list_current(tmp_path):
+    saved_characters.SAVED_CHARS = None
+    char_id, _ = _write_char(tmp_path, "Alice")
+    saved_characters.init(_storage(tmp_path))
+    saved = saved_characters.SAVED_CHARS
+
+    saved.add(saved_characters.CharacterEntry(id=char_id, name="Alicia", level=10))
+    assert [(e.name, e.level) for e in saved.char_list] == [("Alicia", 10)]
+
+    saved.remove(char_id)
+    assert saved.char_list == []
+    with pytest.raises(KeyError):
+        saved.load(char_id)
+
+
+def test_search_filters_index_by_name_and_level(tmp_path):
+    saved_characters.SAVED_CHARS = None
+    _write_char(tmp_path, "Alice", level=5)
+    _write_char(tmp_path, "alicia", level=20)
+    _write_char(tmp_path, "Bob", level=40)
+    saved_characters.init(_storage(tmp_path))
+    saved = saved_characters.SAVED_CHARS
+
+    assert [e.name for e in saved.search()] == ["Alice", "alicia", "Bob"]
+    assert [e.name for e in saved.search(" ALI ")] == ["Alice", "alicia"]
+    assert [e.name for e in saved.search(min_level=10)] == ["alicia", "Bob"]
+    assert [e.name for e in saved.search("ali", max_level=10)] == ["Alice"]
+    assert saved.search("carol") == []
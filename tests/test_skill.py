@@ -0,0 +1,22 @@
+from data.models import Skill, LocNamespace
+from data.models.skill import _resolve_skill_level_placeholders
+
+
+def test_resolved_description_evaluates_skill_level_expressions():
+    loc = LocNamespace(root={
+        "skill_level_short": "SL",
+        "skill_fury_description": "Deal 【SL&nbsp;×&nbsp;5】 extra damage, check 【MIG&nbsp;+&nbsp;WLP】, 【SL / 0】.",
+    })
+    skill = Skill(name="fury", current_level=3)
+    assert skill.resolved_description(loc) == "Deal 【15】 extra damage, check 【MIG&nbsp;+&nbsp;WLP】, 【3 / 0】."
+    skill.current_level = 4
+    assert skill.resolved_description(loc) == "Deal 【20】 extra damage, check 【MIG&nbsp;+&nbsp;WLP】, 【4 / 0】."
+
+
+def test_resolve_skill_level_placeholders_is_memoized():
+    _resolve_skill_level_placeholders.cache_clear()
+    text = "Recover 【SL × 2】 MP."
+    assert _resolve_skill_level_placeholders(text, 2, "SL") == "Recover 【4】 MP."
+    assert _resolve_skill_level_placeholders(text, 2, "SL") == "Recover 【4】 MP."
+    assert _resolve_skill_level_placeholders.cache_info().hits == 1
+    assert _resolve_skill_level_placeholders(text, 2, "") == text
@@ -0,0 +1,33 @@
+from data import compendium
+from data.snapshot import write_snapshot, read_snapshot
+
+
+def test_snapshot_round_trips_compendium(assets_dir, tmp_path):
+    snapshot_path = tmp_path / 'compendium.snapshot'
+    write_snapshot(compendium.load_from_yaml(assets_dir), assets_dir, snapshot_path)
+    restored = read_snapshot(assets_dir, snapshot_path)
+    assert restored is not None
+    assert restored.classes.get_class('arcanist').name == 'arcanist'
+    assert restored.spells.get_spells('elementalist')[0].name == 'aura'
+
+
+def test_snapshot_is_ignored_when_assets_change(assets_dir, tmp_path):
+    snapshot_path = tmp_path / 'compendium.snapshot'
+    write_snapshot(compendium.load_from_yaml(assets_dir), assets_dir, snapshot_path)
+    (assets_dir / 'skills' / 'heroic_skills.yaml').write_text('[{"name": "monkey_grip"}]')
+    assert read_snapshot(assets_dir, snapshot_path) is None
+
+    compendium.COMPENDIUM = None
+    compendium.init(assets_dir, snapshot_path)
+    assert compendium.COMPENDIUM.heroic_skills.get_skill('monkey_grip') is not None
+
+
+def test_missing_or_corrupt_snapshot_falls_back_to_yaml(assets_dir, tmp_path):
+    snapshot_path = tmp_path / 'compendium.snapshot'
+    assert read_snapshot(assets_dir, snapshot_path) is None
+    snapshot_path.write_bytes(b'not a snapshot')
+    assert read_snapshot(assets_dir, snapshot_path) is None
+
+    compendium.COMPENDIUM = None
+    compendium.init(assets_dir, snapshot_path)
+    assert compendium.COMPENDIUM.classes.get_class('arcanist') is not None
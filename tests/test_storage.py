@@ -0,0 +1,234 @@
+import time
+import uuid
+
+import pytest
+
+from data import storage
+from data.models import Character, CharState
+
+
+@pytest.fixture(params=["yaml", "sqlite"])
+def backend(request, tmp_path):
+    (tmp_path / "character_images").mkdir()
+    (tmp_path / "states").mkdir()
+    return storage.create_storage(request.param, tmp_path)
+
+
+def test_character_round_trip_and_listing(backend):
+    character = Character(name="Alice", level=12)
+    entry = backend.save_character(character)
+
+    assert entry == storage.CharacterEntry(id=character.id, name="Alice", level=12)
+    assert backend.list_characters() == [entry]
+    assert backend.load_character(character.id) == character
+
+
+def test_save_character_replaces_previous_version(backend):
+    character = Character(name="Alice")
+    backend.save_character(character)
+    character.name = "Alicia"
+    character.level = 6
+    backend.save_character(character)
+
+    assert backend.list_characters() == [storage.CharacterEntry(id=character.id, name="Alicia", level=6)]
+    assert backend.load_character(character.id).name == "Alicia"
+
+
+def test_character_version_changes_on_save(backend):
+    character = Character(name="Alice")
+    assert backend.character_version(character.id) is None
+
+    backend.save_character(character)
+    version = backend.character_version(character.id)
+    # File mtimes come from a coarse clock
+    time.sleep(0.02)
+    character.inventory.zenit = 100
+    backend.save_character(character)
+
+    assert version is not None
+    assert backend.character_version(character.id) not in (None, version)
+    backend.delete_character(character.id)
+    assert backend.character_version(character.id) is None
+
+
+def test_failed_save_keeps_previous_version(tmp_path, monkeypatch):
+    backend = _file_backend(tmp_path, "json")
+    character = Character(name="Alice")
+    backend.save_character(character)
+    character.name = "Alicia"
+
+    def fail(path, content):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(storage, "write_atomic", fail)
+    with pytest.raises(OSError):
+        backend.save_character(character)
+
+    assert backend.load_character(character.id).name == "Alice"
+
+
+def test_delete_character(backend):
+    character = Character(name="Alice")
+    backend.save_character(character)
+
+    assert backend.delete_character(character.id) is True
+    assert backend.delete_character(character.id) is False
+    assert backend.list_characters() == []
+    with pytest.raises(KeyError):
+        backend.load_character(character.id)
+
+
+def test_state_round_trip(backend):
+    char_id = uuid.uuid4()
+    assert backend.load_state(char_id) is None
+    backend.save_state(char_id, CharState(minus_hp=4, minus_mp=2))
+    assert backend.load_state(char_id) == CharState(minus_hp=4, minus_mp=2)
+
+
+def test_avatar_round_trip(backend):
+    character = Character(name="Alice")
+    assert backend.load_avatar(character.id) is None
+
+    backend.save_avatar(character, b"A", ".png")
+    backend.save_avatar(character, b"B", ".jpg")
+    avatar = backend.load_avatar(character.id)
+    assert (avatar if isinstance(avatar, bytes) else avatar.read_bytes()) == b"B"
+
+    assert backend.delete_avatar(character.id) is True
+    assert backend.delete_avatar(character.id) is False
+    assert backend.load_avatar(character.id) is None
+
+
+def test_unknown_backend(tmp_path):
+    with pytest.raises(ValueError):
+        storage.create_storage("csv", tmp_path)
+
+
+def _png(width, height):
+    from io import BytesIO
+    from PIL import Image
+
+    output = BytesIO()
+    Image.new("RGBA", (width, height), (255, 0, 0, 128)).save(output, format="PNG")
+    return output.getvalue()
+
+
+def _image_size(avatar):
+    from io import BytesIO
+    from PIL import Image
+
+    data = avatar if isinstance(avatar, bytes) else avatar.read_bytes()
+    with Image.open(BytesIO(data)) as image:
+        return image.size
+
+
+@pytest.mark.parametrize("backend_name", ["yaml", "sqlite"])
+def test_thumbnails_are_generated_on_save_and_dropped_on_delete(tmp_path, backend_name):
+    (tmp_path / "character_images").mkdir()
+    (tmp_path / "states").mkdir()
+    backend = storage.create_storage(backend_name, tmp_path, thumbnail_widths=(150,))
+    character = Character(name="Alice")
+
+    assert backend.load_avatar_thumbnail(character.id, 150) is None
+    backend.save_avatar(character, _png(600, 300), ".png")
+    assert _image_size(backend.load_avatar_thumbnail(character.id, 150)) == (150, 75)
+    # Widths not generated up front are created on first use; small images are never enlarged
+    assert _image_size(backend.load_avatar_thumbnail(character.id, 1000)) == (600, 300)
+
+    backend.save_avatar(character, _png(300, 300), ".png")
+    assert _image_size(backend.load_avatar_thumbnail(character.id, 150)) == (150, 150)
+
+    backend.delete_avatar(character.id)
+    assert backend.load_avatar_thumbnail(character.id, 150) is None
+    if backend_name == "yaml":
+        assert list((tmp_path / "character_images" / "thumbnails").iterdir()) == []
+
+
+def test_yaml_avatar_index_is_built_from_one_listing(tmp_path, monkeypatch):
+    images = tmp_path / "character_images"
+    images.mkdir()
+    char_id = uuid.uuid4()
+    (images / f"Alice.{char_id}.png").write_bytes(b"P")
+    (images / f"Alice.{char_id}.jpg").write_bytes(b"J")
+    (images / "notes.txt").write_text("not an avatar")
+    backend = storage.YamlStorage(tmp_path, images, tmp_path / "states")
+
+    assert backend.load_avatar(char_id) == images / f"Alice.{char_id}.jpg"
+    monkeypatch.setattr(type(images), "glob", lambda *args: pytest.fail("avatar lookup globbed"))
+    monkeypatch.setattr(type(images), "iterdir", lambda *args: pytest.fail("avatar lookup listed"))
+    assert backend.load_avatar(char_id) == images / f"Alice.{char_id}.jpg"
+    assert backend.load_avatar(uuid.uuid4()) is None
+
+
+def _file_backend(tmp_path, save_format):
+    (tmp_path / "character_images").mkdir(exist_ok=True)
+    (tmp_path / "states").mkdir(exist_ok=True)
+    return storage.create_storage("yaml", tmp_path, save_format=save_format)
+
+
+@pytest.mark.parametrize("save_format", ["json", "msgpack", "yaml"])
+def test_saves_are_read_back_from_any_format(tmp_path, save_format):
+    if save_format == "msgpack":
+        pytest.importorskip("msgpack")
+    character = Character(name="Alice", level=7)
+    writer = _file_backend(tmp_path, save_format)
+    writer.save_character(character)
+    writer.save_state(character.id, CharState(minus_hp=3))
+
+    assert list(tmp_path.glob("*.character.*"))[0].suffix == f".{save_format}"
+    reader = _file_backend(tmp_path, "json")
+    assert reader.list_characters() == [storage.CharacterEntry(id=character.id, name="Alice", level=7)]
+    assert reader.load_character(character.id) == character
+    assert reader.load_state(character.id) == CharState(minus_hp=3)
+
+
+def test_legacy_yaml_saves_are_loaded(tmp_path):
+    import yaml
+
+    character = Character(name="Alice")
+    backend = _file_backend(tmp_path, "json")
+    # Saves written before the JSON format dumped enums and ids as python objects
+    (tmp_path / f"Alice.{character.id}.character.yaml").write_text(yaml.dump(character.model_dump()))
+    (tmp_path / "states" / f"{character.id}.yaml").write_text(yaml.dump(CharState(minus_mp=2).model_dump()))
+
+    assert backend.load_character(character.id) == character
+    assert backend.load_state(character.id) == CharState(minus_mp=2)
+
+
+def test_flow_style_yaml_saves_are_not_taken_for_json(tmp_path):
+    from pydantic import ValidationError
+    from data import serialization
+
+    character = Character(name="Alice")
+    backend = _file_backend(tmp_path, "json")
+    (tmp_path / "states" / f"{character.id}.yaml").write_text("{minus_hp: 3, minus_mp: 2}")
+
+    assert serialization.detect_format(b" {minus_hp: 3}") == "yaml"
+    assert serialization.detect_format(b'{"minus_hp": 3}') == "json"
+    assert backend.load_state(character.id) == CharState(minus_hp=3, minus_mp=2)
+    # Valid JSON that doesn't fit the model is an error, not a cue to try YAML
+    with pytest.raises(ValidationError):
+        serialization.load_model(CharState, b'{"minus_hp": "many"}')
+
+
+def test_convert_saves(tmp_path):
+    alice, bob = Character(name="Alice"), Character(name="Bob")
+    old = _file_backend(tmp_path, "yaml")
+    old.save_character(alice)
+    old.save_state(alice.id, CharState(minus_hp=1))
+    new = _file_backend(tmp_path, "json")
+    new.save_character(bob)
+
+    assert new.convert_saves() == 2
+    assert new.convert_saves() == 0
+    assert sorted(path.name for path in tmp_path.glob("*.character.*")) == [
+        f"Alice.{alice.id}.character.json", f"Bob.{bob.id}.character.json",
+    ]
+    assert [path.name for path in (tmp_path / "states").iterdir()] == [f"{alice.id}.json"]
+    assert new.load_character(alice.id) == alice
+    assert new.load_state(alice.id) == CharState(minus_hp=1)
+
+
+def test_unknown_save_format(tmp_path):
+    with pytest.raises(ValueError):
+        storage.create_storage("yaml", tmp_path, save_format="xml")
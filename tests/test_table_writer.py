@@ -0,0 +1,133 @@
+from contextlib import nullcontext
+
+import pytest
+
+from data.models import LocNamespace, Spell, freeze
+from pages.utils import table_writer
+from pages.utils.table_writer import ColumnConfig, SpellTableWriter, TableWriter
+
+
+@pytest.fixture(autouse=True)
+def clear_search_keys():
+    table_writer._SEARCH_KEYS.clear()
+    yield
+    table_writer._SEARCH_KEYS.clear()
+
+
+@pytest.fixture
+def spell_loc():
+    return LocNamespace(root={
+        "spell_fireball": "Fireball",
+        "spell_fireball_description": "Burns every creature in the area.",
+        "spell_frost": "Frost",
+        "spell_frost_description": "Chills one creature.",
+        "table_no_matches": "Nothing matches the search.",
+        "table_page": "Page (of {count})",
+    })
+
+
+class RecordingWriter(TableWriter):
+    def __init__(self, loc):
+        self.rendered = []
+        self.columns = (
+            ColumnConfig(
+                name="spell",
+                width=1.0,
+                process=lambda spell, idx=None: self.rendered.append((idx, spell.name)),
+                value=lambda spell: spell.localized_name(self.loc),
+            ),
+        )
+        super().__init__(loc)
+
+
+@pytest.fixture
+def layout(streamlit_stub, monkeypatch):
+    monkeypatch.setattr(streamlit_stub, "columns", lambda spec: [nullcontext() for _ in spec], raising=False)
+    monkeypatch.setattr(streamlit_stub, "markdown", lambda *args, **kwargs: None, raising=False)
+    captions = []
+    monkeypatch.setattr(streamlit_stub, "caption", captions.append, raising=False)
+    return captions
+
+
+def test_text_search_uses_localized_key(spell_loc):
+    writer = SpellTableWriter(spell_loc)
+    fireball = Spell(name="fireball", mp_cost=10)
+
+    assert writer.matches(fireball, "fire")
+    assert writer.matches(fireball, "  BURNS  area ")
+    assert not writer.matches(fireball, "fire chills")
+    assert writer.matches(fireball, lambda spell: spell.mp_cost == 10)
+    assert not writer.matches(fireball, lambda spell: spell.mp_cost > 10)
+
+
+def test_search_key_is_computed_once_per_row(spell_loc, monkeypatch):
+    writer = SpellTableWriter(spell_loc)
+    calls = []
+    original = writer._search_text
+    monkeypatch.setattr(writer, "_search_text", lambda item: calls.append(item.name) or original(item))
+    frost = freeze(Spell(name="frost", mp_cost=5))
+
+    for _ in range(3):
+        writer.matches(frost, "chills")
+        # Equal compendium entries share the cached key
+        writer.matches(freeze(Spell(name="frost", mp_cost=5)), "chills")
+    SpellTableWriter(spell_loc).matches(frost, "chills")
+
+    assert calls == ["frost"]
+
+
+def test_search_key_depends_on_loc_and_content(spell_loc, monkeypatch):
+    calls = []
+    original = SpellTableWriter._search_text
+    monkeypatch.setattr(SpellTableWriter, "_search_text", lambda self, item: calls.append(item.name) or original(self, item))
+    frost = freeze(Spell(name="frost", mp_cost=5))
+
+    SpellTableWriter(spell_loc).matches(frost, "chills")
+    # Another language with the same keys, e.g. after a reload, gets its own search key
+    reloaded = LocNamespace(root={**spell_loc.root, "spell_frost_description": "Freezes one creature."})
+    assert SpellTableWriter(reloaded).matches(frost, "freezes")
+    assert not SpellTableWriter(reloaded).matches(frost, "chills")
+    # So does an entry with the same name but other content
+    SpellTableWriter(spell_loc).matches(freeze(Spell(name="frost", mp_cost=10)), "chills")
+    # A character's own spells can change in place and are not cached
+    own_frost = Spell(name="frost", mp_cost=5)
+    SpellTableWriter(spell_loc).matches(own_frost, "chills")
+    SpellTableWriter(spell_loc).matches(own_frost, "chills")
+
+    assert calls == ["frost"] * 5
+
+
+def test_search_keys_are_bounded(spell_loc, monkeypatch):
+    monkeypatch.setattr(table_writer, "MAX_SEARCH_KEYS", 2)
+    writer = SpellTableWriter(spell_loc)
+
+    for mp_cost in range(5):
+        writer.matches(freeze(Spell(name="frost", mp_cost=mp_cost)), "chills")
+
+    assert len(table_writer._SEARCH_KEYS) == 2
+
+
+def test_only_the_visible_page_is_rendered(spell_loc, streamlit_stub, layout, monkeypatch):
+    monkeypatch.setattr(streamlit_stub, "number_input", lambda label, **kwargs: 2, raising=False)
+    writer = RecordingWriter(spell_loc)
+    spells = [Spell(name=f"spell_{i}", mp_cost=i) for i in range(7)]
+
+    writer.write_in_columns(spells, header=False, description=False, page_size=3)
+
+    # Rows keep their index in the full list, which equip/upgrade keys are built from
+    assert writer.rendered == [(3, "spell_3"), (4, "spell_4"), (5, "spell_5")]
+
+
+def test_search_runs_before_paging(spell_loc, streamlit_stub, layout, monkeypatch):
+    page_inputs = []
+    monkeypatch.setattr(streamlit_stub, "number_input", lambda label, **kwargs: page_inputs.append(label), raising=False)
+    writer = RecordingWriter(spell_loc)
+    spells = [Spell(name="fireball", mp_cost=10), Spell(name="frost", mp_cost=5)]
+
+    writer.write_in_columns(spells, header=False, description=False, page_size=1, search="frost")
+    assert writer.rendered == [(1, "frost")]
+    assert page_inputs == []
+
+    writer.write_in_columns(spells, header=False, description=False, page_size=1, search="lightning")
+    assert writer.rendered == [(1, "frost")]
+    assert layout == ["Nothing matches the search."]
@@ -0,0 +1,31 @@
+import uuid
+
+import pytest
+import yaml
+
+from data import yaml_io
+from data.models import Character, ClassName, Status
+
+
+def test_legacy_python_tags_load_as_plain_values():
+    char_id = uuid.uuid4()
+    # The unsafe dumper the saves used to be written with
+    text = yaml.dump({"id": char_id, "class": ClassName.arcanist, "statuses": [Status.slow]})
+
+    assert yaml_io.load(text) == {"id": char_id, "class": "arcanist", "statuses": ["slow"]}
+
+
+def test_other_python_tags_are_rejected():
+    with pytest.raises(yaml_io.YAMLError):
+        yaml_io.load("!!python/object/apply:os.system ['echo unsafe']")
+    with pytest.raises(yaml_io.YAMLError):
+        yaml_io.load("!!python/object:pathlib.Path {}")
+
+
+def test_dump_writes_enums_and_ids_as_plain_values():
+    character = Character(name="Alice")
+    text = yaml_io.dump(character.model_dump())
+
+    assert "!!" not in text
+    assert text.startswith(f"id: {character.id}\nname: Alice\n")
+    assert Character.model_validate(yaml.safe_load(text)) == character